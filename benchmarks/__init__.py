@@ -0,0 +1,3 @@
+"""Throughput benchmarks of environments, visibility functions and
+representations;  see :py:mod:`benchmarks.run` and :py:mod:`benchmarks.compare`
+"""
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""Compares two benchmark JSON files, and flags throughput regressions
+
+Exits with status 1 if any benchmark present in both files slowed down (or, for
+memory benchmarks, grew) by more than the given threshold, e.g. to be used in
+CI::
+
+  python -m benchmarks.compare baseline.json benchmark.json --threshold 0.2
+"""
+import argparse
+import json
+import sys
+from typing import Dict, Tuple
+
+from benchmarks.utils import metric
+
+
+def load_results(path: str) -> Dict[str, Tuple[float, str]]:
+    """main metric and unit of each benchmark"""
+    with open(path) as f:
+        data = json.load(f)
+
+    results = {}
+    for name, result in data['results'].items():
+        value, unit = metric(result)
+        results[name] = (result[value], unit)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('baseline', help='baseline JSON file')
+    parser.add_argument('current', help='current JSON file')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.1,
+        help='relative slowdown (or memory increase) considered a regression',
+    )
+    parser.add_argument(
+        '--all', action='store_true', help='print every benchmark'
+    )
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+
+    names = [name for name in current if name in baseline]
+    width = max(map(len, names), default=0)
+
+    regressions = []
+    for name in names:
+        (baseline_value, unit), (current_value, _) = (
+            baseline[name],
+            current[name],
+        )
+
+        # speedup for rates, reduction for bytes, i.e. higher is better
+        ratio = (
+            current_value / baseline_value
+            if unit == '/s'
+            else baseline_value / current_value
+        )
+
+        if ratio < 1.0 - args.threshold:
+            regressions.append(name)
+            flag = 'REGRESSION'
+        elif ratio > 1.0 + args.threshold:
+            flag = 'improvement'
+        else:
+            flag = ''
+
+        if args.all or flag:
+            print(
+                f'{name:<{width}}  {baseline_value:12.1f} {unit}'
+                f'  {current_value:12.1f} {unit}  {ratio:6.2f}x  {flag}'
+            )
+
+    unmatched = sorted(set(baseline) ^ set(current))
+    if args.all:
+        for name in unmatched:
+            where = 'baseline' if name in baseline else 'current'
+            print(f'{name:<{width}}  only in {where}')
+    elif unmatched:
+        print(
+            f'{len(unmatched)} benchmarks only in one file (see --all)',
+            file=sys.stderr,
+        )
+
+    print(
+        f'{len(regressions)} regressions out of {len(names)} benchmarks',
+        file=sys.stderr,
+    )
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
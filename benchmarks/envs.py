@@ -0,0 +1,96 @@
+import glob
+import os
+from typing import Sequence
+
+import numpy.random as rnd
+
+from benchmarks.utils import Results, measure
+from gym_gridverse.envs.gridworld import GridWorld
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.representations.observation_representations import (
+    create_observation_representation,
+)
+from gym_gridverse.representations.state_representations import (
+    create_state_representation,
+)
+
+STATE_REPRESENTATIONS = ['default', 'no_overlap', 'compact']
+OBSERVATION_REPRESENTATIONS = ['default', 'no_overlap', 'compact', 'pixels']
+
+
+def yaml_paths(directory: str = 'yaml') -> Sequence[str]:
+    return sorted(glob.glob(os.path.join(directory, '*.yaml')))
+
+
+def run(paths: Sequence[str], *, min_time: float) -> Results:
+    """Measures reset, step, observation and representation throughput
+
+    Args:
+        paths (Sequence[str]): yaml environment files
+        min_time (float): time budget of each measurement, in seconds
+
+    Returns:
+        Results: measurements indexed as 'envs/<yaml name>/<operation>'
+    """
+    results: Results = {}
+
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        env = factory_env_from_yaml(path)
+        assert isinstance(env, GridWorld)
+
+        env.set_seed(0)
+        rng = rnd.default_rng(0)
+        actions = env.action_space.actions
+
+        results[f'envs/{name}/reset'] = measure(env.reset, min_time=min_time)
+
+        env.reset()
+
+        # steps through whole episodes, so includes the occasional reset
+        def step():
+            action = actions[rng.integers(len(actions))]
+            _, done = env.step(action)
+            if done:
+                env.reset()
+
+        results[f'envs/{name}/step'] = measure(step, min_time=min_time)
+
+        state = env.state
+        results[f'envs/{name}/observation'] = measure(
+            lambda: env.functional_observation(state), min_time=min_time
+        )
+
+        observation = env.functional_observation(state)
+
+        for representation_name in STATE_REPRESENTATIONS:
+            try:
+                state_representation = create_state_representation(
+                    representation_name, env.state_space
+                )
+            except NotImplementedError:
+                continue
+
+            results[
+                f'envs/{name}/state_representation/{representation_name}'
+            ] = measure(
+                lambda: state_representation.convert(state),
+                min_time=min_time,
+            )
+
+        for representation_name in OBSERVATION_REPRESENTATIONS:
+            try:
+                observation_representation = create_observation_representation(
+                    representation_name, env.observation_space
+                )
+            except NotImplementedError:
+                continue
+
+            results[
+                f'envs/{name}/observation_representation/{representation_name}'
+            ] = measure(
+                lambda: observation_representation.convert(observation),
+                min_time=min_time,
+            )
+
+    return results
@@ -0,0 +1,76 @@
+import os
+from typing import Sequence
+
+import numpy as np
+import numpy.random as rnd
+
+from benchmarks.envs import STATE_REPRESENTATIONS
+from benchmarks.utils import Results
+from gym_gridverse.encoding import encode_state
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.representations.state_representations import (
+    create_state_representation,
+)
+from gym_gridverse.utils.memory import deep_sizeof
+
+
+def run(paths: Sequence[str], *, num_states: int = 100) -> Results:
+    """Measures the memory footprint of states and observations
+
+    States and observations are collected along random episodes, and measured
+    independently of each other, i.e., as if they were stored in a buffer.
+
+    Args:
+        paths (Sequence[str]): yaml environment files
+        num_states (int): number of states to average over
+
+    Returns:
+        Results: mean bytes, indexed as 'memory/<yaml name>/<element>'
+    """
+    results: Results = {}
+
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        env = factory_env_from_yaml(path)
+        env.set_seed(0)
+        rng = rnd.default_rng(0)
+        actions = env.action_space.actions
+
+        states, observations = [], []
+        env.reset()
+        while len(states) < num_states:
+            states.append(env.state)
+            observations.append(env.observation)
+
+            _, done = env.step(actions[rng.integers(len(actions))])
+            if done:
+                env.reset()
+
+        sizes = {
+            'state': [deep_sizeof(state) for state in states],
+            'observation': [deep_sizeof(o) for o in observations],
+            'encoded_state': [
+                sum(array.nbytes for array in encode_state(state))
+                for state in states
+            ],
+        }
+
+        for representation_name in STATE_REPRESENTATIONS:
+            try:
+                state_representation = create_state_representation(
+                    representation_name, env.state_space
+                )
+            except NotImplementedError:
+                continue
+
+            sizes[f'state_representation/{representation_name}'] = [
+                deep_sizeof(state_representation.convert(state))
+                for state in states
+            ]
+
+        for element, element_sizes in sizes.items():
+            results[f'memory/{name}/{element}'] = {
+                'bytes': float(np.mean(element_sizes))
+            }
+
+    return results
@@ -0,0 +1,70 @@
+from typing import Sequence
+
+import numpy.random as rnd
+
+from benchmarks.envs import OBSERVATION_REPRESENTATIONS, STATE_REPRESENTATIONS
+from benchmarks.utils import (
+    Results,
+    measure,
+    observation_space,
+    random_observation,
+    random_state,
+    state_space,
+)
+from gym_gridverse.geometry import Shape
+from gym_gridverse.representations.observation_representations import (
+    create_observation_representation,
+)
+from gym_gridverse.representations.state_representations import (
+    create_state_representation,
+)
+
+
+def run(sizes: Sequence[int], *, min_time: float) -> Results:
+    """Measures representation throughput on random square grids
+
+    Representations which are not implemented are skipped.
+
+    Args:
+        sizes (Sequence[int]): grid sizes (odd)
+        min_time (float): time budget of each measurement, in seconds
+
+    Returns:
+        Results: measurements indexed as
+        '{state,observation}_representation/<name>/<size>x<size>'
+    """
+    results: Results = {}
+
+    for size in sizes:
+        shape = Shape(size, size)
+        state = random_state(shape, rnd.default_rng(0))
+        observation = random_observation(shape, rnd.default_rng(0))
+
+        for name in STATE_REPRESENTATIONS:
+            try:
+                state_representation = create_state_representation(
+                    name, state_space(shape)
+                )
+            except NotImplementedError:
+                continue
+
+            results[f'state_representation/{name}/{size}x{size}'] = measure(
+                lambda: state_representation.convert(state), min_time=min_time
+            )
+
+        for name in OBSERVATION_REPRESENTATIONS:
+            try:
+                observation_representation = create_observation_representation(
+                    name, observation_space(shape)
+                )
+            except NotImplementedError:
+                continue
+
+            results[
+                f'observation_representation/{name}/{size}x{size}'
+            ] = measure(
+                lambda: observation_representation.convert(observation),
+                min_time=min_time,
+            )
+
+    return results
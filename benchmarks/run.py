@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""Runs the benchmark suites and saves the results as JSON
+
+Usage (from the repository root)::
+
+  python -m benchmarks.run --output benchmark.json
+  python -m benchmarks.run --suites visibility --sizes 7 101 --min-time 1.0
+"""
+import argparse
+import json
+import sys
+
+from benchmarks import envs, memory, representations, visibility
+from benchmarks.utils import Results, metadata, metric
+
+SUITES = ['envs', 'visibility', 'representations', 'memory']
+SIZES = [7, 15, 31, 51, 101]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--suites', nargs='+', choices=SUITES, default=SUITES, help='suites'
+    )
+    parser.add_argument(
+        '--yaml',
+        nargs='+',
+        default=None,
+        help='YAML data files for the envs and memory suites (default: yaml/*.yaml)',
+    )
+    parser.add_argument(
+        '--sizes',
+        nargs='+',
+        type=int,
+        default=SIZES,
+        help='grid sizes for the visibility and representations suites',
+    )
+    parser.add_argument(
+        '--min-time',
+        type=float,
+        default=0.25,
+        help='time budget of each measurement, in seconds',
+    )
+    parser.add_argument(
+        '--num-states',
+        type=int,
+        default=100,
+        help='number of states to average over in the memory suite',
+    )
+    parser.add_argument('--output', default=None, help='output JSON file')
+    args = parser.parse_args()
+
+    if any(size % 2 == 0 for size in args.sizes):
+        parser.error('sizes should be odd')
+
+    results: Results = {}
+
+    paths = envs.yaml_paths() if args.yaml is None else args.yaml
+
+    if 'envs' in args.suites:
+        results.update(envs.run(paths, min_time=args.min_time))
+
+    if 'visibility' in args.suites:
+        results.update(visibility.run(args.sizes, min_time=args.min_time))
+
+    if 'representations' in args.suites:
+        results.update(representations.run(args.sizes, min_time=args.min_time))
+
+    if 'memory' in args.suites:
+        results.update(memory.run(paths, num_states=args.num_states))
+
+    width = max(map(len, results), default=0)
+    for name, result in results.items():
+        value, unit = metric(result)
+        print(f'{name:<{width}}  {result[value]:12.1f} {unit}')
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump({'metadata': metadata(), 'results': results}, f, indent=2)
+
+        print(f'results saved to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
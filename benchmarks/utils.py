@@ -0,0 +1,167 @@
+import platform
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.random as rnd
+
+from gym_gridverse.agent import Agent
+from gym_gridverse.geometry import Orientation, Shape
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import (
+    Color,
+    Door,
+    Floor,
+    Goal,
+    GridObject,
+    Key,
+    MovingObstacle,
+    Wall,
+)
+from gym_gridverse.observation import Observation
+from gym_gridverse.spaces import ObservationSpace, StateSpace
+from gym_gridverse.state import State
+
+Result = Dict[str, float]
+"""a single measurement, i.e., either seconds of the first call, number of
+calls, total seconds and calls/sec ('rate'), or a memory footprint ('bytes')"""
+
+Results = Dict[str, Result]
+"""measurements indexed by benchmark name, e.g. 'envs/gv_empty.4x4/step'"""
+
+OBJECT_TYPES = [Floor, Wall, Door, Key, Goal, MovingObstacle]
+COLORS = [Color.RED, Color.GREEN, Color.BLUE, Color.YELLOW]
+
+
+def metric(result: Result) -> Tuple[str, str]:
+    """main metric of a result, and its unit;  rates are better when higher,
+    bytes when lower"""
+    return ('rate', '/s') if 'rate' in result else ('bytes', 'B')
+
+
+def measure(
+    function: Callable[[], object],
+    *,
+    min_time: float,
+    min_calls: int = 3,
+) -> Result:
+    """Measures the throughput of a function
+
+    The function is called once to warm up any cache (timed separately, since
+    it can dominate, e.g. when computing rays), and then repeatedly, until both
+    `min_time` seconds and `min_calls` calls have passed.
+
+    Args:
+        function (Callable[[], object]): function to measure
+        min_time (float): minimum time budget, in seconds
+        min_calls (int): minimum number of calls
+
+    Returns:
+        Result: seconds of the first call, number of calls, total seconds and
+        calls per second
+    """
+    start = time.perf_counter()
+    function()
+    first_call = time.perf_counter() - start
+
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        function()
+        calls += 1
+
+        seconds = time.perf_counter() - start
+        if calls >= min_calls and seconds >= min_time:
+            break
+
+    return {
+        'first_call': first_call,
+        'calls': calls,
+        'seconds': seconds,
+        'rate': calls / seconds,
+    }
+
+
+def random_object(rng: rnd.Generator) -> GridObject:
+    """Returns a random object, mostly floors and walls"""
+    p = rng.random()
+
+    if p < 0.70:
+        return Floor()
+
+    if p < 0.85:
+        return Wall()
+
+    color = COLORS[rng.integers(len(COLORS))]
+
+    if p < 0.90:
+        status = list(Door.Status)[rng.integers(len(Door.Status))]
+        return Door(status, color)
+
+    if p < 0.95:
+        return Key(color)
+
+    if p < 0.98:
+        return MovingObstacle()
+
+    return Goal()
+
+
+def random_grid(shape: Shape, rng: rnd.Generator) -> Grid:
+    """Returns a grid of random objects"""
+    return Grid.from_objects(
+        [
+            [random_object(rng) for _ in range(shape.width)]
+            for _ in range(shape.height)
+        ]
+    )
+
+
+def random_state(shape: Shape, rng: rnd.Generator) -> State:
+    """Returns a state with a random grid, and the agent in its center"""
+    grid = random_grid(shape, rng)
+    position = (shape.height // 2, shape.width // 2)
+    grid[position] = Floor()
+    return State(grid, Agent(position, Orientation.N, Key(Color.RED)))
+
+
+def random_observation(shape: Shape, rng: rnd.Generator) -> Observation:
+    """Returns an observation with a random grid, and the agent in its
+    canonical position (bottom center)"""
+    grid = random_grid(shape, rng)
+    position = (shape.height - 1, shape.width // 2)
+    grid[position] = Floor()
+    return Observation(grid, Agent(position, Orientation.N, Key(Color.RED)))
+
+
+def state_space(shape: Shape) -> StateSpace:
+    return StateSpace(shape, OBJECT_TYPES, COLORS)
+
+
+def observation_space(shape: Shape) -> ObservationSpace:
+    return ObservationSpace(shape, OBJECT_TYPES, COLORS)
+
+
+def metadata(argv: Optional[Sequence[str]] = None) -> Dict[str, object]:
+    """Returns information on the benchmark run, to compare runs fairly"""
+    try:
+        commit: Optional[str] = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': commit,
+        'argv': list(sys.argv if argv is None else argv),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+    }
@@ -0,0 +1,53 @@
+from typing import Sequence
+
+import numpy.random as rnd
+
+from benchmarks.utils import Results, measure, random_observation
+from gym_gridverse.envs import visibility_functions
+from gym_gridverse.geometry import Shape
+
+VISIBILITY_FUNCTIONS = [
+    'full_visibility',
+    'partial_visibility',
+    'minigrid_visibility',
+    'raytracing_visibility',
+    'stochastic_raytracing_visibility',
+    'shadowcasting_visibility',
+]
+
+
+def run(
+    sizes: Sequence[int],
+    *,
+    min_time: float,
+    names: Sequence[str] = VISIBILITY_FUNCTIONS,
+) -> Results:
+    """Measures visibility function throughput on random square grids
+
+    The agent is placed in the canonical observation position, i.e., the
+    bottom center of the grid, as in the observation functions.
+
+    Args:
+        sizes (Sequence[int]): grid sizes (odd)
+        min_time (float): time budget of each measurement, in seconds
+        names (Sequence[str]): visibility function names
+
+    Returns:
+        Results: measurements indexed as 'visibility/<name>/<size>x<size>'
+    """
+    results: Results = {}
+
+    for size in sizes:
+        observation = random_observation(Shape(size, size), rnd.default_rng(0))
+        grid = observation.grid
+        position = observation.agent.position
+
+        for name in names:
+            visibility_function = visibility_functions.factory(name)
+            rng = rnd.default_rng(0)
+            results[f'visibility/{name}/{size}x{size}'] = measure(
+                lambda: visibility_function(grid, position, rng=rng),
+                min_time=min_time,
+            )
+
+    return results
@@ -4,4 +4,30 @@ __author__ = """Andrea Baisero"""
 __email__ = 'andrea.baisero@gmail.com'
 __version__ = '0.0.1'
 
-import gym_gridverse.gym  # noqa: F401
+import importlib
+import sys
+
+# submodules which are imported on first attribute access (PEP 562), e.g.
+# `gym_gridverse.gym`, rather than with the package
+_LAZY_SUBMODULES = {
+    'gym',
+    'headless_rendering',
+    'recording',
+    'render_as_string',
+    'rendering',
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+# importing gym is slow, and not needed to use the environments directly;  the
+# gym environments are registered here only if gym is already in use.
+# Otherwise, they are registered when gym loads its env plugins, or when
+# gym_gridverse.gym is imported, e.g. by gym.make('gym_gridverse.gym:<id>')
+if 'gym' in sys.modules:
+    import gym_gridverse.gym  # noqa: F401
@@ -0,0 +1,491 @@
+"""Expert demonstrations from shortest-path planning, e.g. for imitation learning
+
+A :py:class:`ShortestPathPlanner` finds the shortest sequence of actions which
+solves a level, by breadth-first search over the states reachable through
+:py:meth:`InnerEnv.functional_step
+<gym_gridverse.envs.inner_env.InnerEnv.functional_step>`, so that plans are
+exactly consistent with the dynamics of the environment (including keys,
+doors and any other object).  Plans are cached per level, i.e. by the hash of
+the initial state.
+
+:py:func:`generate_demonstrations` fans the planning and rollouts out across a
+pool of processes, and writes the resulting episodes into a
+:py:class:`~gym_gridverse.recording.TransitionDataset`::
+
+  env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+  stats = generate_demonstrations(env, 'demos/keydoor', 10_000)
+  dataset = TransitionDataset('demos/keydoor')
+
+Planning assumes deterministic dynamics;  episodes whose rollout does not
+follow the plan to success (or levels without a solution within the search
+budget) are counted as failures and skipped.
+"""
+import heapq
+import itertools as itt
+import math
+import multiprocessing
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import more_itertools as mitt
+import numpy as np
+
+from gym_gridverse.action import Action
+from gym_gridverse.encoding import encode_state
+from gym_gridverse.envs import InnerEnv, terminating_functions as terminating_fs
+from gym_gridverse.envs.gridworld import GridWorld
+from gym_gridverse.envs.transition_features import StateFeatures
+from gym_gridverse.geometry import Position
+from gym_gridverse.grid_object import Goal
+from gym_gridverse.mdp import state_key
+from gym_gridverse.recording import TransitionDatasetWriter
+from gym_gridverse.representations.observation_representations import (
+    create_observation_representation,
+)
+from gym_gridverse.representations.representation import Representation
+from gym_gridverse.representations.state_representations import (
+    create_state_representation,
+)
+from gym_gridverse.state import State
+
+__all__ = [
+    'DemonstrationStats',
+    'ShortestPathPlanner',
+    'generate_demonstrations',
+    'goal_distance',
+    'shortest_path',
+]
+
+
+def goal_distance(state: State) -> float:
+    """Manhattan distance from the agent to the closest goal (0 if none)
+
+    A lower bound on the number of remaining actions, i.e. an admissible
+    heuristic, as long as no action moves the agent by more than one cell.
+    """
+    goals = StateFeatures(state).positions(Goal)
+    position = state.agent.position
+    return min(
+        (Position.manhattan_distance(position, goal) for goal in goals),
+        default=0.0,
+    )
+
+
+def shortest_path(
+    env: InnerEnv,
+    state: State,
+    *,
+    success_function: terminating_fs.TerminatingFunction = (
+        terminating_fs.reach_goal
+    ),
+    heuristic: Optional[Callable[[State], float]] = None,
+    max_states: Optional[int] = None,
+) -> Optional[List[Action]]:
+    """Finds a shortest sequence of actions from a state to success
+
+    Without heuristic, the search is a breadth-first search;  with an
+    admissible heuristic (e.g. :py:func:`goal_distance`), it is an A* search,
+    which expands fewer states and still finds a shortest plan.
+
+    Args:
+        env (InnerEnv): environment providing the dynamics
+        state (State): initial state
+        success_function (TerminatingFunction): successful terminal
+            transitions, reaching the goal by default;  other terminal
+            transitions (e.g. into lava) are dead ends
+        heuristic (Optional[Callable[[State], float]]): lower bound on the
+            number of actions from a state to success
+        max_states (Optional[int]): maximum number of states to visit
+
+    Returns:
+        Optional[List[Action]]: shortest plan, or None if there is no plan
+        within the search budget
+    """
+    actions = env.action_space.actions
+
+    start = state_key(*encode_state(state))
+    # state key -> (parent key, action)
+    parents: Dict[int, Tuple[int, Action]] = {}
+    costs = {start: 0}
+    # (estimated total cost, insertion order, cost, key, state);  the
+    # insertion order breaks ties first-in first-out, as in a BFS.  Successful
+    # transitions are pushed as entries without key, holding their (parent
+    # key, action), and the search ends when one is popped, so that the plan
+    # is a shortest one.
+    counter = itt.count()
+    heap: List[Tuple] = [(0.0, next(counter), 0, start, state)]
+
+    while heap:
+        _, _, cost, key, item = heapq.heappop(heap)
+        if key is None:
+            parent, action = item
+            return _backtrack(parents, parent) + [action]
+
+        if cost > costs[key]:
+            continue
+
+        state = item
+
+        for action in actions:
+            next_state, _, done = env.functional_step(state, action)
+
+            if done:
+                if success_function(state, action, next_state):
+                    heapq.heappush(
+                        heap,
+                        (
+                            cost + 1,
+                            next(counter),
+                            cost + 1,
+                            None,
+                            (key, action),
+                        ),
+                    )
+                continue
+
+            next_key = state_key(*encode_state(next_state))
+            if costs.get(next_key, math.inf) <= cost + 1:
+                continue
+
+            if (
+                max_states is not None
+                and next_key not in costs
+                and len(costs) >= max_states
+            ):
+                return None
+
+            costs[next_key] = cost + 1
+            parents[next_key] = (key, action)
+            estimate = (
+                cost + 1 + (0 if heuristic is None else heuristic(next_state))
+            )
+            heapq.heappush(
+                heap, (estimate, next(counter), cost + 1, next_key, next_state)
+            )
+
+    return None
+
+
+def _backtrack(parents: Dict[int, Tuple[int, Action]], key: int) -> List:
+    plan = []
+    while key in parents:
+        key, action = parents[key]
+        plan.append(action)
+
+    plan.reverse()
+    return plan
+
+
+class ShortestPathPlanner:
+    """Shortest-path planner with a cache of plans per level
+
+    The planner steps its own clone of the environment, so that planning does
+    not consume the random number generator of the environment in use.
+
+    Args:
+        env (GridWorld): environment providing the dynamics
+        success_function (TerminatingFunction): see :py:func:`shortest_path`
+        heuristic (Optional[Callable[[State], float]]): see
+            :py:func:`shortest_path`, :py:func:`goal_distance` by default
+        max_states (Optional[int]): see :py:func:`shortest_path`
+        cache_size (int): maximum number of cached plans (least recently used
+            plans are evicted first)
+    """
+
+    def __init__(
+        self,
+        env: GridWorld,
+        *,
+        success_function: terminating_fs.TerminatingFunction = (
+            terminating_fs.reach_goal
+        ),
+        heuristic: Optional[Callable[[State], float]] = goal_distance,
+        max_states: Optional[int] = 100_000,
+        cache_size: int = 1024,
+    ):
+        self.env = env.clone()
+        self.success_function = success_function
+        self.heuristic = heuristic
+        self.max_states = max_states
+        self.cache_size = cache_size
+
+        self._cache: 'OrderedDict[int, Optional[Tuple[Action, ...]]]'
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def plan(self, state: State) -> Optional[List[Action]]:
+        """shortest plan from a state, or None if there is none"""
+        key = state_key(*encode_state(state))
+
+        try:
+            plan = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            found = shortest_path(
+                self.env,
+                state,
+                success_function=self.success_function,
+                heuristic=self.heuristic,
+                max_states=self.max_states,
+            )
+            plan = self._cache[key] = None if found is None else tuple(found)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+
+        return None if plan is None else list(plan)
+
+
+@dataclass(frozen=True)
+class DemonstrationStats:
+    """Outcome of :py:func:`generate_demonstrations`"""
+
+    num_episodes: int
+    num_transitions: int
+    num_failures: int
+    cache_hits: int
+    cache_misses: int
+    seconds: float
+
+    @property
+    def episodes_per_second(self) -> float:
+        return self.num_episodes / self.seconds if self.seconds > 0 else 0.0
+
+
+# episode converted by a worker:  actions, rewards, dones, and stacked state
+# and observation representations (None if not requested)
+_Episode = Tuple[
+    List[Action],
+    List[float],
+    List[bool],
+    Optional[Dict[str, np.ndarray]],
+    Optional[Dict[str, np.ndarray]],
+]
+
+
+class _DemonstrationWorker:
+    """plans, rolls out, and converts the episodes of the given seeds"""
+
+    def __init__(
+        self,
+        env: GridWorld,
+        state_representation: Optional[str],
+        observation_representation: Optional[str],
+        planner_kwargs: Dict,
+    ):
+        self.env = env
+        self.planner = ShortestPathPlanner(env, **planner_kwargs)
+        self.state_representation = (
+            None
+            if state_representation is None
+            else create_state_representation(
+                state_representation, env.state_space
+            )
+        )
+        self.observation_representation = (
+            None
+            if observation_representation is None
+            else create_observation_representation(
+                observation_representation, env.observation_space
+            )
+        )
+
+    def __call__(
+        self, seeds: Sequence[int]
+    ) -> Tuple[List[_Episode], int, int, int]:
+        hits, misses = self.planner.hits, self.planner.misses
+
+        episodes = []
+        num_failures = 0
+        for seed in seeds:
+            episode = self.episode(seed)
+            if episode is None:
+                num_failures += 1
+            else:
+                episodes.append(episode)
+
+        return (
+            episodes,
+            num_failures,
+            self.planner.hits - hits,
+            self.planner.misses - misses,
+        )
+
+    def episode(self, seed: int) -> Optional[_Episode]:
+        env = self.env
+        env.set_seed(seed)
+        env.reset()
+
+        plan = self.planner.plan(env.state)
+        if plan is None:
+            return None
+
+        states = [env.state] if self.state_representation is not None else []
+        observations = (
+            [env.observation]
+            if self.observation_representation is not None
+            else []
+        )
+        rewards, dones = [], []
+        done = False
+        for action in plan:
+            if done:
+                return None
+
+            reward, done = env.step(action)
+            rewards.append(reward)
+            dones.append(done)
+            if self.state_representation is not None:
+                states.append(env.state)
+            if self.observation_representation is not None:
+                observations.append(env.observation)
+
+        if not done:
+            return None
+
+        return (
+            plan,
+            rewards,
+            dones,
+            _convert(self.state_representation, states),
+            _convert(self.observation_representation, observations),
+        )
+
+
+def _convert(
+    representation: Optional[Representation], elements: Sequence
+) -> Optional[Dict[str, np.ndarray]]:
+    if representation is None:
+        return None
+
+    converted = [representation.convert(element) for element in elements]
+    return {
+        key: np.stack([c[key] for c in converted])
+        for key in representation.space
+    }
+
+
+# one worker per process, created by the pool initializer
+_worker: Optional[_DemonstrationWorker] = None
+
+
+def _init_worker(*args):
+    global _worker  # pylint: disable=global-statement
+    _worker = _DemonstrationWorker(*args)
+
+
+def _run_worker(seeds: Sequence[int]):
+    assert _worker is not None
+    return _worker(seeds)
+
+
+def generate_demonstrations(
+    env: GridWorld,
+    path: str,
+    num_episodes: int,
+    *,
+    seed: int = 0,
+    state_representation: Optional[str] = None,
+    observation_representation: Optional[str] = 'default',
+    processes: Optional[int] = None,
+    chunk_size: int = 64,
+    **planner_kwargs,
+) -> DemonstrationStats:
+    """Writes shortest-path demonstrations into a transition dataset
+
+    Episode `i` is generated from seed `seed + i`;  each process plans with its
+    own :py:class:`ShortestPathPlanner`.  Episodes are written in seed order,
+    so that the output does not depend on the number of processes.
+
+    Args:
+        env (GridWorld): environment, e.g. from a yaml file;  must be
+            picklable to be sent to worker processes
+        path (str): dataset directory (see
+            :py:class:`~gym_gridverse.recording.TransitionDatasetWriter`)
+        num_episodes (int): number of seeds to attempt
+        seed (int): first seed
+        state_representation (Optional[str]): state representation name, or
+            None to not store states
+        observation_representation (Optional[str]): observation
+            representation name, or None to not store observations
+        processes (Optional[int]): number of worker processes;  0 works in
+            the calling process, None uses all CPUs
+        chunk_size (int): number of episodes per task
+        **planner_kwargs: arguments of :py:class:`ShortestPathPlanner`
+
+    Returns:
+        DemonstrationStats: number of episodes, failures, cache statistics
+    """
+    start = time.perf_counter()
+
+    worker_args = (
+        env,
+        state_representation,
+        observation_representation,
+        planner_kwargs,
+    )
+    chunks = list(mitt.chunked(range(seed, seed + num_episodes), chunk_size))
+
+    writer = TransitionDatasetWriter(
+        path,
+        state_representation=(
+            None
+            if state_representation is None
+            else create_state_representation(
+                state_representation, env.state_space
+            )
+        ),
+        observation_representation=(
+            None
+            if observation_representation is None
+            else create_observation_representation(
+                observation_representation, env.observation_space
+            )
+        ),
+    )
+
+    num_failures = cache_hits = cache_misses = 0
+    pool = (
+        multiprocessing.Pool(processes, _init_worker, worker_args)
+        if processes != 0
+        else None
+    )
+    try:
+        results = (
+            pool.imap(_run_worker, chunks)
+            if pool is not None
+            else map(_DemonstrationWorker(*worker_args), chunks)
+        )
+
+        with writer:
+            for episodes, failures, hits, misses in results:
+                for actions, rewards, dones, states, observations in episodes:
+                    writer.append_episode(
+                        actions,
+                        rewards,
+                        dones,
+                        states=states,
+                        observations=observations,
+                    )
+
+                num_failures += failures
+                cache_hits += hits
+                cache_misses += misses
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    return DemonstrationStats(
+        num_episodes=writer.num_episodes,
+        num_transitions=writer.num_transitions,
+        num_failures=num_failures,
+        cache_hits=cache_hits,
+        cache_misses=cache_misses,
+        seconds=time.perf_counter() - start,
+    )
@@ -0,0 +1,125 @@
+"""Compact and lossless integer encodings of states and observations
+
+Unlike the representations in :py:mod:`gym_gridverse.representations`, these
+encodings are meant to be decoded back into the original objects, e.g. to
+store trajectories on disk and replay them later.
+"""
+from typing import Tuple
+
+import numpy as np
+
+from gym_gridverse.agent import Agent
+from gym_gridverse.geometry import Orientation
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import (
+    Color,
+    Door,
+    GridObject,
+    Hidden,
+    Key,
+    Telepod,
+)
+from gym_gridverse.observation import Observation
+from gym_gridverse.state import State
+
+GRID_DTYPE = np.uint8
+"""dtype of encoded grids;  type, state and color indices are all small"""
+
+AGENT_DTYPE = np.int64
+"""dtype of encoded agents;  positions can be arbitrarily large"""
+
+
+def encode_object(obj: GridObject) -> Tuple[int, int, int]:
+    """Encodes a grid object as its (type, state, color) indices
+
+    Args:
+        obj (GridObject): object to encode
+
+    Returns:
+        Tuple[int, int, int]: type index, state index, and color value
+    """
+    if not (obj.can_be_represented_in_state() or isinstance(obj, Hidden)):
+        raise ValueError(f'object {obj} cannot be encoded losslessly')
+
+    return obj.type_index, obj.state_index, obj.color.value
+
+
+def decode_object(
+    type_index: int, state_index: int, color_value: int
+) -> GridObject:
+    """Decodes a grid object from its (type, state, color) indices
+
+    Args:
+        type_index (int): index in :py:attr:`GridObject.object_types`
+        state_index (int): object state index
+        color_value (int): object color value
+
+    Returns:
+        GridObject: newly constructed object
+    """
+    object_type = GridObject.object_types[type_index]
+    color = Color(color_value)
+
+    if object_type is Door:
+        return Door(Door.Status(state_index), color)
+
+    if object_type in [Key, Telepod]:
+        return object_type(color)  # type: ignore
+
+    return object_type()  # type: ignore
+
+
+def encode_grid(grid: Grid) -> np.ndarray:
+    """Encodes a grid as a height x width x 3 array of object indices"""
+    return np.array(
+        [[encode_object(obj) for obj in row] for row in grid.to_objects()],
+        dtype=GRID_DTYPE,
+    ).reshape(grid.height, grid.width, 3)
+
+
+def decode_grid(array: np.ndarray) -> Grid:
+    """Decodes a grid from a height x width x 3 array of object indices"""
+    return Grid.from_objects(
+        [[decode_object(*indices) for indices in row] for row in array.tolist()]
+    )
+
+
+def encode_agent(agent: Agent) -> np.ndarray:
+    """Encodes an agent as its position, orientation and held object indices"""
+    return np.array(
+        [
+            agent.position.y,
+            agent.position.x,
+            agent.orientation.value,
+            *encode_object(agent.obj),
+        ],
+        dtype=AGENT_DTYPE,
+    )
+
+
+def decode_agent(array: np.ndarray) -> Agent:
+    """Decodes an agent from its position, orientation and held object indices"""
+    y, x, orientation, *obj_indices = array.tolist()
+    return Agent((y, x), Orientation(orientation), decode_object(*obj_indices))
+
+
+def encode_state(state: State) -> Tuple[np.ndarray, np.ndarray]:
+    """Encodes a state as a (grid, agent) pair of arrays"""
+    return encode_grid(state.grid), encode_agent(state.agent)
+
+
+def decode_state(grid: np.ndarray, agent: np.ndarray) -> State:
+    """Decodes a state from a (grid, agent) pair of arrays"""
+    return State(decode_grid(grid), decode_agent(agent))
+
+
+def encode_observation(
+    observation: Observation,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Encodes an observation as a (grid, agent) pair of arrays"""
+    return encode_grid(observation.grid), encode_agent(observation.agent)
+
+
+def decode_observation(grid: np.ndarray, agent: np.ndarray) -> Observation:
+    """Decodes an observation from a (grid, agent) pair of arrays"""
+    return Observation(decode_grid(grid), decode_agent(agent))
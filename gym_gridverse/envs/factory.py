@@ -30,7 +30,6 @@ from gym_gridverse.spaces import (
     ObservationSpace,
     StateSpace,
 )
-from gym_gridverse.state import State
 
 
 def create_env(
@@ -60,8 +59,8 @@ def create_env(
     """
 
     # Transitions are applied in order
-    transition = partial(
-        transition_fs.chain, transition_functions=transition_functions
+    transition = transition_fs.factory(
+        'chain', transition_functions=transition_functions
     )
 
     # TODO make more general
@@ -71,12 +70,12 @@ def create_env(
     )
 
     # Rewards are additive
-    def reward(state: State, action: Action, next_state: State) -> float:
-        return sum(r(state, action, next_state) for r in rewards)
+    reward = partial(reward_functions.reduce_sum, reward_functions=rewards)
 
     # Termination is a big or
-    def termination(state: State, action: Action, next_state: State) -> bool:
-        return any(t(state, action, next_state) for t in terminations)
+    termination = partial(
+        terminating_functions.reduce_any, terminating_functions=terminations
+    )
 
     return GridWorld(
         domain_space, reset, transition, observation, reward, termination
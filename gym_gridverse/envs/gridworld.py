@@ -1,5 +1,8 @@
+from __future__ import annotations
+
 import copy
-from typing import Optional, Tuple
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
 
 import numpy.random as rnd
 
@@ -9,12 +12,33 @@ from gym_gridverse.envs.observation_functions import ObservationFunction
 from gym_gridverse.envs.reset_functions import ResetFunction
 from gym_gridverse.envs.reward_functions import RewardFunction
 from gym_gridverse.envs.terminating_functions import TerminatingFunction
+from gym_gridverse.envs.transition_features import activate_transition_features
 from gym_gridverse.envs.transition_functions import TransitionFunction
 from gym_gridverse.observation import Observation
+from gym_gridverse.profiling import Profiler
 from gym_gridverse.rng import make_rng
 from gym_gridverse.spaces import DomainSpace
 from gym_gridverse.state import State
 
+if TYPE_CHECKING:
+    from gym_gridverse.envs.yaml.factory import EnvSpec
+
+
+# component attributes, and their profiling names
+_PROFILED_COMPONENTS = {
+    '_functional_reset': 'reset',
+    '_functional_step': 'transition',
+    '_functional_observation': 'observation',
+    'reward_function': 'reward',
+    'termination_function': 'termination',
+}
+_PROFILED_SPACES = ['state_space', 'action_space', 'observation_space']
+_PROFILED_METHODS = [
+    'functional_reset',
+    'functional_step',
+    'functional_observation',
+]
+
 
 class GridWorld(InnerEnv):
     def __init__(  # pylint: disable=too-many-arguments
@@ -38,12 +62,119 @@ class GridWorld(InnerEnv):
 
         self._rng: Optional[rnd.Generator] = None
 
+        # compiled spec this environment was made from, if any
+        self.spec: Optional[EnvSpec] = None
+
+        # see enable_profiling
+        self._profiler: Optional[Profiler] = None
+        self._unprofiled: Dict[str, Any] = {}
+
         super().__init__(
             domain_space.state_space,
             domain_space.action_space,
             domain_space.observation_space,
         )
 
+    def clone(self) -> GridWorld:
+        """Returns a fresh instance of this environment
+
+        The clone is built from the compiled spec if available, and otherwise
+        shares the same components;  it is neither seeded nor reset.
+
+        Returns:
+            GridWorld: new environment
+        """
+        if self.spec is not None:
+            return self.spec.make()
+
+        return GridWorld(*self._components())
+
+    def __reduce__(self):
+        # environments made from a spec pickle as a lightweight descriptor of
+        # the spec (plus runtime state), rather than as a tree of components
+        if self.spec is not None:
+            constructor = self.spec.descriptor().make
+        else:
+            constructor = partial(GridWorld, *self._components())
+
+        runtime_state = (self._rng, self._state, self._observation)
+        return (_restore_gridworld, (constructor, runtime_state))
+
+    def _components(self) -> Tuple:
+        """constructor arguments, excluding any profiling wrappers"""
+        unprofiled = {**vars(self), **self._unprofiled}
+        return (
+            DomainSpace(
+                unprofiled['state_space'],
+                unprofiled['action_space'],
+                unprofiled['observation_space'],
+            ),
+            *(unprofiled[attribute] for attribute in _PROFILED_COMPONENTS),
+        )
+
+    def enable_profiling(self, profiler: Optional[Profiler] = None) -> Profiler:
+        """Starts recording the durations of each environment component
+
+        Components are timed as `reset`, `transition`, `observation`, `reward`
+        and `termination` (including their sub-functions, see
+        :py:meth:`Profiler.instrument
+        <gym_gridverse.profiling.Profiler.instrument>`), the space checks as
+        `<space>.contains`, and the whole functional methods by their name.
+
+        Args:
+            profiler (Optional[Profiler]): profiler to record into, e.g. to
+                aggregate multiple environments;  a new one by default
+
+        Returns:
+            Profiler: profiler which records the durations
+        """
+        if self._profiler is not None:
+            raise ValueError('profiling is already enabled')
+
+        if profiler is None:
+            profiler = Profiler()
+
+        for attribute, name in _PROFILED_COMPONENTS.items():
+            function = getattr(self, attribute)
+            self._unprofiled[attribute] = function
+            setattr(self, attribute, profiler.instrument(name, function))
+
+        # spaces may be shared with other environments, so the copies are timed
+        for attribute in _PROFILED_SPACES:
+            space = getattr(self, attribute)
+            self._unprofiled[attribute] = space
+            space = copy.copy(space)
+            space.contains = profiler.timed(
+                f'{attribute}.contains', space.contains
+            )
+            setattr(self, attribute, space)
+
+        for method in _PROFILED_METHODS:
+            setattr(self, method, profiler.timed(method, getattr(self, method)))
+
+        self._profiler = profiler
+        return profiler
+
+    def disable_profiling(self) -> Optional[Profiler]:
+        """Stops recording durations, and restores the original components
+
+        Returns:
+            Optional[Profiler]: profiler which recorded the durations, if
+            profiling was enabled
+        """
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return None
+
+        for attribute, value in self._unprofiled.items():
+            setattr(self, attribute, value)
+        self._unprofiled.clear()
+
+        for method in _PROFILED_METHODS:
+            delattr(self, method)
+
+        return profiler
+
     def set_seed(self, seed: Optional[int] = None):
         self._rng = make_rng(seed)
 
@@ -70,8 +201,10 @@ class GridWorld(InnerEnv):
         if not self.state_space.contains(next_state):
             raise ValueError('next_state does not satisfy state-space')
 
-        reward = self.reward_function(state, action, next_state)
-        terminal = self.termination_function(state, action, next_state)
+        # reward and terminating functions share the facts they derive
+        with activate_transition_features(state, action, next_state):
+            reward = self.reward_function(state, action, next_state)
+            terminal = self.termination_function(state, action, next_state)
 
         return (next_state, reward, terminal)
 
@@ -81,3 +214,14 @@ class GridWorld(InnerEnv):
             raise ValueError('observation does not satisfy observation-space')
 
         return observation
+
+
+def _restore_gridworld(
+    constructor: Callable[[], GridWorld],
+    runtime_state: Tuple[
+        Optional[rnd.Generator], Optional[State], Optional[Observation]
+    ],
+) -> GridWorld:
+    env = constructor()
+    env._rng, env._state, env._observation = runtime_state
+    return env
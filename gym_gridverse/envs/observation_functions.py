@@ -11,6 +11,7 @@ from gym_gridverse.envs.visibility_functions import (
     minigrid_visibility,
     partial_visibility,
     raytracing_visibility,
+    shadowcasting_visibility,
     stochastic_raytracing_visibility,
 )
 from gym_gridverse.geometry import Orientation, Shape
@@ -82,6 +83,11 @@ stochastic_raytracing_observation = partial(
 )
 """`ObservationFunction` with stochastic ray tracing"""
 
+shadowcasting_observation = partial(
+    from_visibility, visibility_function=shadowcasting_visibility
+)
+"""`ObservationFunction` with symmetric shadowcasting"""
+
 
 def factory(
     name: str,
@@ -137,4 +143,12 @@ def factory(
             observation_space=observation_space,
         )
 
+    if name == 'shadowcasting_observation':
+        if None in [observation_space]:
+            raise ValueError('invalid parameters for name `{name}`')
+
+        return partial(
+            shadowcasting_observation, observation_space=observation_space
+        )
+
     raise ValueError(f'invalid observation function name {name}')
@@ -15,7 +15,7 @@ from gym_gridverse.design import (
     draw_wall_boundary,
 )
 from gym_gridverse.geometry import Orientation
-from gym_gridverse.grid import Grid
+from gym_gridverse.grid import ChunkedGrid, Grid
 from gym_gridverse.grid_object import (
     Color,
     Door,
@@ -36,15 +36,40 @@ class ResetFunction(Protocol):
         ...
 
 
+def _make_grid(height: int, width: int, tile_size: Optional[int]) -> Grid:
+    """dense grid, or chunked grid if a tile size is given"""
+    if tile_size is None:
+        return Grid(height, width)
+
+    return ChunkedGrid(height, width, tile_size=tile_size)
+
+
 def reset_empty(
     height: int,
     width: int,
     random_agent: bool = False,
     random_goal: bool = False,
     *,
+    tile_size: Optional[int] = None,
     rng: Optional[rnd.Generator] = None,
 ) -> State:
-    """An empty environment"""
+    """An empty environment
+
+    Args:
+        height (`int`): height of grid
+        width (`int`): width of grid
+        random_agent (`bool, optional`): random agent position and
+            orientation, in corner if False
+        random_goal (`bool, optional`): random goal position, in corner if
+            False
+        tile_size (`Optional[int]`): if given, the grid is a
+            :py:class:`~gym_gridverse.grid.ChunkedGrid` with this tile size
+            (e.g. for very large maps)
+        rng: (`Generator, optional`)
+
+    Returns:
+        State:
+    """
 
     if height < 4 or width < 4:
         raise ValueError('height and width need to be at least 4')
@@ -53,7 +78,7 @@ def reset_empty(
 
     # TODO test creation (e.g. count number of walls, goals, check held item)
 
-    grid = Grid(height, width)
+    grid = _make_grid(height, width, tile_size)
     draw_wall_boundary(grid)
 
     if random_goal:
@@ -66,13 +91,7 @@ def reset_empty(
     grid[goal_y, goal_x] = Goal()
 
     if random_agent:
-        agent_position = rng.choice(
-            [
-                position
-                for position in grid.positions()
-                if isinstance(grid[position], Floor)
-            ]
-        )
+        agent_position = rng.choice(grid.positions(Floor))
         agent_orientation = rng.choice(list(Orientation))
     else:
         agent_position = (1, 1)
@@ -87,6 +106,7 @@ def reset_rooms(  # pylint: disable=too-many-locals
     width: int,
     layout: Tuple[int, int],
     *,
+    tile_size: Optional[int] = None,
     rng: Optional[rnd.Generator] = None,
 ) -> State:
 
@@ -118,7 +138,7 @@ def reset_rooms(  # pylint: disable=too-many-locals
     if len(x_splits) != len(set(x_splits)):
         raise ValueError(f'insufficient width ({height}) for layout ({layout})')
 
-    grid = Grid(height, width)
+    grid = _make_grid(height, width, tile_size)
     draw_room_grid(grid, y_splits, x_splits, Wall)
 
     # passages in horizontal walls
@@ -135,11 +155,7 @@ def reset_rooms(  # pylint: disable=too-many-locals
 
     # sample agent and goal positions
     agent_position, goal_position = rng.choice(
-        [
-            position
-            for position in grid.positions()
-            if isinstance(grid[position], Floor)
-        ],
+        grid.positions(Floor),
         size=2,
         replace=False,
     )
@@ -156,6 +172,7 @@ def reset_dynamic_obstacles(
     num_obstacles: int,
     random_agent_pos: bool = False,
     *,
+    tile_size: Optional[int] = None,
     rng: Optional[rnd.Generator] = None,
 ) -> State:
     """An environment with dynamically moving obstacles
@@ -165,6 +182,7 @@ def reset_dynamic_obstacles(
         width (`int`): width of grid
         num_obstacles (`int`): number of dynamic obstacles
         random_agent (`bool, optional`): position of agent, in corner if False
+        tile_size (`Optional[int]`): see :py:func:`reset_empty`
         rng: (`Generator, optional`)
 
     Returns:
@@ -173,12 +191,13 @@ def reset_dynamic_obstacles(
 
     rng = get_gv_rng_if_none(rng)
 
-    state = reset_empty(height, width, random_agent_pos, rng=rng)
+    state = reset_empty(
+        height, width, random_agent_pos, tile_size=tile_size, rng=rng
+    )
     vacant_positions = [
         position
-        for position in state.grid.positions()
-        if isinstance(state.grid[position], Floor)
-        and position != state.agent.position
+        for position in state.grid.positions(Floor)
+        if position != state.agent.position
     ]
 
     try:
@@ -199,7 +218,11 @@ def reset_dynamic_obstacles(
 
 
 def reset_keydoor(
-    height: int, width: int, *, rng: Optional[rnd.Generator] = None
+    height: int,
+    width: int,
+    *,
+    tile_size: Optional[int] = None,
+    rng: Optional[rnd.Generator] = None,
 ) -> State:
     """An environment with a key and a door
 
@@ -216,6 +239,7 @@ def reset_keydoor(
     Args:
         height (`int`):
         width (`int`):
+        tile_size (`Optional[int]`): see :py:func:`reset_empty`
         rng: (`Generator, optional`)
 
     Returns:
@@ -228,7 +252,7 @@ def reset_keydoor(
 
     rng = get_gv_rng_if_none(rng)
 
-    state = reset_empty(height, width)
+    state = reset_empty(height, width, tile_size=tile_size)
     assert isinstance(state.grid[height - 2, width - 2], Goal)
 
     # Generate vertical splitting wall
@@ -263,6 +287,7 @@ def reset_crossing(  # pylint: disable=too-many-locals
     num_rivers: int,
     object_type: Type[GridObject],
     *,
+    tile_size: Optional[int] = None,
     rng: Optional[rnd.Generator] = None,
 ) -> State:
     """An environment with "rivers" to be crosses
@@ -286,6 +311,7 @@ def reset_crossing(  # pylint: disable=too-many-locals
         width (`int`): odd width of grid
         num_rivers (`int`): number of `rivers`
         object_type (`Type[GridObject]`): river's object type
+        tile_size (`Optional[int]`): see :py:func:`reset_empty`
         rng: (`Generator, optional`)
 
     Returns:
@@ -308,7 +334,7 @@ def reset_crossing(  # pylint: disable=too-many-locals
 
     rng = get_gv_rng_if_none(rng)
 
-    state = reset_empty(height, width)
+    state = reset_empty(height, width, tile_size=tile_size)
     assert isinstance(state.grid[height - 2, width - 2], Goal)
 
     # token `horizontal` and `vertical` objects
@@ -368,12 +394,16 @@ def reset_crossing(  # pylint: disable=too-many-locals
 
 
 def reset_teleport(
-    height: int, width: int, *, rng: Optional[rnd.Generator] = None
+    height: int,
+    width: int,
+    *,
+    tile_size: Optional[int] = None,
+    rng: Optional[rnd.Generator] = None,
 ) -> State:
 
     rng = get_gv_rng_if_none(rng)
 
-    state = reset_empty(height, width)
+    state = reset_empty(height, width, tile_size=tile_size)
     assert isinstance(state.grid[height - 2, width - 2], Goal)
 
     # Place agent on top left
@@ -385,9 +415,8 @@ def reset_teleport(
     positions = rng.choice(
         [
             position
-            for position in state.grid.positions()
-            if isinstance(state.grid[position], Floor)
-            and position != state.agent.position
+            for position in state.grid.positions(Floor)
+            if position != state.agent.position
         ],
         size=num_telepods,
         replace=False,
@@ -412,6 +441,7 @@ def factory(
     num_obstacles: Optional[int] = None,
     num_rivers: Optional[int] = None,
     object_type: Optional[Type[GridObject]] = None,
+    tile_size: Optional[int] = None,
 ) -> ResetFunction:
 
     if name == 'empty':
@@ -423,13 +453,20 @@ def factory(
             height=height,
             width=width,
             random_agent=random_agent_pos,
+            tile_size=tile_size,
         )
 
     if name == 'rooms':
         if None in [height, width, layout]:
             raise ValueError(f'invalid parameters for name `{name}`')
 
-        return partial(reset_rooms, height=height, width=width, layout=layout)
+        return partial(
+            reset_rooms,
+            height=height,
+            width=width,
+            layout=layout,
+            tile_size=tile_size,
+        )
 
     if name == 'dynamic_obstacles':
         if None in [height, width, num_obstacles, random_agent_pos]:
@@ -441,13 +478,14 @@ def factory(
             width=width,
             num_obstacles=num_obstacles,
             random_agent_pos=random_agent_pos,
+            tile_size=tile_size,
         )
 
     if name == 'keydoor':
         if None in [height, width]:
             raise ValueError(f'invalid parameters for name `{name}`')
 
-        return partial(reset_keydoor, height, width)
+        return partial(reset_keydoor, height, width, tile_size=tile_size)
 
     if name == 'crossing':
         if None in [height, width, num_rivers, object_type]:
@@ -459,12 +497,15 @@ def factory(
             width=width,
             num_rivers=num_rivers,
             object_type=object_type,
+            tile_size=tile_size,
         )
 
     if name == 'teleport':
         if None in [height, width]:
             raise ValueError(f'invalid parameters for name `{name}`')
 
-        return partial(reset_teleport, height=height, width=width)
+        return partial(
+            reset_teleport, height=height, width=width, tile_size=tile_size
+        )
 
     raise ValueError(f'invalid reset function name `{name}`')
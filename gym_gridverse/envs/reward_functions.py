@@ -4,7 +4,10 @@ from typing import Callable, Iterator, Optional, Sequence, Type
 import more_itertools as mitt
 
 from gym_gridverse.action import Action
-from gym_gridverse.envs.utils import updated_agent_position_if_unobstructed
+from gym_gridverse.envs.transition_features import (
+    StateFeatures,
+    get_transition_features,
+)
 from gym_gridverse.geometry import DistanceFunction, Position
 from gym_gridverse.grid_object import (
     Door,
@@ -97,9 +100,10 @@ def overlap(
     Returns:
         float: one of the two input rewards
     """
+    features = get_transition_features(state, action, next_state)
     return (
         reward_on
-        if isinstance(next_state.grid[next_state.agent.position], object_type)
+        if isinstance(features.next_state.object_under_agent, object_type)
         else reward_off
     )
 
@@ -202,11 +206,8 @@ def proportional_to_distance(
         float: input reward times distance to object
     """
 
-    object_position = mitt.one(
-        position
-        for position in next_state.grid.positions()
-        if isinstance(next_state.grid[position], object_type)
-    )
+    features = get_transition_features(state, action, next_state)
+    object_position = mitt.one(features.next_state.positions(object_type))
     distance = distance_function(next_state.agent.position, object_position)
     return reward_per_unit_distance * distance
 
@@ -236,16 +237,15 @@ def getting_closer(
         float: one of the input rewards, or 0.0 if distance has not changed
     """
 
-    def _distance_agent_object(state):
-        object_position = mitt.one(
-            position
-            for position in state.grid.positions()
-            if isinstance(state.grid[position], object_type)
+    def _distance_agent_object(state_features: StateFeatures):
+        object_position = mitt.one(state_features.positions(object_type))
+        return distance_function(
+            state_features.state.agent.position, object_position
         )
-        return distance_function(state.agent.position, object_position)
 
-    distance_prev = _distance_agent_object(state)
-    distance_next = _distance_agent_object(next_state)
+    features = get_transition_features(state, action, next_state)
+    distance_prev = _distance_agent_object(features.state)
+    distance_next = _distance_agent_object(features.next_state)
 
     return (
         reward_closer
@@ -275,16 +275,8 @@ def bump_into_wall(
         reward (float): (optional) The reward to provide if bumping into wall
     """
 
-    attempted_next_position = updated_agent_position_if_unobstructed(
-        state.agent.position, state.agent.orientation, action
-    )
-
-    return (
-        reward
-        if attempted_next_position in state.grid
-        and isinstance(state.grid[attempted_next_position], Wall)
-        else 0.0
-    )
+    features = get_transition_features(state, action, next_state)
+    return reward if isinstance(features.attempted_object, Wall) else 0.0
 
 
 def actuate_door(
@@ -2,7 +2,7 @@ from functools import partial
 from typing import Callable, Iterator, Optional, Sequence, Type
 
 from gym_gridverse.action import Action
-from gym_gridverse.envs.utils import updated_agent_position_if_unobstructed
+from gym_gridverse.envs.transition_features import get_transition_features
 from gym_gridverse.grid_object import Goal, GridObject, MovingObstacle, Wall
 from gym_gridverse.state import State
 
@@ -112,7 +112,8 @@ def overlap(
     Returns:
         bool: True if next_state agent is on object of type object_type
     """
-    return isinstance(next_state.grid[next_state.agent.position], object_type)
+    features = get_transition_features(state, action, next_state)
+    return isinstance(features.next_state.object_under_agent, object_type)
 
 
 def reach_goal(state: State, action: Action, next_state: State) -> bool:
@@ -162,13 +163,8 @@ def bump_into_wall(
     Returns:
         bool: True if next_state agent attempted to move onto a wall cell
     """
-    attempted_next_position = updated_agent_position_if_unobstructed(
-        state.agent.position, state.agent.orientation, action
-    )
-
-    return attempted_next_position in state.grid and (
-        isinstance(state.grid[attempted_next_position], Wall)
-    )
+    features = get_transition_features(state, action, next_state)
+    return isinstance(features.attempted_object, Wall)
 
 
 def factory(
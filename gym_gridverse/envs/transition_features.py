@@ -0,0 +1,166 @@
+"""Facts about a transition which are shared by reward and terminating functions
+
+Reward and terminating functions tend to derive the same facts from a
+transition, e.g. the object under the agent, or the position of the goal,
+each by indexing or scanning the grid again.  A :py:class:`TransitionFeatures`
+computes each such fact lazily, at most once per transition.
+
+:py:class:`~gym_gridverse.envs.gridworld.GridWorld` activates the features of
+each transition while evaluating its reward and terminating functions, and the
+built-in functions access them through :py:func:`get_transition_features`.
+When called outside of an active transition (e.g. directly, with other
+states), the functions receive fresh features instead, so their signatures and
+results are unchanged.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Type
+
+from gym_gridverse.action import Action
+from gym_gridverse.envs.utils import updated_agent_position_if_unobstructed
+from gym_gridverse.geometry import Position
+from gym_gridverse.grid_object import GridObject
+from gym_gridverse.state import State
+
+__all__ = [
+    'StateFeatures',
+    'TransitionFeatures',
+    'activate_transition_features',
+    'get_transition_features',
+]
+
+
+class StateFeatures:
+    """Lazily computed facts about a state
+
+    The state is assumed not to change while the features are in use.
+    """
+
+    __slots__ = ('state', '_object_under_agent', '_positions')
+
+    def __init__(self, state: State):
+        self.state = state
+        self._object_under_agent: Optional[GridObject] = None
+        self._positions: Dict[Type[GridObject], List[Position]] = {}
+
+    @property
+    def object_under_agent(self) -> GridObject:
+        """object in the agent's position"""
+        if self._object_under_agent is None:
+            self._object_under_agent = self.state.grid[
+                self.state.agent.position
+            ]
+
+        return self._object_under_agent
+
+    def positions(self, object_type: Type[GridObject]) -> List[Position]:
+        """Positions of all objects of the given type (including subclasses)
+
+        Args:
+            object_type (Type[GridObject]):
+
+        Returns:
+            List[Position]: positions, in row-major order (shared, should
+            not be modified)
+        """
+        try:
+            return self._positions[object_type]
+        except KeyError:
+            pass
+
+        positions = self._positions[object_type] = list(
+            self.state.grid.positions(object_type)
+        )
+        return positions
+
+
+class TransitionFeatures:
+    """Lazily computed facts about a (state, action, next_state) transition
+
+    Args:
+        state (State):
+        action (Action):
+        next_state (State):
+    """
+
+    __slots__ = ('state', 'action', 'next_state', '_attempted_position')
+
+    def __init__(self, state: State, action: Action, next_state: State):
+        self.state = StateFeatures(state)
+        self.action = action
+        self.next_state = StateFeatures(next_state)
+        self._attempted_position: Optional[Position] = None
+
+    def matches(self, state: State, action: Action, next_state: State) -> bool:
+        """True if the features describe this exact transition (by identity)"""
+        return (
+            self.state.state is state
+            and self.action is action
+            and self.next_state.state is next_state
+        )
+
+    @property
+    def attempted_position(self) -> Position:
+        """position the agent attempted to move into, ignoring obstructions"""
+        if self._attempted_position is None:
+            agent = self.state.state.agent
+            self._attempted_position = updated_agent_position_if_unobstructed(
+                agent.position, agent.orientation, self.action
+            )
+
+        return self._attempted_position
+
+    @property
+    def attempted_object(self) -> Optional[GridObject]:
+        """object in the attempted position, or None if outside the grid"""
+        grid = self.state.state.grid
+        position = self.attempted_position
+        return grid[position] if position in grid else None
+
+
+_active_features: ContextVar[Optional[TransitionFeatures]] = ContextVar(
+    'transition_features', default=None
+)
+
+
+def get_transition_features(
+    state: State, action: Action, next_state: State
+) -> TransitionFeatures:
+    """Returns the features of a transition
+
+    Args:
+        state (State):
+        action (Action):
+        next_state (State):
+
+    Returns:
+        TransitionFeatures: the active features if they describe this
+        transition, otherwise new features
+    """
+    features = _active_features.get()
+    if features is not None and features.matches(state, action, next_state):
+        return features
+
+    return TransitionFeatures(state, action, next_state)
+
+
+@contextmanager
+def activate_transition_features(
+    state: State, action: Action, next_state: State
+) -> Iterator[TransitionFeatures]:
+    """Context in which the features of a transition are shared
+
+    Args:
+        state (State):
+        action (Action):
+        next_state (State):
+
+    Yields:
+        TransitionFeatures: the active features
+    """
+    features = TransitionFeatures(state, action, next_state)
+    token = _active_features.set(features)
+    try:
+        yield features
+    finally:
+        _active_features.reset(token)
@@ -1,14 +1,26 @@
 """ Functions to model dynamics """
 from functools import partial
-from typing import Iterator, List, Optional, Sequence, Tuple, Type
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
+import numpy as np
 import numpy.random as rnd
 from typing_extensions import Protocol  # python3.7 compatibility
 
 from gym_gridverse.action import ROTATION_ACTIONS, TRANSLATION_ACTIONS, Action
 from gym_gridverse.agent import Agent
 from gym_gridverse.envs.utils import updated_agent_position_if_unobstructed
-from gym_gridverse.geometry import Position, get_manhattan_boundary
+from gym_gridverse.geometry import Position
 from gym_gridverse.grid import Grid
 from gym_gridverse.grid_object import (
     Box,
@@ -35,6 +47,58 @@ class TransitionFunction(Protocol):
         ...
 
 
+T = TypeVar('T', bound=Callable)
+
+
+def relevant_actions(*actions: Action) -> Callable[[T], T]:
+    """Decorator which declares the only actions a transition function handles
+
+    The transition function is expected to leave the state unaffected for any
+    other action, so that :py:class:`CompiledChain` can skip calling it
+    altogether.  Functions without this declaration are always called.
+
+    Args:
+        *actions (Action): actions which may affect the state
+    """
+
+    def decorator(transition_function: T) -> T:
+        transition_function.relevant_actions = frozenset(  # type: ignore
+            actions
+        )
+        return transition_function
+
+    return decorator
+
+
+def get_relevant_actions(
+    transition_function: TransitionFunction,
+) -> Optional[FrozenSet[Action]]:
+    """Returns the actions declared relevant by a transition function
+
+    Partial functions and wrappers (e.g. from :py:func:`functools.wraps`)
+    inherit the declaration of the underlying function.
+
+    Args:
+        transition_function (TransitionFunction):
+
+    Returns:
+        Optional[FrozenSet[Action]]: relevant actions, or None if the function
+        may affect the state for any action
+    """
+    while True:
+        try:
+            return transition_function.relevant_actions  # type: ignore
+        except AttributeError:
+            pass
+
+        if isinstance(transition_function, partial):
+            transition_function = transition_function.func
+        elif hasattr(transition_function, '__wrapped__'):
+            transition_function = transition_function.__wrapped__  # type: ignore
+        else:
+            return None
+
+
 def chain(
     state: State,
     action: Action,
@@ -57,6 +121,63 @@ def chain(
         transition_function(state, action, rng=rng)
 
 
+class CompiledChain:
+    """Runs multiple transition functions in a row, skipping irrelevant ones
+
+    Equivalent to :py:func:`chain`, but the functions which are relevant to
+    each action (see :py:func:`relevant_actions`) are determined once, when
+    the chain is compiled, rather than checked by each function at each step.
+
+    Args:
+        transition_functions (Iterable[TransitionFunction]): transition
+            functions, called in order
+    """
+
+    def __init__(self, transition_functions: Iterable[TransitionFunction]):
+        self.transition_functions = list(transition_functions)
+
+        self.dispatch: Dict[Action, Tuple[TransitionFunction, ...]] = {
+            action: tuple(
+                transition_function
+                for transition_function in self.transition_functions
+                if _is_relevant(transition_function, action)
+            )
+            for action in Action
+        }
+
+        function_relevant_actions = [
+            get_relevant_actions(transition_function)
+            for transition_function in self.transition_functions
+        ]
+        self.relevant_actions: Optional[FrozenSet[Action]] = (
+            frozenset().union(*function_relevant_actions)  # type: ignore
+            if None not in function_relevant_actions
+            else None
+        )
+
+    def __call__(
+        self,
+        state: State,
+        action: Action,
+        *,
+        rng: Optional[rnd.Generator] = None,
+    ) -> None:
+        for transition_function in self.dispatch[action]:
+            transition_function(state, action, rng=rng)
+
+    def __reduce__(self):
+        # the dispatch table is rebuilt rather than pickled
+        return (CompiledChain, (self.transition_functions,))
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.transition_functions!r})'
+
+
+def _is_relevant(transition_function: TransitionFunction, action: Action):
+    actions = get_relevant_actions(transition_function)
+    return actions is None or action in actions
+
+
 # TODO move these non-transition functions elsewhere; they are confusing
 
 
@@ -111,6 +232,7 @@ def rotate_agent(agent: Agent, action: Action) -> None:
         agent.orientation = agent.orientation.rotate_right()
 
 
+@relevant_actions(*TRANSLATION_ACTIONS, *ROTATION_ACTIONS)
 def update_agent(
     state: State,
     action: Action,
@@ -130,16 +252,14 @@ def update_agent(
     Returns:
         None
     """
-    if action not in TRANSLATION_ACTIONS and action not in ROTATION_ACTIONS:
-        return
-
     if action in ROTATION_ACTIONS:
         rotate_agent(state.agent, action)
 
-    if action in TRANSLATION_ACTIONS:
+    elif action in TRANSLATION_ACTIONS:
         move_agent(state.agent, state.grid, action)
 
 
+@relevant_actions(Action.PICK_N_DROP)
 def pickup_mechanics(
     state: State,
     action: Action,
@@ -191,44 +311,132 @@ def pickup_mechanics(
     state.agent.obj = obj_in_front_of_agent if can_pickup else NoneGridObject()
 
 
-def _unique_object_type_positions(
-    grid: Grid, object_type: Type[GridObject]
-) -> Iterator[Tuple[Position, GridObject]]:
-    """Utility for iterating *once* over position/objects.
+# offsets of the cells at Manhattan distance 1, in the order of
+# get_manhattan_boundary
+_MOVE_OFFSETS = np.array([(-1, 0), (0, 1), (1, 0), (0, -1)])
+# offsets of the cells at Manhattan distance 1 or 2, i.e. of the obstacles
+# whose moves may change the neighboring cells of an obstacle
+_CONFLICT_OFFSETS = np.array(
+    [
+        (dy, dx)
+        for dy in range(-2, 3)
+        for dx in range(-2, 3)
+        if 0 < abs(dy) + abs(dx) <= 2
+    ]
+)
 
-    Every object is only yielded once, even if the objects move during the
-    interleaved iteration.
-    """
 
-    objects: List[GridObject] = []
-    for position in grid.positions():
-        obj = grid[position]
+def moving_obstacle_moves(
+    floor: np.ndarray,
+    obstacles: np.ndarray,
+    *,
+    rng: Optional[rnd.Generator] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Random moves of moving obstacles, computed on masks
 
-        if isinstance(obj, object_type) and not any(obj is x for x in objects):
-            objects.append(obj)
-            yield position, obj
+    Obstacles are processed in row-major order, and each moves to a uniformly
+    random neighboring Floor cell (if any), given the moves of the obstacles
+    processed before it.  Only the obstacles which have a previous obstacle
+    within Manhattan distance 2 (whose move may change their neighboring
+    cells) are processed one at a time;  all others are processed at once.
+    The rng is used exactly as by moving the obstacles one at a time.
 
+    Leading dimensions are batch dimensions, i.e. the masks may contain many
+    independent grids.
 
-def _step_moving_obstacle(
-    grid: Grid, position: Position, *, rng: Optional[rnd.Generator] = None
-):
-    """Utility for moving a single MovingObstacle randomly"""
-    assert isinstance(grid[position], MovingObstacle)
+    Args:
+        floor (np.ndarray): (..., height, width) mask of Floor cells
+        obstacles (np.ndarray): (..., height, width) mask of moving obstacles
+        rng (Optional[rnd.Generator]): rng of the moves
 
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (num_moves, ndim) indices of the
+        sources and targets of the moves, in order
+    """
     rng = get_gv_rng_if_none(rng)
 
-    next_positions = [
-        next_position
-        for next_position in get_manhattan_boundary(position, distance=1)
-        if next_position in grid and isinstance(grid[next_position], Floor)
-    ]
-
-    try:
-        next_position = rng.choice(next_positions)
-    except ValueError:
-        pass
-    else:
-        grid.swap(position, next_position)
+    # padding keeps neighborhoods within their own row and grid
+    padding = [(0, 0)] * (floor.ndim - 2) + [(2, 2), (2, 2)]
+    padded_floor = np.pad(floor.astype(bool), padding)
+    padded_shape = padded_floor.shape
+    floor_cells = padded_floor.ravel()
+
+    strides = np.array([padded_shape[-1], 1])
+    move_offsets = _MOVE_OFFSETS @ strides
+    conflict_offsets = _CONFLICT_OFFSETS @ strides
+
+    cells = np.flatnonzero(np.pad(obstacles.astype(bool), padding))
+    indices = np.arange(len(cells))
+
+    order = np.full(floor_cells.size, len(cells))
+    order[cells] = indices
+    conflicts = (
+        order[cells[:, np.newaxis] + conflict_offsets] < indices[:, np.newaxis]
+    ).any(axis=1)
+
+    # valid for obstacles without conflicts
+    candidates = floor_cells[cells[:, np.newaxis] + move_offsets]
+    counts = candidates.sum(axis=1)
+
+    sources: List[np.ndarray] = []
+    targets: List[np.ndarray] = []
+    begin = 0
+    for end in [*np.flatnonzero(conflicts), len(cells)]:
+        # obstacles without conflicts, at once
+        batch = indices[begin:end]
+        batch = batch[counts[batch] > 0]
+        if len(batch) > 0:
+            choices = rng.integers(counts[batch])
+            moves = (
+                candidates[batch].cumsum(axis=1) > choices[:, np.newaxis]
+            ).argmax(axis=1)
+            sources.append(cells[batch])
+            targets.append(cells[batch] + move_offsets[moves])
+            floor_cells[sources[-1]] = True
+            floor_cells[targets[-1]] = False
+
+        # obstacle with conflicts, given the previous moves
+        if end < len(cells):
+            cell = cells[end]
+            next_cells = cell + move_offsets[floor_cells[cell + move_offsets]]
+            if len(next_cells) > 0:
+                sources.append(cells[end : end + 1])
+                targets.append(next_cells[rng.integers(len(next_cells))][None])
+                floor_cells[cell] = True
+                floor_cells[targets[-1]] = False
+
+        begin = end + 1
+
+    def unpadded_indices(flat_cells: List[np.ndarray]) -> np.ndarray:
+        if not flat_cells:
+            return np.empty((0, floor.ndim), dtype=np.int64)
+
+        unraveled = np.stack(
+            np.unravel_index(np.concatenate(flat_cells), padded_shape), axis=1
+        )
+        unraveled[:, -2:] -= 2
+        return unraveled
+
+    return unpadded_indices(sources), unpadded_indices(targets)
+
+
+def _object_type_masks(
+    grid: Grid, *object_types: Type[GridObject]
+) -> List[np.ndarray]:
+    """masks of the objects of each type (including subclasses)"""
+    # pylint: disable=protected-access
+    types = np.frompyfunc(type, 1, 1)(grid._object_array())
+    present = set(types.flat)
+
+    masks = []
+    for object_type in object_types:
+        mask = np.zeros(types.shape, dtype=bool)
+        for t in present:
+            if issubclass(t, object_type):
+                mask |= types == t
+        masks.append(mask)
+
+    return masks
 
 
 def step_moving_obstacles(
@@ -242,20 +450,26 @@ def step_moving_obstacles(
     Moves each MovingObstacle only to cells containing _Floor_ objects, and
     will do so with random walk. In current implementation can only move 1 cell
     non-diagonally. If (and only if) no open cells are available will it stay
-    put
+    put.  The moves are computed at once by :py:func:`moving_obstacle_moves`
 
     Args:
         state (`State`): current state
         action (`Action`): action taken by agent (ignored)
     """
-    rng = get_gv_rng_if_none(rng)
-
-    for position, obj in _unique_object_type_positions(
-        state.grid, MovingObstacle
+    # no rng is used without obstacles
+    if not any(
+        issubclass(object_type, MovingObstacle)
+        for object_type in state.grid.object_types()
     ):
-        _step_moving_obstacle(state.grid, position, rng=rng)
+        return
+
+    floor, obstacles = _object_type_masks(state.grid, Floor, MovingObstacle)
+    sources, targets = moving_obstacle_moves(floor, obstacles, rng=rng)
+    for (y, x), (next_y, next_x) in zip(sources.tolist(), targets.tolist()):
+        state.grid.swap(Position(y, x), Position(next_y, next_x))
 
 
+@relevant_actions(Action.ACTUATE)
 def actuate_door(
     state: State,
     action: Action,
@@ -300,6 +514,7 @@ def actuate_door(
             door.state = Door.Status.OPEN
 
 
+@relevant_actions(Action.ACTUATE)
 def actuate_box(
     state: State,
     action: Action,
@@ -365,7 +580,7 @@ def factory(
         if None in [transition_functions]:
             raise ValueError(f'invalid parameters for name `{name}`')
 
-        return partial(chain, transition_functions=transition_functions)
+        return CompiledChain(transition_functions)  # type: ignore
 
     if name == 'update_agent':
         return update_agent
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import numpy as np
 import numpy.random as rnd
@@ -199,6 +199,461 @@ def stochastic_raytracing_visibility(  # TODO add test
     return visibility
 
 
+def shadowcasting_visibility(
+    grid: Grid,
+    position: Position,
+    *,
+    rng: Optional[rnd.Generator] = None,  # pylint: disable=unused-argument
+) -> np.ndarray:
+    """symmetric shadowcasting, as described by Albert Ford
+
+    Each of the four quadrants around the agent is scanned row by row moving
+    away from the agent, keeping track of the range of slopes which is still
+    lit;  non-transparent tiles narrow the range of the following rows, and
+    split it in two when they lie in its middle.  A transparent tile is
+    visible if its center lies within the lit range, and a non-transparent
+    tile is visible if any part of it does.  Visibility is symmetric for
+    transparent tiles:  the agent sees a transparent tile iff it would see the
+    agent from that tile.
+
+    The cost is proportional to the number of visible tiles, rather than to
+    the number of rays times their length as in
+    :py:func:`raytracing_visibility`, which makes it suitable for large
+    observation windows.
+    """
+    transparent = _transparency(grid)
+    height, width = transparent.shape
+
+    visibility = np.zeros((height, width), dtype=bool)
+    visibility[position.y, position.x] = True  # agent
+
+    # (depth, column) -> (y, x) of each quadrant, as (dy_depth, dy_column,
+    # dx_depth, dx_column)
+    for ydepth, ycol, xdepth, xcol in [
+        (-1, 0, 0, 1),  # north
+        (1, 0, 0, 1),  # south
+        (0, 1, 1, 0),  # east
+        (0, 1, -1, 0),  # west
+    ]:
+
+        def transform(depth: int, col: int) -> Tuple[int, int]:
+            # pylint: disable=cell-var-from-loop
+            return (
+                position.y + depth * ydepth + col * ycol,
+                position.x + depth * xdepth + col * xcol,
+            )
+
+        def is_transparent(depth: int, col: int) -> bool:
+            y, x = transform(depth, col)
+            return (
+                0 <= y < height and 0 <= x < width and bool(transparent[y, x])
+            )
+
+        # rows to scan, as depth and slopes (num, den) with den > 0
+        rows: List[Tuple[int, Tuple[int, int], Tuple[int, int]]] = [
+            (1, (-1, 1), (1, 1))
+        ]
+        while rows:
+            depth, start, end = rows.pop()
+            # columns whose center is closest to the slopes, ties away from
+            # the center of the row
+            min_col = (2 * depth * start[0] + start[1]) // (2 * start[1])
+            max_col = -((end[1] - 2 * depth * end[0]) // (2 * end[1]))
+
+            previous_transparent: Optional[bool] = None
+            for col in range(min_col, max_col + 1):
+                col_transparent = is_transparent(depth, col)
+                y, x = transform(depth, col)
+
+                if 0 <= y < height and 0 <= x < width:
+                    if not col_transparent:
+                        visibility[y, x] = True
+                    elif (
+                        col * start[1] >= depth * start[0]
+                        and col * end[1] <= depth * end[0]
+                    ):
+                        # symmetric:  center of the tile is within the slopes
+                        visibility[y, x] = True
+
+                if previous_transparent is False and col_transparent:
+                    start = (2 * col - 1, 2 * depth)
+                if previous_transparent and not col_transparent:
+                    rows.append((depth + 1, start, (2 * col - 1, 2 * depth)))
+
+                previous_transparent = col_transparent
+
+            if previous_transparent:
+                rows.append((depth + 1, start, end))
+
+    return visibility
+
+
+class IncrementalVisibility:
+    """Deterministic visibility function which only recomputes what changed
+
+    Wraps :py:func:`partial_visibility`, :py:func:`minigrid_visibility` or
+    :py:func:`raytracing_visibility`, and remembers the transparency and the
+    visibility of the previous call.  When the next call has the same shape
+    and position (e.g. as in
+    :py:func:`~gym_gridverse.envs.observation_functions.from_visibility`,
+    where the agent is always at the same position of the window), only the
+    visibility downstream of the cells whose transparency changed is
+    recomputed:  the strides of the quadrants of
+    :py:func:`partial_visibility`, the rows of :py:func:`minigrid_visibility`,
+    or the rays of :py:func:`raytracing_visibility`.  Other calls, or calls
+    where most of the window changed (e.g. after a translation), are
+    recomputed fully.
+
+    The result is always equal to that of the wrapped visibility function.
+
+    Args:
+        visibility_function (VisibilityFunction): deterministic visibility
+            function to compute incrementally
+    """
+
+    def __init__(self, visibility_function: VisibilityFunction):
+        try:
+            updater_type = _INCREMENTAL_UPDATERS[visibility_function]
+        except (KeyError, TypeError) as error:
+            raise ValueError(
+                f'visibility function {visibility_function} does not support '
+                'incremental updates'
+            ) from error
+
+        self.visibility_function = visibility_function
+        self.num_full_updates = 0
+        self.num_incremental_updates = 0
+
+        self._updater_type = updater_type
+        self._updater: Optional[_IncrementalUpdater] = None
+        self._transparent: Optional[np.ndarray] = None
+        self._visibility: Optional[np.ndarray] = None
+
+    def __call__(
+        self,
+        grid: Grid,
+        position: Position,
+        *,
+        rng: Optional[rnd.Generator] = None,  # pylint: disable=unused-argument
+    ) -> np.ndarray:
+        return self.update(_transparency(grid), position)
+
+    def update(self, transparent: np.ndarray, position: Position) -> np.ndarray:
+        """visibility given the transparency of each cell
+
+        Args:
+            transparent (np.ndarray): height x width transparency mask
+            position (Position): position of the agent
+
+        Returns:
+            np.ndarray: height x width visibility mask
+        """
+        if (
+            self._updater is None
+            or self._updater.position != position
+            or self._transparent.shape != transparent.shape
+        ):
+            self._updater = self._updater_type(transparent.shape, position)
+            changed = None
+        else:
+            changed = np.argwhere(transparent != self._transparent)
+            if 2 * len(changed) > transparent.size:
+                changed = None
+
+        if changed is None:
+            self._visibility = self._updater.full(transparent)
+            self.num_full_updates += 1
+        elif len(changed) > 0:
+            self._visibility = self._updater.update(transparent, changed)
+            self.num_incremental_updates += 1
+
+        self._transparent = transparent.copy()
+        return self._visibility.copy()
+
+    def reset(self):
+        """forgets the previous call"""
+        self._updater = None
+        self._transparent = None
+        self._visibility = None
+
+
+class _IncrementalUpdater:
+    """Visibility of a fixed shape and position, updated in place"""
+
+    def __init__(self, shape: Tuple[int, int], position: Position):
+        self.shape = shape
+        self.position = position
+        self.visibility = np.zeros(shape, dtype=bool)
+
+    def full(self, transparent: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def update(
+        self, transparent: np.ndarray, changed: np.ndarray
+    ) -> np.ndarray:
+        """updates the visibility given the (y, x) rows of changed cells"""
+        raise NotImplementedError
+
+
+class _PartialVisibilityUpdater(_IncrementalUpdater):
+    """:py:func:`partial_visibility`, by front, left and right strides and
+    top left and top right quadrants
+
+    Each cell of a quadrant only depends on cells which are further from the
+    agent, so that a change at (y, x) only affects the rectangle of the
+    quadrant between (y, x) and the corner of the grid.
+    """
+
+    def __init__(self, shape: Tuple[int, int], position: Position):
+        if position.y != shape[0] - 1:
+            raise NotImplementedError
+
+        super().__init__(shape, position)
+
+    def full(self, transparent: np.ndarray) -> np.ndarray:
+        y, x = self.position.y, self.position.x
+
+        self.visibility[:] = False
+        self.visibility[y, x] = True  # agent
+        self._front(transparent)
+        self._right(transparent)
+        self._left(transparent)
+        self._top_left(transparent, y - 1, x - 1)
+        self._top_right(transparent, y - 1, x + 1)
+        return self.visibility
+
+    def update(
+        self, transparent: np.ndarray, changed: np.ndarray
+    ) -> np.ndarray:
+        y, x = self.position.y, self.position.x
+        ys, xs = changed[:, 0], changed[:, 1]
+
+        if ((ys == y) & (xs == x)).any():
+            return self.full(transparent)
+
+        if (xs == x).any():
+            self._front(transparent)
+        if ((xs > x) & (ys == y)).any():
+            self._right(transparent)
+        if ((xs < x) & (ys == y)).any():
+            self._left(transparent)
+
+        left = xs <= x
+        if left.any():
+            self._top_left(
+                transparent,
+                np.minimum(ys[left], y - 1).max(),
+                np.minimum(xs[left], x - 1).max(),
+            )
+
+        right = xs >= x
+        if right.any():
+            self._top_right(
+                transparent,
+                np.minimum(ys[right], y - 1).max(),
+                np.maximum(xs[right], x + 1).min(),
+            )
+
+        return self.visibility
+
+    def _front(self, transparent: np.ndarray):
+        visibility = self.visibility
+        x = self.position.x
+        for y in range(self.position.y - 1, -1, -1):
+            visibility[y, x] = visibility[y + 1, x] and transparent[y + 1, x]
+
+    def _right(self, transparent: np.ndarray):
+        visibility = self.visibility
+        y = self.position.y
+        for x in range(self.position.x + 1, self.shape[1]):
+            visibility[y, x] = visibility[y, x - 1] and transparent[y, x - 1]
+
+    def _left(self, transparent: np.ndarray):
+        visibility = self.visibility
+        y = self.position.y
+        for x in range(self.position.x - 1, -1, -1):
+            visibility[y, x] = visibility[y, x + 1] and transparent[y, x + 1]
+
+    def _top_left(self, transparent: np.ndarray, ymax: int, xmax: int):
+        """recomputes the rectangle (0, 0) -- (ymax, xmax)"""
+        visibility = self.visibility
+        for y in range(ymax, -1, -1):
+            for x in range(xmax, -1, -1):
+                visibility[y, x] = (
+                    (transparent[y + 1, x] and visibility[y + 1, x])
+                    or (transparent[y, x + 1] and visibility[y, x + 1])
+                    or (transparent[y + 1, x + 1] and visibility[y + 1, x + 1])
+                )
+
+    def _top_right(self, transparent: np.ndarray, ymax: int, xmin: int):
+        """recomputes the rectangle (0, xmin) -- (ymax, width - 1)"""
+        visibility = self.visibility
+        for y in range(ymax, -1, -1):
+            for x in range(xmin, self.shape[1]):
+                visibility[y, x] = (
+                    (transparent[y + 1, x] and visibility[y + 1, x])
+                    or (transparent[y, x - 1] and visibility[y, x - 1])
+                    or (transparent[y + 1, x - 1] and visibility[y + 1, x - 1])
+                )
+
+
+class _MinigridVisibilityUpdater(_IncrementalUpdater):
+    """:py:func:`minigrid_visibility`, row by row from the bottom
+
+    Each row only affects the rows above it, so that a change in row y only
+    requires resuming from row y, with its visibility as it was before it
+    was processed.
+    """
+
+    def __init__(self, shape: Tuple[int, int], position: Position):
+        if position.y != shape[0] - 1:
+            raise NotImplementedError
+
+        super().__init__(shape, position)
+        # visibility of each row before it is processed
+        self.seeds = np.zeros(shape, dtype=bool)
+
+    def full(self, transparent: np.ndarray) -> np.ndarray:
+        self.visibility[:] = False
+        self.visibility[self.position.y, self.position.x] = True  # agent
+        self._rows(transparent, self.shape[0] - 1)
+        return self.visibility
+
+    def update(
+        self, transparent: np.ndarray, changed: np.ndarray
+    ) -> np.ndarray:
+        start = changed[:, 0].max()
+        self.visibility[:start] = False
+        self.visibility[start] = self.seeds[start]
+        self._rows(transparent, start)
+        return self.visibility
+
+    def _rows(self, transparent: np.ndarray, start: int):
+        visibility = self.visibility
+        width = self.shape[1]
+        for y in range(start, -1, -1):
+            self.seeds[y] = visibility[y]
+
+            for x in range(width - 1):
+                if visibility[y, x] and transparent[y, x]:
+                    visibility[y, x + 1] = True
+                    if y > 0:
+                        visibility[y - 1, x] = True
+                        visibility[y - 1, x + 1] = True
+
+            for x in range(width - 1, 0, -1):
+                if visibility[y, x] and transparent[y, x]:
+                    visibility[y, x - 1] = True
+                    if y > 0:
+                        visibility[y - 1, x] = True
+                        visibility[y - 1, x - 1] = True
+
+
+class _RaytracingVisibilityUpdater(_IncrementalUpdater):
+    """:py:func:`raytracing_visibility`, as the number of rays lighting each
+    cell
+
+    Each ray lights its cells up to and including its first non-transparent
+    cell, so that a change only affects the rays which cross it.
+    """
+
+    def __init__(self, shape: Tuple[int, int], position: Position):
+        super().__init__(shape, position)
+
+        height, width = shape
+        area = Area((0, height - 1), (0, width - 1))
+        rays = cached_compute_rays_fancy(position, area)
+
+        # (ray, step) -> flat cell, padded with the index past the last cell
+        self.lengths = np.array([len(ray) for ray in rays], dtype=np.int64)
+        self.cells = np.full(
+            (len(rays), self.lengths.max(initial=0)), height * width
+        )
+        for i, ray in enumerate(rays):
+            self.cells[i, : len(ray)] = [p.y * width + p.x for p in ray]
+
+        # flat cell -> rays which cross it, as a CSR matrix
+        ray_indices, steps = np.nonzero(self.cells < height * width)
+        order = np.argsort(self.cells[ray_indices, steps], kind='stable')
+        self.cell_rays = ray_indices[order]
+        self.cell_indptr = np.concatenate(
+            [
+                [0],
+                np.cumsum(
+                    np.bincount(
+                        self.cells[ray_indices, steps],
+                        minlength=height * width,
+                    )
+                ),
+            ]
+        )
+
+        self.lit_lengths = np.zeros(len(rays), dtype=np.int64)
+        self.counts = np.zeros(height * width, dtype=np.int64)
+
+    def full(self, transparent: np.ndarray) -> np.ndarray:
+        rays = np.arange(len(self.lengths))
+        self.lit_lengths = self._lit_lengths(transparent, rays)
+        self.counts = self._counts(rays, self.lit_lengths)
+        self.visibility = (self.counts > 0).reshape(self.shape)
+        return self.visibility
+
+    def update(
+        self, transparent: np.ndarray, changed: np.ndarray
+    ) -> np.ndarray:
+        cells = changed[:, 0] * self.shape[1] + changed[:, 1]
+        rays = np.unique(
+            np.concatenate(
+                [
+                    self.cell_rays[
+                        self.cell_indptr[c] : self.cell_indptr[c + 1]
+                    ]
+                    for c in cells
+                ]
+            )
+        )
+
+        lit_lengths = self._lit_lengths(transparent, rays)
+        modified = lit_lengths != self.lit_lengths[rays]
+        rays, lit_lengths = rays[modified], lit_lengths[modified]
+
+        self.counts -= self._counts(rays, self.lit_lengths[rays])
+        self.counts += self._counts(rays, lit_lengths)
+        self.lit_lengths[rays] = lit_lengths
+
+        self.visibility = (self.counts > 0).reshape(self.shape)
+        return self.visibility
+
+    def _lit_lengths(self, transparent: np.ndarray, rays: np.ndarray):
+        """number of cells lit by each ray"""
+        cells = self.cells[rays]
+        opaque = ~np.append(transparent.ravel(), True)[cells]
+        return np.where(
+            opaque.any(axis=1), opaque.argmax(axis=1) + 1, self.lengths[rays]
+        )
+
+    def _counts(self, rays: np.ndarray, lit_lengths: np.ndarray) -> np.ndarray:
+        """number of rays lighting each cell"""
+        cells = self.cells[rays]
+        lit = np.arange(cells.shape[1]) < lit_lengths[:, np.newaxis]
+        return np.bincount(cells[lit], minlength=self.counts.size)
+
+
+def _transparency(grid: Grid) -> np.ndarray:
+    """height x width transparency mask"""
+    return np.array(
+        [[obj.transparent for obj in row] for row in grid.to_objects()],
+        dtype=bool,
+    )
+
+
+_INCREMENTAL_UPDATERS = {
+    partial_visibility: _PartialVisibilityUpdater,
+    minigrid_visibility: _MinigridVisibilityUpdater,
+    raytracing_visibility: _RaytracingVisibilityUpdater,
+}
+
+
 def factory(name: str) -> VisibilityFunction:
 
     if name == 'full_visibility':
@@ -216,4 +671,7 @@ def factory(name: str) -> VisibilityFunction:
     if name == 'stochastic_raytracing_visibility':
         return stochastic_raytracing_visibility
 
+    if name == 'shadowcasting_visibility':
+        return shadowcasting_visibility
+
     raise ValueError(f'invalid visibility function name {name}')
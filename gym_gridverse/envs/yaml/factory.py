@@ -1,5 +1,10 @@
-from functools import partial
-from typing import List, Optional, Tuple, Type
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Type
 
 import yaml
 from gym_gridverse.action import Action
@@ -107,6 +112,7 @@ def factory_reset_function(
         num_obstacles=data.get('num_obstacles'),
         num_rivers=data.get('num_rivers'),
         object_type=object_type,
+        tile_size=data.get('tile_size'),
     )
 
 
@@ -114,8 +120,8 @@ def factory_transition_function(data) -> transition_fs.TransitionFunction:
     data = schemas.transition_functions_schema().validate(data)
 
     transition_functions = [transition_fs.factory(d['name']) for d in data]
-    return partial(
-        transition_fs.chain, transition_functions=transition_functions
+    return transition_fs.factory(
+        'chain', transition_functions=transition_functions
     )
 
 
@@ -223,7 +229,106 @@ def factory_terminating_function(data) -> terminating_fs.TerminatingFunction:
     )
 
 
-def factory_env_from_data(data) -> InnerEnv:
+@dataclass(frozen=True)
+class EnvSpec:
+    """Compiled environment specification
+
+    Holds the validated configuration data and the components built from it,
+    so that environments can be instantiated repeatedly (see :py:meth:`make`)
+    without parsing and validating the configuration again.  The components
+    are shared between the instantiated environments, and should not be
+    mutated.
+
+    Args:
+        content_hash (Optional[str]): sha256 hex digest of the yaml file, if
+            the spec was compiled from one
+        data (Dict): validated configuration data
+        domain_space (DomainSpace): state, action and observation spaces
+        reset_function (ResetFunction):
+        transition_function (TransitionFunction):
+        observation_function (ObservationFunction):
+        reward_function (RewardFunction):
+        terminating_function (TerminatingFunction):
+    """
+
+    content_hash: Optional[str]
+    data: Dict
+    domain_space: DomainSpace
+    reset_function: reset_fs.ResetFunction
+    transition_function: transition_fs.TransitionFunction
+    observation_function: observation_fs.ObservationFunction
+    reward_function: reward_fs.RewardFunction
+    terminating_function: terminating_fs.TerminatingFunction
+
+    def make(self) -> GridWorld:
+        """instantiates a new environment (neither seeded nor reset)"""
+        env = GridWorld(
+            self.domain_space,
+            self.reset_function,
+            self.transition_function,
+            self.observation_function,
+            self.reward_function,
+            self.terminating_function,
+        )
+        env.spec = self
+        return env
+
+    def descriptor(self) -> 'EnvDescriptor':
+        """returns a lightweight picklable reference to this spec"""
+        return EnvDescriptor(self.content_hash, self.data)
+
+
+@dataclass(frozen=True)
+class EnvDescriptor:
+    """Lightweight picklable reference to a compiled environment spec
+
+    Pickling a descriptor only pickles the configuration data, rather than the
+    tree of compiled components;  unpickled descriptors recompile the spec at
+    most once per process, using the in-process spec cache.  This is what
+    :py:class:`~gym_gridverse.envs.gridworld.GridWorld` instances made from a
+    spec pickle themselves as, e.g. when shipped to worker processes.
+
+    Args:
+        content_hash (Optional[str]): sha256 hex digest of the yaml file, if
+            the spec was compiled from one
+        data (Dict): validated configuration data
+    """
+
+    content_hash: Optional[str]
+    data: Dict
+
+    @property
+    def key(self) -> str:
+        """key in the spec cache;  falls back on a hash of the data"""
+        if self.content_hash is not None:
+            return self.content_hash
+
+        content = json.dumps(self.data, sort_keys=True, default=str)
+        return _hash_content(content.encode())
+
+    def spec(self) -> EnvSpec:
+        """returns the compiled spec, compiling it if not already cached"""
+        key = self.key
+
+        try:
+            return _env_spec_cache[key]
+        except KeyError:
+            pass
+
+        spec = factory_env_spec_from_data(
+            self.data, content_hash=self.content_hash
+        )
+        _env_spec_cache[key] = spec
+        return spec
+
+    def make(self) -> GridWorld:
+        """instantiates a new environment (neither seeded nor reset)"""
+        return self.spec().make()
+
+
+def factory_env_spec_from_data(
+    data, *, content_hash: Optional[str] = None
+) -> EnvSpec:
     data = schemas.env_schema().validate(data)
 
     state_space = factory_state_space(data['state_space'])
@@ -253,7 +358,9 @@ def factory_env_from_data(data) -> InnerEnv:
         data['terminating_function']
     )
 
-    return GridWorld(
+    return EnvSpec(
+        content_hash,
+        data,
         domain_space,
         reset_function,
         transition_function,
@@ -263,8 +370,94 @@ def factory_env_from_data(data) -> InnerEnv:
     )
 
 
+def factory_env_from_data(data) -> InnerEnv:
+    return factory_env_spec_from_data(data).make()
+
+
+# compiled specs, indexed by content hash
+_env_spec_cache: Dict[str, EnvSpec] = {}
+
+
+def factory_env_spec_from_yaml(
+    path: str, *, cache_dir: Optional[str] = None
+) -> EnvSpec:
+    """Returns the compiled spec of a yaml file, cached by content hash
+
+    Specs are cached in-process and, if ``cache_dir`` is given, also on disk
+    as pickle files, e.g. to share them between worker processes.  Since the
+    cache is indexed by the file content, modified files are recompiled;  the
+    on-disk cache should be cleared when the library itself is updated.
+
+    Args:
+        path (str): path to yaml file
+        cache_dir (Optional[str]): directory of the on-disk cache
+
+    Returns:
+        EnvSpec: compiled environment specification
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+
+    content_hash = _hash_content(content)
+
+    try:
+        return _env_spec_cache[content_hash]
+    except KeyError:
+        pass
+
+    cache_filename = (
+        os.path.join(cache_dir, f'{content_hash}.pickle')
+        if cache_dir is not None
+        else None
+    )
+
+    spec: Optional[EnvSpec] = None
+    if cache_filename is not None:
+        try:
+            with open(cache_filename, 'rb') as f:
+                spec = pickle.load(f)
+        except FileNotFoundError:
+            pass
+
+    if spec is None:
+        data = yaml.safe_load(content)
+        spec = factory_env_spec_from_data(data, content_hash=content_hash)
+
+        if cache_filename is not None:
+            assert cache_dir is not None  # forces typing
+            os.makedirs(cache_dir, exist_ok=True)
+
+            # write and rename, so that concurrent readers never see a
+            # partially written file
+            with tempfile.NamedTemporaryFile(
+                'wb', dir=cache_dir, delete=False
+            ) as f:
+                pickle.dump(spec, f)
+            os.replace(f.name, cache_filename)
+
+    _env_spec_cache[content_hash] = spec
+    return spec
+
+
 def factory_env_from_yaml(path: str) -> InnerEnv:
-    with open(path) as f:
-        data = yaml.safe_load(f)
+    return factory_env_spec_from_yaml(path).make()
+
+
+def hash_yaml(path: str) -> str:
+    """Returns the sha256 hex digest of a yaml configuration file
+
+    Used to identify the environment which produced a recorded trajectory;  any
+    change to the file (including whitespace and comments) changes the hash.
+
+    Args:
+        path (str): path to yaml file
+
+    Returns:
+        str: 64 character hex digest
+    """
+    with open(path, 'rb') as f:
+        return _hash_content(f.read())
+
 
-    return factory_env_from_data(data)
+def _hash_content(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
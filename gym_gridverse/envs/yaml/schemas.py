@@ -181,6 +181,7 @@ def reset_function_schema():
             Optional('random_agent'): bool,
             Optional('num_rivers'): And(int, positive_schema()),
             Optional('object_type'): object_type_schema(),
+            Optional('tile_size'): And(int, positive_schema()),
         },
         name='reset_function',
         as_reference=True,
@@ -273,6 +274,7 @@ def visibility_function_schema():
             'minigrid_visibility',
             'raytracing_visibility',
             'stochastic_raytracing_visibility',
+            'shadowcasting_visibility',
         ),
         description='A visibility functions',
     )
@@ -6,7 +6,10 @@ import math
 from dataclasses import dataclass
 from typing import Callable, Iterable, Iterator, List, Tuple, Union
 
-from cached_property import cached_property
+try:
+    from functools import cached_property
+except ImportError:  # python3.7 compatibility
+    from cached_property import cached_property  # type: ignore
 
 
 @dataclass(frozen=True)
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import Iterable, List, Sequence, Set, Type
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type
 
 import numpy as np
 
@@ -57,20 +57,24 @@ class Grid:
         return grid
 
     def to_objects(self) -> List[List[GridObject]]:
-        return self._grid.tolist()
+        return self._object_array().tolist()
+
+    def _object_array(self) -> np.ndarray:
+        """height x width array of the objects (not to be modified)"""
+        return self._grid
+
+    def _peek(self, y: int, x: int) -> GridObject:
+        """object at a position within the grid, only to be read"""
+        return self._grid[y, x]
 
     def __eq__(self, other) -> bool:
         if not isinstance(other, Grid):
             return NotImplemented
 
-        if self.shape != other.shape:
-            return False
-
-        for pos in self.positions():
-            if self[pos] != other[pos]:
-                return False
-
-        return True
+        return (
+            self.shape == other.shape
+            and self.to_objects() == other.to_objects()
+        )
 
     @property
     def area(self) -> Area:
@@ -92,9 +96,27 @@ class Grid:
         if position not in self:
             raise exception_type(f'Position {position} ')
 
-    def positions(self) -> Iterable[Position]:
-        """iterator over positions"""
-        return self.area.positions()
+    def positions(
+        self, object_type: Optional[Type[GridObject]] = None
+    ) -> Iterable[Position]:
+        """Iterator over positions, in row-major order
+
+        Args:
+            object_type (Optional[Type[GridObject]]): if given, only the
+                positions of objects of this type (including subclasses)
+
+        Returns:
+            Iterable[Position]:
+        """
+        if object_type is None:
+            return self.area.positions()
+
+        return [
+            Position(y, x)
+            for y, row in enumerate(self.to_objects())
+            for x, obj in enumerate(row)
+            if isinstance(obj, object_type)
+        ]
 
     def positions_border(self) -> Iterable[Position]:
         """iterator over border positions"""
@@ -105,15 +127,16 @@ class Grid:
         return self.area.positions_inside()
 
     def get_position(self, x: GridObject) -> Position:
-        for position in self.positions():
-            if self[position] is x:
-                return position
+        for y, row in enumerate(self.to_objects()):
+            for x_, obj in enumerate(row):
+                if obj is x:
+                    return Position(y, x_)
 
         raise ValueError(f'GridObject {x} not found')
 
     def object_types(self) -> Set[Type[GridObject]]:
         """returns object types currently in the grid"""
-        return set(type(self[position]) for position in self.positions())
+        return set(type(obj) for row in self.to_objects() for obj in row)
 
     def __getitem__(self, position: PositionOrTuple) -> GridObject:
         position = Position.from_position_or_tuple(position)
@@ -156,24 +179,18 @@ class Grid:
         Returns:
             Grid: New instance, sliced appropriately
         """
-        subgrid = Grid(area.height, area.width)
-        grid_copy = deepcopy(self)
-        for pos_to in subgrid.positions():
-            pos_from = pos_to + area.top_left
-
-            try:
-                obj = grid_copy[pos_from]
-            except IndexError:
-                obj = Hidden()
-
-            subgrid[pos_to] = obj
-            # subgrid[pos_to] = (
-            #     np_grid[pos_from.y, pos_from.x]
-            #     if pos_from in self
-            #     else Hidden()
-            # )
-
-        return subgrid
+        # only the objects in the area are copied (together, to preserve
+        # references between them)
+        objects = [
+            [
+                self._peek(y, x)
+                if 0 <= y < self.height and 0 <= x < self.width
+                else Hidden()
+                for x in range(area.xmin, area.xmax + 1)
+            ]
+            for y in range(area.ymin, area.ymax + 1)
+        ]
+        return Grid.from_objects(deepcopy(objects))
 
     def change_orientation(self, orientation: Orientation) -> Grid:
         """returns grid as seen from someone facing the given direction
@@ -199,12 +216,205 @@ class Grid:
             Orientation.E: 1,
             Orientation.W: 3,
         }
-        objects = np.rot90(self._grid, times[orientation]).tolist()
+        objects = np.rot90(self._object_array(), times[orientation]).tolist()
         objects = deepcopy(objects)
         return Grid.from_objects(objects)
 
     def __hash__(self):
-        return hash(tuple(map(tuple, self._grid.tolist())))
+        return hash(tuple(map(tuple, self.to_objects())))
 
     def __repr__(self):
         return f'<{self.__class__.__name__} {self.height}x{self.width} objects={self.to_objects()!r}>'
+
+
+_FLOOR = Floor()
+"""shared by all cells of implicit tiles;  floors have no state"""
+
+_TileKey = Tuple[int, int]
+
+
+class ChunkedGrid(Grid):
+    """A grid stored as fixed-size tiles, for very large maps
+
+    Tiles which were never written to are implicit, and consist of
+    :py:class:`~gym_gridverse.grid_object.Floor` objects (one instance shared
+    by all their cells), so that constructing a grid is immediate regardless
+    of its size.
+
+    Copies (e.g. by :py:func:`copy.deepcopy`, as in every environment step)
+    share their tiles, and a tile is only copied when it is first accessed
+    through either grid afterwards.  Since objects may be modified in place
+    (e.g. doors being opened), reading a cell counts as accessing its tile.
+    Operations which only inspect the grid, e.g. :py:meth:`to_objects`,
+    :py:meth:`subgrid` and :py:meth:`positions`, do not copy tiles;  the
+    objects they return should not be modified.
+
+    :py:meth:`object_types` and :py:meth:`positions` skip the tiles which do
+    not contain the requested types, based on the types of each tile, which
+    are updated when objects are set.
+
+    Args:
+        height (int):
+        width (int):
+        tile_size (int): side of the square tiles
+    """
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self, height: int, width: int, *, tile_size: int = 16
+    ):
+        if tile_size <= 0:
+            raise ValueError(f'tile_size ({tile_size}) should be positive')
+
+        self.shape = Shape(height, width)
+        self.tile_size = tile_size
+
+        self._tiles: Dict[_TileKey, np.ndarray] = {}
+        # tiles which are not shared with any copy of the grid
+        self._owned: Set[_TileKey] = set()
+        # object types of each (explicit) tile
+        self._tile_types: Dict[_TileKey, Set[Type[GridObject]]] = {}
+
+    @staticmethod
+    def from_grid(grid: Grid, *, tile_size: int = 16) -> ChunkedGrid:
+        """constructor from another grid, sharing its objects"""
+        chunked = ChunkedGrid(grid.height, grid.width, tile_size=tile_size)
+        for y, row in enumerate(grid.to_objects()):
+            for x, obj in enumerate(row):
+                # floors are left implicit
+                # pylint: disable=unidiomatic-typecheck
+                if type(obj) is not Floor:
+                    chunked[y, x] = obj
+
+        return chunked
+
+    def _tile_keys(self) -> Iterable[_TileKey]:
+        return (
+            (ty, tx)
+            for ty in range(-(-self.height // self.tile_size))
+            for tx in range(-(-self.width // self.tile_size))
+        )
+
+    def _tile_shape(self, key: _TileKey) -> Tuple[int, int]:
+        ty, tx = key
+        size = self.tile_size
+        return (
+            min(size, self.height - ty * size),
+            min(size, self.width - tx * size),
+        )
+
+    def _tile(self, key: _TileKey, *, create: bool) -> Optional[np.ndarray]:
+        """tile owned by this grid, copying or creating it if necessary"""
+        if key in self._owned:
+            return self._tiles[key]
+
+        try:
+            tile = self._tiles[key]
+        except KeyError:
+            if not create:
+                return None
+
+            tile = np.full(self._tile_shape(key), _FLOOR, dtype=object)
+            self._tile_types[key] = {Floor}
+        else:
+            tile = deepcopy(tile)
+
+        self._tiles[key] = tile
+        self._owned.add(key)
+        return tile
+
+    def _object_array(self) -> np.ndarray:
+        array = np.full((self.height, self.width), _FLOOR, dtype=object)
+        size = self.tile_size
+        for (ty, tx), tile in self._tiles.items():
+            height, width = tile.shape
+            array[
+                ty * size : ty * size + height, tx * size : tx * size + width
+            ] = tile
+
+        return array
+
+    def _peek(self, y: int, x: int) -> GridObject:
+        size = self.tile_size
+        try:
+            tile = self._tiles[y // size, x // size]
+        except KeyError:
+            return _FLOOR
+
+        return tile[y % size, x % size]
+
+    def __getitem__(self, position: PositionOrTuple) -> GridObject:
+        position = Position.from_position_or_tuple(position)
+
+        if position not in self:
+            raise IndexError(f'position {position} not in grid')
+
+        size = self.tile_size
+        y, x = position
+        tile = self._tile((y // size, x // size), create=False)
+        return _FLOOR if tile is None else tile[y % size, x % size]
+
+    def __setitem__(self, position: PositionOrTuple, obj: GridObject):
+        position = Position.from_position_or_tuple(position)
+
+        if position not in self:
+            raise IndexError(f'position {position} not in grid')
+
+        size = self.tile_size
+        y, x = position
+        key = (y // size, x // size)
+        tile = self._tile(key, create=True)
+        old_type = type(tile[y % size, x % size])
+        tile[y % size, x % size] = obj
+
+        new_type = type(obj)
+        if new_type is old_type:
+            return
+
+        # type sets are shared with copies, and replaced rather than modified
+        types = self._tile_types[key] | {new_type}
+        # the replaced type leaves the tile if it was its last object
+        if not any(type(o) is old_type for o in tile.flat):
+            types.discard(old_type)
+        self._tile_types[key] = types
+
+    def __deepcopy__(self, memo) -> ChunkedGrid:
+        grid = ChunkedGrid.__new__(ChunkedGrid)
+        memo[id(self)] = grid
+
+        grid.shape = self.shape
+        grid.tile_size = self.tile_size
+        grid._tiles = dict(self._tiles)
+        grid._owned = set()
+        # type sets are replaced rather than modified, and can be shared
+        grid._tile_types = dict(self._tile_types)
+
+        # the tiles are now shared
+        self._owned.clear()
+        return grid
+
+    def object_types(self) -> Set[Type[GridObject]]:
+        types: Set[Type[GridObject]] = set().union(*self._tile_types.values())
+        if len(self._tiles) < sum(1 for _ in self._tile_keys()):
+            types.add(Floor)
+
+        return types
+
+    def positions(
+        self, object_type: Optional[Type[GridObject]] = None
+    ) -> Iterable[Position]:
+        if object_type is None or issubclass(Floor, object_type):
+            return super().positions(object_type)
+
+        size = self.tile_size
+        # implicit tiles, and tiles without the type, are skipped
+        coordinates = sorted(
+            (ty * size + y, tx * size + x)
+            for (ty, tx), tile in self._tiles.items()
+            if any(issubclass(t, object_type) for t in self._tile_types[ty, tx])
+            for (y, x), obj in np.ndenumerate(tile)
+            if isinstance(obj, object_type)
+        )
+        return [Position(y, x) for y, x in coordinates]
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.height}x{self.width} tile_size={self.tile_size} tiles={len(self._tiles)}>'
@@ -1,12 +1,16 @@
 import time
-from functools import partial
 from typing import Callable, Dict, List, Optional
 
 import numpy as np
 
 import gym
 from gym.utils import seeding
-from gym_gridverse.envs import InnerEnv, factory
+from gym_gridverse.headless_rendering import HeadlessRenderer
+from gym_gridverse.gym_registration import (  # noqa: F401
+    env_ids,
+    outer_env_constructor,
+    register_envs,
+)
 from gym_gridverse.outer_env import OuterEnv
 from gym_gridverse.representations.observation_representations import (
     create_observation_representation,
@@ -27,7 +31,14 @@ def outer_space_to_gym_space(space: Dict[str, np.ndarray]) -> gym.spaces.Space:
 
 class GymEnvironment(gym.Env):
     metadata = {
-        'render.modes': ['human', 'human_state', 'human_observation'],
+        'render.modes': [
+            'human',
+            'human_state',
+            'human_observation',
+            'rgb_array',
+            'rgb_array_state',
+            'rgb_array_observation',
+        ],
         'video.frames_per_second': 50,
     }
 
@@ -55,6 +66,7 @@ class GymEnvironment(gym.Env):
         # self._observation_viewer: Optional[GridVerseViewer] = None
         self._state_viewer = None
         self._observation_viewer = None
+        self._headless_renderer: Optional[HeadlessRenderer] = None
 
     def seed(self, seed: Optional[int] = None) -> List[int]:
         actual_seed = seeding.create_seed(seed)
@@ -101,6 +113,9 @@ class GymEnvironment(gym.Env):
         return self.observation, reward, done, {}
 
     def render(self, mode='human'):
+        if mode in ['rgb_array', 'rgb_array_state', 'rgb_array_observation']:
+            return self._render_rgb_array(mode)
+
         # only import rendering if actually rendering (avoid importing when
         # using library remotely using ssh on a display-less environment)
         from gym_gridverse.rendering import (  # pylint: disable=import-outside-toplevel
@@ -142,6 +157,23 @@ class GymEnvironment(gym.Env):
                 self.outer_env.inner_env.observation
             )
 
+    def _render_rgb_array(self, mode: str) -> Optional[np.ndarray]:
+        """renders without a display;  'rgb_array' renders the state"""
+
+        # not reset yet
+        if self.outer_env.inner_env.state is None:
+            return None
+
+        if self._headless_renderer is None:
+            self._headless_renderer = HeadlessRenderer()
+
+        if mode == 'rgb_array_observation':
+            return self._headless_renderer.render(
+                self.outer_env.inner_env.observation
+            )
+
+        return self._headless_renderer.render(self.outer_env.inner_env.state)
+
     def close(self):
         if self._state_viewer is not None:
             self._state_viewer.close()
@@ -181,24 +213,4 @@ class GymStateWrapper(gym.Wrapper):
         return self.observation, reward, done, info
 
 
-env_ids = []
-
-for key, constructor_ in factory.STRING_TO_GYM_CONSTRUCTOR.items():
-
-    def outer_env_constructor(constructor: Callable[[], InnerEnv]) -> OuterEnv:
-        env = constructor()
-        state_repr = None
-        observation_repr = create_observation_representation(
-            'default', env.observation_space
-        )
-        return OuterEnv(
-            env, state_rep=state_repr, observation_rep=observation_repr
-        )
-
-    env_id = f'GridVerse-{key}'
-    gym.register(
-        env_id,
-        entry_point='gym_gridverse.gym:GymEnvironment',
-        kwargs={'constructor': partial(outer_env_constructor, constructor_)},
-    )
-    env_ids.append(env_id)
+register_envs()
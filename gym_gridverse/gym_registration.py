@@ -0,0 +1,53 @@
+"""Registration of the GridVerse environments with gym
+
+Kept separate from :py:mod:`gym_gridverse.gym` and free of gym imports at
+module level, since gym imports it through the ``gym.envs`` entry point while
+gym itself (and possibly :py:mod:`gym_gridverse.gym`) is still being imported.
+"""
+from functools import partial
+from typing import List
+
+from gym_gridverse.envs import factory
+from gym_gridverse.outer_env import OuterEnv
+from gym_gridverse.representations.observation_representations import (
+    create_observation_representation,
+)
+
+
+def outer_env_constructor(key: str) -> OuterEnv:
+    """constructs the registered environment with the default representation"""
+    env = factory.STRING_TO_GYM_CONSTRUCTOR[key]()
+    state_repr = None
+    observation_repr = create_observation_representation(
+        'default', env.observation_space
+    )
+    return OuterEnv(env, state_rep=state_repr, observation_rep=observation_repr)
+
+
+env_ids: List[str] = []
+
+
+def register_envs():
+    """registers the GridVerse environments with gym
+
+    Called when :py:mod:`gym_gridverse.gym` is imported, and by gym itself
+    through the ``gym.envs`` entry point, so that ``gym.make('GridVerse-...')``
+    works without importing :py:mod:`gym_gridverse.gym` first (for gym versions
+    which load env plugins).  Repeated calls have no effect.
+    """
+    if env_ids:
+        return
+
+    # gym.register is not yet available while gym itself loads env plugins
+    from gym.envs.registration import (  # pylint: disable=import-outside-toplevel
+        register,
+    )
+
+    for key in factory.STRING_TO_GYM_CONSTRUCTOR:
+        env_id = f'GridVerse-{key}'
+        register(
+            env_id,
+            entry_point='gym_gridverse.gym:GymEnvironment',
+            kwargs={'constructor': partial(outer_env_constructor, key)},
+        )
+        env_ids.append(env_id)
@@ -0,0 +1,473 @@
+"""Pure NumPy renderer, which does not require pyglet or a display
+
+Each combination of object type, state and color is rasterized once into a
+tile atlas, and frames are composed by indexing the atlas with the grid's
+object indices.  The tiles mimic the geometries of
+:py:class:`~gym_gridverse.rendering.GridVerseViewer`, without the HUD.
+"""
+import functools
+import math
+from typing import Callable, Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+from gym_gridverse.geometry import Orientation
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import (
+    Color,
+    Door,
+    Goal,
+    GridObject,
+    Hidden,
+    Key,
+    MovingObstacle,
+    Telepod,
+    Wall,
+)
+from gym_gridverse.observation import Observation
+from gym_gridverse.state import State
+
+RGB = Tuple[float, float, float]
+
+BLACK: RGB = (0.0, 0.0, 0.0)
+BACKGROUND: RGB = (0.65, 0.65, 0.65)
+NONE: RGB = (0.5, 0.5, 0.5)
+RED: RGB = (0.796, 0.255, 0.329)
+GREEN: RGB = (0.329, 0.796, 0.255)
+BLUE: RGB = (0.255, 0.329, 0.796)
+YELLOW: RGB = (0.796, 0.796, 0.329)
+
+colormap: Dict[Color, RGB] = {
+    Color.NONE: NONE,
+    Color.RED: RED,
+    Color.GREEN: GREEN,
+    Color.BLUE: BLUE,
+    Color.YELLOW: YELLOW,
+}
+
+# tiles are rasterized at a higher resolution and averaged (anti-aliasing)
+SUPERSAMPLING = 3
+
+# line widths in tile units (a tile spans [-1, 1]), matching the 40 pixel
+# tiles of GridVerseViewer
+_PIXEL = 2.0 / 40
+
+Mask = np.ndarray
+Coordinates = Tuple[np.ndarray, np.ndarray]
+
+
+def _coordinates(size: int) -> Coordinates:
+    """x (rightwards) and y (upwards) coordinates of pixel centers"""
+    u = (np.arange(size) + 0.5) / size * 2.0 - 1.0
+    return u[np.newaxis, :], -u[:, np.newaxis]
+
+
+def _rectangle(xy: Coordinates, x0, y0, x1, y1) -> Mask:
+    x, y = xy
+    return (x0 <= x) & (x <= x1) & (y0 <= y) & (y <= y1)
+
+
+def _circle(xy: Coordinates, cx, cy, radius) -> Mask:
+    x, y = xy
+    return (x - cx) ** 2 + (y - cy) ** 2 <= radius**2
+
+
+def _ring(xy: Coordinates, cx, cy, radius, width) -> Mask:
+    x, y = xy
+    distance = np.sqrt((x - cx) ** 2 + (y - cy) ** 2)
+    return np.abs(distance - radius) <= width / 2
+
+
+def _segment_distance(xy: Coordinates, p, q) -> np.ndarray:
+    x, y = xy
+    (px, py), (qx, qy) = p, q
+    dx, dy = qx - px, qy - py
+    t = ((x - px) * dx + (y - py) * dy) / max(dx**2 + dy**2, 1e-12)
+    t = np.clip(t, 0.0, 1.0)
+    return np.sqrt((x - px - t * dx) ** 2 + (y - py - t * dy) ** 2)
+
+
+def _polyline(
+    xy: Coordinates,
+    points: Sequence[Tuple[float, float]],
+    width: float,
+    *,
+    closed: bool = False,
+) -> Mask:
+    points = list(points)
+    if closed:
+        points.append(points[0])
+
+    mask = np.zeros(np.broadcast(*xy).shape, dtype=bool)
+    for p, q in zip(points[:-1], points[1:]):
+        mask |= _segment_distance(xy, p, q) <= width / 2
+
+    return mask
+
+
+def _polygon(xy: Coordinates, points: Sequence[Tuple[float, float]]) -> Mask:
+    """even-odd rule point-in-polygon test"""
+    x, y = xy
+    mask = np.zeros(np.broadcast(x, y).shape, dtype=bool)
+    for (px, py), (qx, qy) in zip(points, [*points[1:], points[0]]):
+        if py == qy:
+            continue
+
+        crosses = (py > y) != (qy > y)
+        x_intersect = px + (y - py) * (qx - px) / (qy - py)
+        mask ^= crosses & (x < x_intersect)
+
+    return mask
+
+
+def _capsule(xy: Coordinates, p, q, width: float) -> Mask:
+    return _segment_distance(xy, p, q) <= width / 2
+
+
+def _floor(xy: Coordinates) -> Sequence[Tuple[Mask, RGB]]:
+    return []
+
+
+def _hidden(xy: Coordinates) -> Sequence[Tuple[Mask, RGB]]:
+    return [(_rectangle(xy, -1.0, -1.0, 1.0, 1.0), BLACK)]
+
+
+def _wall(xy: Coordinates) -> Sequence[Tuple[Mask, RGB]]:
+    lines = [
+        # horizontal
+        ((-1.0, -0.33), (1.0, -0.33)),
+        ((-1.0, 0.33), (1.0, 0.33)),
+        # vertical
+        ((-0.5, -1.0), (-0.5, -0.33)),
+        ((0.5, -1.0), (0.5, -0.33)),
+        ((0.0, -0.33), (0.0, 0.33)),
+        ((-0.5, 1.0), (-0.5, 0.33)),
+        ((0.5, 1.0), (0.5, 0.33)),
+    ]
+    return [
+        (_rectangle(xy, -1.0, -1.0, 1.0, 1.0), RED),
+        *((_polyline(xy, line, _PIXEL), BLACK) for line in lines),
+    ]
+
+
+def _goal(xy: Coordinates) -> Sequence[Tuple[Mask, RGB]]:
+    pad = 0.8
+    offset = -pad / 4
+    flag = [(0.0, -pad), (0.0, pad), (pad, pad / 2), (0.0, 0.0)]
+    flag = [(fx + offset, fy) for fx, fy in flag]
+    return [
+        (_rectangle(xy, -1.0, -1.0, 1.0, 1.0), GREEN),
+        (_polyline(xy, flag, 2 * _PIXEL), BLACK),
+    ]
+
+
+def _door_frame(xy: Coordinates) -> Mask:
+    pad = 0.8
+    corners = [(-pad, -pad), (-pad, pad), (pad, pad), (pad, -pad)]
+    return _polyline(xy, corners, _PIXEL, closed=True)
+
+
+def _door(state: Door.Status, color: RGB):
+    def _door_tile(xy: Coordinates) -> Sequence[Tuple[Mask, RGB]]:
+        x, y = xy
+        pad = 0.8
+
+        if state is Door.Status.OPEN:
+            border = (np.abs(x) >= pad) | (np.abs(y) >= pad)
+            return [(border, color), (_door_frame(xy), BLACK)]
+
+        layers = [
+            (_rectangle(xy, -1.0, -1.0, 1.0, 1.0), color),
+            (_door_frame(xy), BLACK),
+        ]
+
+        if state is Door.Status.LOCKED:
+            keyhole = _circle(xy, 0.4, 0.0, 0.2) | _polygon(
+                xy, [(0.2, -0.4), (0.4, 0.0), (0.6, -0.4)]
+            )
+            layers.append((keyhole, BLACK))
+        else:
+            layers.append((_ring(xy, 0.4, 0.0, 0.2, _PIXEL), BLACK))
+
+        return layers
+
+    return _door_tile
+
+
+def _key(color: RGB):
+    def _key_tile(xy: Coordinates) -> Sequence[Tuple[Mask, RGB]]:
+        def key_mask(dilation: float) -> Mask:
+            mask = _circle(xy, -0.3, 0.0, 0.4 + dilation)
+            mask |= _capsule(xy, (0.0, 0.0), (0.6, 0.0), 0.2 + 2 * dilation)
+            for bit_x in [0.4, 0.5, 0.6]:
+                mask |= _capsule(
+                    xy, (bit_x, 0.0), (bit_x, 0.3), 0.1 + 2 * dilation
+                )
+            return mask
+
+        return [(key_mask(2 * _PIXEL), BLACK), (key_mask(0.0), color)]
+
+    return _key_tile
+
+
+def _moving_obstacle(xy: Coordinates) -> Sequence[Tuple[Mask, RGB]]:
+    pad = 0.8
+    corners = [(-pad, 0.0), (0.0, pad), (pad, 0.0), (0.0, -pad)]
+    return [
+        (_polygon(xy, corners), RED),
+        (_polyline(xy, corners, 3 * _PIXEL, closed=True), BLACK),
+    ]
+
+
+def _telepod(color: RGB):
+    def _telepod_tile(xy: Coordinates) -> Sequence[Tuple[Mask, RGB]]:
+        polar = np.linspace((0.8, 0.0), (0.0, 4 * math.pi), 100)
+        spiral = [
+            (math.cos(ang) * rad, math.sin(ang) * rad) for rad, ang in polar
+        ]
+        return [
+            (_circle(xy, 0.0, 0.0, 0.8), color),
+            (_ring(xy, 0.0, 0.0, 0.8, 2 * _PIXEL), BLACK),
+            (_polyline(xy, spiral, 2 * _PIXEL), BLACK),
+        ]
+
+    return _telepod_tile
+
+
+TileFunction = Callable[[Coordinates], Sequence[Tuple[Mask, RGB]]]
+
+
+def _tile_function(object_type, state_index: int, color: Color) -> TileFunction:
+    if object_type is Hidden:
+        return _hidden
+
+    if object_type is Wall:
+        return _wall
+
+    if object_type is Goal:
+        return _goal
+
+    if object_type is Door:
+        return _door(Door.Status(state_index), colormap[color])
+
+    if object_type is Key:
+        return _key(colormap[color])
+
+    if object_type is MovingObstacle:
+        return _moving_obstacle
+
+    if object_type is Telepod:
+        return _telepod(colormap[color])
+
+    # Floor, NoneGridObject, and any other object is drawn as empty floor
+    return _floor
+
+
+def _rasterize(layers: Sequence[Tuple[Mask, RGB]], size: int) -> np.ndarray:
+    image = np.empty((size, size, 3))
+    image[...] = BACKGROUND
+    for mask, color in layers:
+        image[np.broadcast_to(mask, (size, size))] = color
+    return image
+
+
+def _downsample(image: np.ndarray, tile_size: int) -> np.ndarray:
+    image = image.reshape(tile_size, SUPERSAMPLING, tile_size, SUPERSAMPLING, 3)
+    image = image.mean(axis=(1, 3))
+    return np.round(255 * image).astype(np.uint8)
+
+
+def _grid_lines(tile: np.ndarray):
+    tile[0, :] = tile[-1, :] = tile[:, 0] = tile[:, -1] = 0
+
+
+@functools.lru_cache(maxsize=None)
+def _tile_atlas(tile_size: int, num_object_types: int) -> np.ndarray:
+    num_states = max(
+        object_type.num_states()
+        for object_type in GridObject.object_types[:num_object_types]
+    )
+    atlas = np.empty(
+        (num_object_types, num_states, len(Color), tile_size, tile_size, 3),
+        dtype=np.uint8,
+    )
+
+    size = tile_size * SUPERSAMPLING
+    xy = _coordinates(size)
+    for type_index, object_type in enumerate(
+        GridObject.object_types[:num_object_types]
+    ):
+        for state_index in range(num_states):
+            # unused states are never indexed, but are drawn as the last
+            # valid state for safety
+            valid_state_index = min(state_index, object_type.num_states() - 1)
+            for color in Color:
+                tile_function = _tile_function(
+                    object_type, valid_state_index, color
+                )
+                image = _rasterize(tile_function(xy), size)
+                tile = _downsample(image, tile_size)
+                _grid_lines(tile)
+                atlas[type_index, state_index, color.value] = tile
+
+    atlas.flags.writeable = False
+    return atlas
+
+
+def tile_atlas(tile_size: int) -> np.ndarray:
+    """Returns the atlas of all tiles, rasterized once per tile size
+
+    Args:
+        tile_size (int): tile side in pixels
+
+    Returns:
+        np.ndarray: read-only uint8 array indexed by [type index, state index,
+            color value, row, column, channel]
+    """
+    return _tile_atlas(tile_size, len(GridObject.object_types))
+
+
+@functools.lru_cache(maxsize=None)
+def agent_masks(tile_size: int) -> np.ndarray:
+    """Returns the coverage of the agent triangle for each orientation
+
+    Args:
+        tile_size (int): tile side in pixels
+
+    Returns:
+        np.ndarray: read-only float array indexed by [orientation value, row,
+            column], with values in [0, 1]
+    """
+    size = tile_size * SUPERSAMPLING
+    x, y = _coordinates(size)
+    pad = 0.7
+    corners = [(-pad, -pad), (0.0, pad), (pad, -pad)]
+
+    masks = np.empty((len(Orientation), tile_size, tile_size))
+    for orientation in Orientation:
+        # rotate pixel coordinates into the frame of the north-facing agent
+        angle = -orientation.as_radians()
+        cos, sin = math.cos(angle), math.sin(angle)
+        xy = (cos * x - sin * y, sin * x + cos * y)
+        mask = _polyline(xy, corners, 3 * _PIXEL, closed=True)
+        mask = np.broadcast_to(mask, (size, size)).astype(float)
+        masks[orientation.value] = mask.reshape(
+            tile_size, SUPERSAMPLING, tile_size, SUPERSAMPLING
+        ).mean(axis=(1, 3))
+
+    masks.flags.writeable = False
+    return masks
+
+
+def grid_indices(grid: Grid) -> np.ndarray:
+    """Returns the (type, state, color) indices of each object in the grid
+
+    Args:
+        grid (Grid): input grid
+
+    Returns:
+        np.ndarray: height x width x 3 integer array
+    """
+    return np.array(
+        [
+            [(obj.type_index, obj.state_index, obj.color.value) for obj in row]
+            for row in grid.to_objects()
+        ],
+        dtype=np.int64,
+    ).reshape(grid.height, grid.width, 3)
+
+
+def compose_frame(
+    indices: np.ndarray,
+    agent_position: Tuple[int, int],
+    agent_orientation: Orientation,
+    *,
+    tile_size: int = 32,
+) -> np.ndarray:
+    """Composes a frame from the grid's object indices and the agent
+
+    Args:
+        indices (np.ndarray): height x width x 3 (type, state, color) indices
+        agent_position (Tuple[int, int]): agent (y, x) position
+        agent_orientation (Orientation): agent orientation
+        tile_size (int): tile side in pixels
+
+    Returns:
+        np.ndarray: (height * tile_size) x (width * tile_size) x 3 uint8 image
+    """
+    height, width, _ = indices.shape
+    atlas = tile_atlas(tile_size)
+
+    tiles = atlas[indices[..., 0], indices[..., 1], indices[..., 2]]
+    frame = tiles.transpose(0, 2, 1, 3, 4).reshape(
+        height * tile_size, width * tile_size, 3
+    )
+
+    y, x = agent_position
+    if 0 <= y < height and 0 <= x < width:
+        rows = slice(y * tile_size, (y + 1) * tile_size)
+        cols = slice(x * tile_size, (x + 1) * tile_size)
+        alpha = agent_masks(tile_size)[agent_orientation.value, ..., np.newaxis]
+        agent_color = np.array(BLUE) * 255
+        frame[rows, cols] = np.round(
+            (1 - alpha) * frame[rows, cols] + alpha * agent_color
+        ).astype(np.uint8)
+
+    return frame
+
+
+class HeadlessRenderer:
+    """Renders states and observations into rgb arrays without a display
+
+    Args:
+        tile_size (int): tile side in pixels
+    """
+
+    def __init__(self, *, tile_size: int = 32):
+        self.tile_size = tile_size
+
+    def render(
+        self, state_or_observation: Union[State, Observation]
+    ) -> np.ndarray:
+        """Renders a state or an observation
+
+        Args:
+            state_or_observation (Union[State, Observation]): input element
+
+        Returns:
+            np.ndarray: height x width x 3 uint8 image
+        """
+        agent = state_or_observation.agent
+        return compose_frame(
+            grid_indices(state_or_observation.grid),
+            (agent.position.y, agent.position.x),
+            agent.orientation,
+            tile_size=self.tile_size,
+        )
+
+    def render_encoded(self, grid: np.ndarray, agent: np.ndarray) -> np.ndarray:
+        """Renders an element encoded by :py:mod:`gym_gridverse.encoding`
+
+        Args:
+            grid (np.ndarray): encoded grid
+            agent (np.ndarray): encoded agent
+
+        Returns:
+            np.ndarray: height x width x 3 uint8 image
+        """
+        y, x, orientation = agent[:3].tolist()
+        return compose_frame(
+            grid.astype(np.int64),
+            (y, x),
+            Orientation(orientation),
+            tile_size=self.tile_size,
+        )
+
+
+__all__ = [
+    'HeadlessRenderer',
+    'agent_masks',
+    'compose_frame',
+    'grid_indices',
+    'tile_atlas',
+]
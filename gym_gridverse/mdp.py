@@ -0,0 +1,599 @@
+"""Export of environments as tabular MDPs, e.g. to compute exact baselines
+
+:py:func:`export_mdp` enumerates the states which are reachable from the
+initial states of an environment by breadth-first search, and collects the
+transition probabilities, rewards and terminal flags into sparse arrays::
+
+  mdp = export_mdp(env)
+  mdp.transitions(s, a)  # slice of next_states, probabilities and terminal
+  mdp.rewards[s, a]  # expected reward
+  mdp.state(s)  # decoded State
+
+The transition probabilities of deterministic environments are exact.  The
+probabilities of stochastic environments (e.g. with moving obstacles), and the
+initial distribution of environments with random resets, are estimated by
+sampling.
+
+States are indexed by a 64 bit blake2b digest of their encoding (see
+:py:mod:`gym_gridverse.encoding`), and are only kept in encoded form, so that
+the memory footprint stays at around 100 bytes per state, plus the size of
+the encoding and of the transition arrays;  e.g. a million states of a 9x9
+environment take a few hundred MB.  The encodings are compared whenever
+digests match, so that colliding states are never merged.
+
+Environments whose transitions only move and rotate the agent (e.g.
+``gv_empty`` and ``gv_four_rooms``, see :py:mod:`gym_gridverse.rollouts`)
+never change the grid, so that their states are fully described by the level,
+the position and the orientation of the agent.  Their transitions are stepped
+over (position, orientation) pairs on the shared grid of each level, without
+copying, encoding or hashing whole states, so that the export is bound by the
+reward and terminating functions, at around 3000 to 5000 states per second
+(e.g. a million states in a few minutes);  their states share the encoded
+grid of their level (see :py:attr:`TabularMDP.levels`), so that large maps
+take around 100 bytes per state as well.  Other environments (e.g. with keys, doors,
+or moving obstacles) are stepped by the environment's own
+:py:meth:`~gym_gridverse.envs.gridworld.GridWorld.functional_step`, which
+copies the state, at around 2000 steps per second;  e.g. the 32k states
+reachable from 100 sampled resets of ``gv_keydoor.7x7.yaml`` take over two
+minutes.  Use ``max_states`` to guard against environments which are too
+large to enumerate.
+"""
+import hashlib
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+import numpy as np
+
+from gym_gridverse.action import Action
+from gym_gridverse.agent import Agent
+from gym_gridverse.encoding import (
+    AGENT_DTYPE,
+    GRID_DTYPE,
+    decode_state,
+    encode_agent,
+    encode_grid,
+    encode_object,
+    encode_state,
+)
+from gym_gridverse.envs import InnerEnv
+from gym_gridverse.envs.gridworld import GridWorld
+from gym_gridverse.envs.transition_features import activate_transition_features
+from gym_gridverse.geometry import Position
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import GridObject
+from gym_gridverse.rollouts import _is_static_transition
+from gym_gridverse.state import State
+
+__all__ = ['TabularMDP', 'export_mdp', 'state_key']
+
+
+def state_key(grid: np.ndarray, agent: np.ndarray) -> int:
+    """64 bit digest of an encoded state"""
+    digest = hashlib.blake2b(grid.tobytes(), digest_size=8)
+    digest.update(agent.tobytes())
+    return int.from_bytes(digest.digest(), 'little')
+
+
+_KEY_MASK = (1 << 64) - 1
+
+
+def _probe(
+    index: Dict[int, int],
+    key: int,
+    encoding: bytes,
+    encodings: Callable[[int], bytes],
+) -> Tuple[int, Optional[int]]:
+    """finds the key of an encoded state, probing the following keys when
+    the digest collides with that of a different state
+
+    Returns:
+        Tuple[int, Optional[int]]: key, and index of the state (None if the
+            state is not in the index, in which case the key is free)
+    """
+    while True:
+        i = index.get(key)
+        if i is None or encodings(i) == encoding:
+            return key, i
+
+        key = (key + 1) & _KEY_MASK
+
+
+@dataclass
+class TabularMDP:
+    """Sparse tabular representation of an environment
+
+    Transitions are stored in compressed sparse row (CSR) format, with a row
+    for each (state, action) pair, i.e. the transitions of state `s` and
+    action index `a` are at `indptr[s * num_actions + a]` up to (excluded)
+    `indptr[s * num_actions + a + 1]`.
+
+    States which are only reached through terminal transitions are not
+    expanded, and have no transitions (their value is zero).
+
+    Args:
+        actions (List[Action]): actions, in the order of the action indices
+        indptr (np.ndarray): (S * A + 1,) row offsets
+        next_states (np.ndarray): (nnz,) next state indices
+        probabilities (np.ndarray): (nnz,) transition probabilities
+        terminal (np.ndarray): (nnz,) True for terminal transitions
+        rewards (np.ndarray): (S, A) expected rewards
+        initial_distribution (np.ndarray): (S,) initial state probabilities
+        expanded (np.ndarray): (S,) True for states with transitions
+        grids (np.ndarray): (S, H, W, 3) encoded grids, or (L, H, W, 3)
+            encoded grids of the levels if `levels` is given
+        agents (np.ndarray): (S, 6) encoded agents
+        levels (Optional[np.ndarray]): (S,) level of each state, for
+            environments which never change the grid
+    """
+
+    actions: List[Action]
+    indptr: np.ndarray
+    next_states: np.ndarray
+    probabilities: np.ndarray
+    terminal: np.ndarray
+    rewards: np.ndarray
+    initial_distribution: np.ndarray
+    expanded: np.ndarray
+    grids: np.ndarray
+    agents: np.ndarray
+    levels: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        self._state_index: Optional[Dict[int, int]] = None
+
+    @property
+    def num_states(self) -> int:
+        return self.rewards.shape[0]
+
+    @property
+    def num_actions(self) -> int:
+        return self.rewards.shape[1]
+
+    def transitions(self, state_index: int, action_index: int) -> slice:
+        """slice of the transitions of a (state, action) pair"""
+        row = state_index * self.num_actions + action_index
+        return slice(self.indptr[row], self.indptr[row + 1])
+
+    def state(self, state_index: int) -> State:
+        """decodes the state of the given index"""
+        return decode_state(self.grid(state_index), self.agents[state_index])
+
+    def grid(self, state_index: int) -> np.ndarray:
+        """encoded grid of the given index"""
+        if self.levels is not None:
+            return self.grids[self.levels[state_index]]
+
+        return self.grids[state_index]
+
+    def state_index(self, state: State) -> int:
+        """Returns the index of a state
+
+        Raises:
+            KeyError: if the state is not in the MDP
+        """
+        if self._state_index is None:
+            self._state_index = {}
+            for i, agent in enumerate(self.agents):
+                grid = self.grid(i)
+                key, _ = _probe(
+                    self._state_index,
+                    state_key(grid, agent),
+                    grid.tobytes() + agent.tobytes(),
+                    self._encoding,
+                )
+                self._state_index[key] = i
+
+        grid, agent = encode_state(state)
+        _, i = _probe(
+            self._state_index,
+            state_key(grid, agent),
+            grid.tobytes() + agent.tobytes(),
+            self._encoding,
+        )
+        if i is None:
+            raise KeyError(state)
+
+        return i
+
+    def _encoding(self, state_index: int) -> bytes:
+        return (
+            self.grid(state_index).tobytes()
+            + self.agents[state_index].tobytes()
+        )
+
+    def save(self, path: str):
+        """saves the arrays in numpy's `.npz` format"""
+        levels = {} if self.levels is None else {'levels': self.levels}
+        np.savez_compressed(
+            path,
+            actions=np.array([action.value for action in self.actions]),
+            indptr=self.indptr,
+            next_states=self.next_states,
+            probabilities=self.probabilities,
+            terminal=self.terminal,
+            rewards=self.rewards,
+            initial_distribution=self.initial_distribution,
+            expanded=self.expanded,
+            grids=self.grids,
+            agents=self.agents,
+            **levels,
+        )
+
+    @staticmethod
+    def load(path: str) -> 'TabularMDP':
+        """loads arrays saved by :py:meth:`save`"""
+        with np.load(path) as data:
+            arrays = dict(data)
+
+        actions = [Action(value) for value in arrays.pop('actions').tolist()]
+        return TabularMDP(actions, **arrays)
+
+
+def export_mdp(
+    env: InnerEnv,
+    *,
+    initial_states: Optional[Sequence[State]] = None,
+    num_reset_samples: int = 100,
+    num_transition_samples: int = 1,
+    max_states: Optional[int] = None,
+) -> TabularMDP:
+    """Enumerates the reachable states and transitions of an environment
+
+    Args:
+        env (InnerEnv): environment, seeded if it is stochastic
+        initial_states (Optional[Sequence[State]]): initial states, each with
+            equal probability;  by default, sampled from the reset function
+        num_reset_samples (int): number of reset samples, if `initial_states`
+            is not given;  1 suffices for deterministic resets
+        num_transition_samples (int): number of samples of each (state,
+            action) pair;  1 suffices for deterministic dynamics, and
+            transitions which only move and rotate the agent are never
+            sampled
+        max_states (Optional[int]): maximum number of states
+
+    Returns:
+        TabularMDP: sparse transition, reward and terminal arrays
+
+    Raises:
+        ValueError: if there are no initial states
+        RuntimeError: if more than `max_states` states are reachable
+    """
+    if initial_states is None:
+        initial_states = [
+            env.functional_reset() for _ in range(num_reset_samples)
+        ]
+
+    if len(initial_states) == 0:
+        raise ValueError('there should be at least one initial state')
+
+    actions = list(env.action_space.actions)
+    num_actions = len(actions)
+
+    # pylint: disable=protected-access
+    if isinstance(env, GridWorld) and _is_static_transition(
+        env._components()[2]
+    ):
+        return _export_static_mdp(
+            env, actions, initial_states, max_states=max_states
+        )
+
+    index: Dict[int, int] = {}
+    grids = bytearray()
+    agents = bytearray()
+    grid_shape: Optional[tuple] = None
+
+    # expansion queue;  states only reached via terminal transitions are
+    # indexed, but not queued
+    queue: Deque[int] = deque()
+    queued = bytearray()
+
+    def encoding(i: int) -> bytes:
+        grid_size = len(grids) // len(index)
+        agent_size = len(agents) // len(index)
+        return (
+            grids[i * grid_size : (i + 1) * grid_size]
+            + agents[i * agent_size : (i + 1) * agent_size]
+        )
+
+    def get_index(state: State, *, expand: bool) -> int:
+        nonlocal grid_shape
+
+        grid, agent = encode_state(state)
+        key, i = _probe(
+            index,
+            state_key(grid, agent),
+            grid.tobytes() + agent.tobytes(),
+            encoding,
+        )
+
+        if i is None:
+            if max_states is not None and len(index) >= max_states:
+                raise RuntimeError(f'more than {max_states} reachable states')
+
+            i = index[key] = len(index)
+            grids.extend(grid.tobytes())
+            agents.extend(agent.tobytes())
+            queued.append(False)
+            grid_shape = grid.shape
+
+        if expand and not queued[i]:
+            queued[i] = True
+            queue.append(i)
+
+        return i
+
+    initial_counts: Dict[int, int] = {}
+    for state in initial_states:
+        i = get_index(state, expand=True)
+        initial_counts[i] = initial_counts.get(i, 0) + 1
+
+    # rows are collected in expansion order, and sorted at the end
+    # (typed arrays, to keep the footprint of large MDPs low)
+    row_ids = array('q')
+    row_lengths = array('q')
+    next_states = array('q')
+    counts = array('q')
+    terminal = bytearray()
+    rewards = array('d')
+
+    while queue:
+        s = queue.popleft()
+        state = _decode(grids, agents, s, grid_shape)
+
+        for a, action in enumerate(actions):
+            # next state index -> (count, terminal)
+            outcomes: Dict[int, List] = {}
+            total_reward = 0.0
+
+            for _ in range(num_transition_samples):
+                next_state, reward, done = env.functional_step(state, action)
+                s_next = get_index(next_state, expand=not done)
+                total_reward += reward
+
+                try:
+                    outcomes[s_next][0] += 1
+                except KeyError:
+                    outcomes[s_next] = [1, done]
+
+            row_ids.append(s * num_actions + a)
+            row_lengths.append(len(outcomes))
+            rewards.append(total_reward / num_transition_samples)
+            for s_next, (count, done) in outcomes.items():
+                next_states.append(s_next)
+                counts.append(count)
+                terminal.append(done)
+
+    return _build_mdp(
+        actions,
+        num_states=len(index),
+        num_transition_samples=num_transition_samples,
+        initial_counts=initial_counts,
+        queued=queued,
+        grid_shape=grid_shape,
+        grids=grids,
+        agents=agents,
+        row_ids=row_ids,
+        row_lengths=row_lengths,
+        next_states=next_states,
+        counts=counts,
+        terminal=terminal,
+        rewards=rewards,
+    )
+
+
+def _export_static_mdp(  # pylint: disable=too-many-locals
+    env: GridWorld,
+    actions: List[Action],
+    initial_states: Sequence[State],
+    *,
+    max_states: Optional[int],
+) -> TabularMDP:
+    """export of environments which only move and rotate the agent
+
+    States are indexed by (level, y, x, orientation), where levels are the
+    distinct (grid, held object) pairs of the initial states, and are stepped
+    on the shared grid of their level.
+    """
+    # pylint: disable=protected-access
+    transition_function = env._components()[2]
+    num_actions = len(actions)
+
+    level_index: Dict[bytes, int] = {}
+    level_grids: List[Grid] = []
+    level_positions: List[Dict[Type[GridObject], List[Position]]] = []
+
+    index: Dict[Tuple[int, int, int, int], int] = {}
+    levels = array('q')
+    state_agents: List[Agent] = []
+    grids = bytearray()
+    agents = bytearray()
+    grid_shape: Optional[tuple] = None
+
+    queue: Deque[int] = deque()
+    queued = bytearray()
+
+    def get_level(state: State) -> int:
+        nonlocal grid_shape
+
+        grid = encode_grid(state.grid)
+        key = grid.tobytes() + bytes(encode_object(state.agent.obj))
+        try:
+            return level_index[key]
+        except KeyError:
+            level_grids.append(state.grid)
+            level_positions.append({})
+            grids.extend(grid.tobytes())
+            grid_shape = grid.shape
+            level = level_index[key] = len(level_index)
+            return level
+
+    def get_index(level: int, agent: Agent, *, expand: bool) -> int:
+        key = (level, *agent.position, agent.orientation.value)
+        try:
+            i = index[key]
+        except KeyError:
+            if max_states is not None and len(index) >= max_states:
+                raise RuntimeError(f'more than {max_states} reachable states')
+
+            i = index[key] = len(index)
+            levels.append(level)
+            state_agents.append(agent)
+            agents.extend(encode_agent(agent).tobytes())
+            queued.append(False)
+
+        if expand and not queued[i]:
+            queued[i] = True
+            queue.append(i)
+
+        return i
+
+    initial_counts: Dict[int, int] = {}
+    for state in initial_states:
+        i = get_index(get_level(state), state.agent, expand=True)
+        initial_counts[i] = initial_counts.get(i, 0) + 1
+
+    row_ids = array('q')
+    row_lengths = array('q')
+    next_states = array('q')
+    counts = array('q')
+    terminal = bytearray()
+    rewards = array('d')
+
+    while queue:
+        s = queue.popleft()
+        level = levels[s]
+        agent = state_agents[s]
+        state = State(level_grids[level], agent)
+
+        for a, action in enumerate(actions):
+            next_state = State(
+                state.grid, Agent(agent.position, agent.orientation, agent.obj)
+            )
+            transition_function(next_state, action, rng=env._rng)
+
+            with activate_transition_features(
+                state, action, next_state
+            ) as features:
+                # object positions are shared by all states of the level
+                features.state._positions = level_positions[level]
+                features.next_state._positions = level_positions[level]
+                reward = env.reward_function(state, action, next_state)
+                done = env.termination_function(state, action, next_state)
+
+            row_ids.append(s * num_actions + a)
+            row_lengths.append(1)
+            next_states.append(
+                get_index(level, next_state.agent, expand=not done)
+            )
+            counts.append(1)
+            terminal.append(done)
+            rewards.append(reward)
+
+    return _build_mdp(
+        actions,
+        num_states=len(index),
+        num_transition_samples=1,
+        levels=levels,
+        initial_counts=initial_counts,
+        queued=queued,
+        grid_shape=grid_shape,
+        grids=grids,
+        agents=agents,
+        row_ids=row_ids,
+        row_lengths=row_lengths,
+        next_states=next_states,
+        counts=counts,
+        terminal=terminal,
+        rewards=rewards,
+    )
+
+
+def _decode(grids: bytearray, agents: bytearray, i: int, grid_shape) -> State:
+    grid_size = int(np.prod(grid_shape))
+    agent_size = 6 * np.dtype(AGENT_DTYPE).itemsize
+    # slices are copies, so that the buffers can keep growing
+    grid = np.frombuffer(
+        grids[i * grid_size : (i + 1) * grid_size], dtype=GRID_DTYPE
+    ).reshape(grid_shape)
+    agent = np.frombuffer(
+        agents[i * agent_size : (i + 1) * agent_size], dtype=AGENT_DTYPE
+    )
+    return decode_state(grid, agent)
+
+
+def _build_mdp(  # pylint: disable=too-many-arguments,too-many-locals
+    actions: List[Action],
+    *,
+    num_states: int,
+    num_transition_samples: int,
+    initial_counts: Dict[int, int],
+    queued: bytearray,
+    grid_shape,
+    grids: bytearray,
+    agents: bytearray,
+    levels: Optional[array] = None,
+    row_ids: array,
+    row_lengths: array,
+    next_states: array,
+    counts: array,
+    terminal: bytearray,
+    rewards: array,
+) -> TabularMDP:
+    num_actions = len(actions)
+    num_rows = num_states * num_actions
+
+    row_ids_array = np.frombuffer(row_ids, dtype=np.int64)
+    row_lengths_array = np.frombuffer(row_lengths, dtype=np.int64)
+
+    # reorders the entries from expansion order to row order
+    entry_rows = np.repeat(row_ids_array, row_lengths_array)
+    entry_order = np.argsort(entry_rows, kind='stable')
+
+    lengths = np.zeros(num_rows, dtype=np.int64)
+    lengths[row_ids_array] = row_lengths_array
+    indptr = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+
+    rewards_array = np.zeros(num_rows)
+    rewards_array[row_ids_array] = np.frombuffer(rewards, dtype=np.float64)
+
+    initial_distribution = np.zeros(num_states)
+    for i, count in initial_counts.items():
+        initial_distribution[i] = count
+    initial_distribution /= initial_distribution.sum()
+
+    return TabularMDP(
+        actions=actions,
+        indptr=indptr,
+        next_states=np.frombuffer(next_states, dtype=np.int64)[entry_order],
+        probabilities=(
+            np.frombuffer(counts, dtype=np.int64)[entry_order]
+            / num_transition_samples
+        ),
+        terminal=np.frombuffer(terminal, dtype=bool)[entry_order],
+        rewards=rewards_array.reshape(num_states, num_actions),
+        initial_distribution=initial_distribution,
+        expanded=np.frombuffer(bytes(queued), dtype=bool).copy(),
+        grids=np.frombuffer(bytes(grids), dtype=GRID_DTYPE)
+        .reshape(-1, *grid_shape)
+        .copy(),
+        agents=np.frombuffer(bytes(agents), dtype=AGENT_DTYPE)
+        .reshape(num_states, 6)
+        .copy(),
+        levels=(
+            None
+            if levels is None
+            else np.frombuffer(levels, dtype=np.int64).copy()
+        ),
+    )
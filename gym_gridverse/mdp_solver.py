@@ -0,0 +1,205 @@
+"""Optimal values and policies of exported tabular MDPs
+
+Solvers for the sparse arrays exported by :py:func:`gym_gridverse.mdp.export_mdp`,
+e.g. to measure the regret of an agent, or to label states with expert
+actions::
+
+  mdp = export_mdp(env)
+  solution = value_iteration(mdp, discount=0.99)
+  solution.action(state)  # optimal action
+  solution.value(state)  # optimal value
+
+Each iteration is a sparse matrix-vector product over the transition arrays,
+vectorized with :py:func:`numpy.bincount`.  Values are expected returns in the
+sense of :py:func:`gym_gridverse.utils.rl.make_return_computer`, i.e. the
+first reward is not discounted, and nothing is collected after a terminal
+transition.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from gym_gridverse.action import Action
+from gym_gridverse.mdp import TabularMDP
+from gym_gridverse.state import State
+
+__all__ = ['Solution', 'policy_evaluation', 'q_values', 'value_iteration']
+
+
+@dataclass
+class Solution:
+    """Values and greedy policy of a tabular MDP
+
+    Args:
+        mdp (TabularMDP): solved MDP
+        values (np.ndarray): (S,) state values
+        q_values (np.ndarray): (S, A) state-action values
+        policy (np.ndarray): (S,) greedy action indices
+        num_iterations (int): number of iterations until convergence
+        converged (bool): True if the tolerance was reached
+    """
+
+    mdp: TabularMDP
+    values: np.ndarray
+    q_values: np.ndarray
+    policy: np.ndarray
+    num_iterations: int
+    converged: bool
+
+    def action(self, state: State) -> Action:
+        """Greedy action of a state
+
+        Raises:
+            KeyError: if the state is not in the MDP
+        """
+        return self.mdp.actions[self.policy[self.mdp.state_index(state)]]
+
+    def value(self, state: State) -> float:
+        """Value of a state
+
+        Raises:
+            KeyError: if the state is not in the MDP
+        """
+        return float(self.values[self.mdp.state_index(state)])
+
+
+class _Backup:
+    """Precomputed arrays for repeated Bellman backups of a tabular MDP"""
+
+    def __init__(self, mdp: TabularMDP, discount: float):
+        if not 0.0 < discount <= 1.0:
+            raise ValueError(f'discount {discount} should be in (0, 1]')
+
+        self.mdp = mdp
+        self.num_rows = mdp.num_states * mdp.num_actions
+        self.entry_rows = np.repeat(
+            np.arange(self.num_rows), np.diff(mdp.indptr)
+        )
+        # nothing is collected after terminal transitions
+        self.weights = discount * mdp.probabilities * ~mdp.terminal
+
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        """(S, A) state-action values given (S,) next state values"""
+        future = np.bincount(
+            self.entry_rows,
+            weights=self.weights * values[self.mdp.next_states],
+            minlength=self.num_rows,
+        )
+        return self.mdp.rewards + future.reshape(self.mdp.rewards.shape)
+
+
+def q_values(
+    mdp: TabularMDP, values: np.ndarray, discount: float
+) -> np.ndarray:
+    """Returns the state-action values of a one-step lookahead
+
+    Args:
+        mdp (TabularMDP):
+        values (np.ndarray): (S,) state values
+        discount (float): discount factor in (0, 1]
+
+    Returns:
+        np.ndarray: (S, A) state-action values
+    """
+    return _Backup(mdp, discount)(values)
+
+
+def value_iteration(
+    mdp: TabularMDP,
+    discount: float,
+    *,
+    tolerance: float = 1e-8,
+    max_iterations: Optional[int] = None,
+    values: Optional[np.ndarray] = None,
+) -> Solution:
+    """Computes the optimal values and policy of a tabular MDP
+
+    Args:
+        mdp (TabularMDP):
+        discount (float): discount factor in (0, 1];  undiscounted problems
+            converge only if all policies eventually terminate, otherwise use
+            `max_iterations`
+        tolerance (float): stops when no value changes by more than this
+        max_iterations (Optional[int]): maximum number of iterations
+        values (Optional[np.ndarray]): (S,) initial values, zero by default
+
+    Returns:
+        Solution: optimal values and greedy policy
+    """
+    backup = _Backup(mdp, discount)
+    values = (
+        np.zeros(mdp.num_states)
+        if values is None
+        else np.array(values, dtype=np.float64)
+    )
+
+    num_iterations = 0
+    converged = False
+    while max_iterations is None or num_iterations < max_iterations:
+        qs = backup(values)
+        new_values = qs.max(axis=1)
+        num_iterations += 1
+
+        delta = np.abs(new_values - values).max(initial=0.0)
+        values = new_values
+        if delta <= tolerance:
+            converged = True
+            break
+
+    qs = backup(values)
+    return Solution(
+        mdp=mdp,
+        values=values,
+        q_values=qs,
+        policy=qs.argmax(axis=1),
+        num_iterations=num_iterations,
+        converged=converged,
+    )
+
+
+def policy_evaluation(
+    mdp: TabularMDP,
+    policy: np.ndarray,
+    discount: float,
+    *,
+    tolerance: float = 1e-8,
+    max_iterations: Optional[int] = None,
+) -> np.ndarray:
+    """Computes the values of a policy by iterative evaluation
+
+    Args:
+        mdp (TabularMDP):
+        policy (np.ndarray): (S,) action indices of a deterministic policy, or
+            (S, A) action probabilities of a stochastic policy
+        discount (float): discount factor in (0, 1]
+        tolerance (float): stops when no value changes by more than this
+        max_iterations (Optional[int]): maximum number of iterations
+
+    Returns:
+        np.ndarray: (S,) state values
+    """
+    policy = np.asarray(policy)
+    if policy.ndim == 1:
+        policy = np.eye(mdp.num_actions)[policy]
+
+    if policy.shape != mdp.rewards.shape:
+        raise ValueError(
+            f'policy shape {policy.shape} does not match the MDP '
+            f'({mdp.num_states}, {mdp.num_actions})'
+        )
+
+    backup = _Backup(mdp, discount)
+    values = np.zeros(mdp.num_states)
+
+    num_iterations = 0
+    while max_iterations is None or num_iterations < max_iterations:
+        new_values = (policy * backup(values)).sum(axis=1)
+        num_iterations += 1
+
+        delta = np.abs(new_values - values).max(initial=0.0)
+        values = new_values
+        if delta <= tolerance:
+            break
+
+    return values
@@ -0,0 +1,345 @@
+"""Memoization of observations and of their representations
+
+With partial observability, many steps produce identical observations, e.g.
+when the agent turns in place in a static room, or revisits a cell.  A
+:py:class:`CachedObservationFunction` replaces an observation function built
+from :py:func:`~gym_gridverse.envs.observation_functions.from_visibility`, and
+keeps the most recently used observations keyed by the contents of the POV
+window, the orientation of the agent and the held object, i.e. everything the
+observation depends on::
+
+  observation_function = CachedObservationFunction.from_observation_function(
+      observation_functions.factory(
+          'partial_observation', observation_space=observation_space
+      ),
+      capacity=4096,
+  )
+  env = GridWorld(
+      domain_space,
+      reset_function,
+      transition_function,
+      observation_function,
+      reward_function,
+      termination_function,
+  )
+
+Similarly, a :py:class:`CachedObservationRepresentation` keeps the most
+recently used representations of observations.  Both report their hit rates
+through :py:meth:`cache_info`, so that their capacity can be tuned.
+
+Stochastic visibility functions (i.e.
+:py:func:`~gym_gridverse.envs.visibility_functions
+.stochastic_raytracing_visibility`) are never cached:  their observations are
+always recomputed, and counted as bypassed.
+"""
+import copy
+import inspect
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import numpy.random as rnd
+
+from gym_gridverse.envs.observation_functions import (
+    ObservationFunction,
+    from_visibility,
+)
+from gym_gridverse.envs.visibility_functions import (
+    VisibilityFunction,
+    stochastic_raytracing_visibility,
+)
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import Box, GridObject
+from gym_gridverse.observation import Observation
+from gym_gridverse.representations.representation import (
+    ObservationRepresentation,
+)
+from gym_gridverse.spaces import ObservationSpace
+from gym_gridverse.state import State
+
+__all__ = [
+    'CacheInfo',
+    'CachedObservationFunction',
+    'CachedObservationRepresentation',
+]
+
+_STOCHASTIC_VISIBILITY_FUNCTIONS = (stochastic_raytracing_visibility,)
+
+
+@dataclass(frozen=True)
+class CacheInfo:
+    """Statistics of a cache
+
+    Args:
+        hits (int): number of calls answered by the cache
+        misses (int): number of calls computed and stored in the cache
+        evictions (int): number of entries evicted to respect the capacity
+        bypassed (int): number of calls computed without using the cache
+        size (int): current number of entries
+        capacity (int): maximum number of entries
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    bypassed: int
+    size: int
+    capacity: int
+
+    @property
+    def hit_rate(self) -> float:
+        """fraction of cacheable calls answered by the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
+
+
+class _LRUCache:
+    """Least recently used mapping, with statistics"""
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError(f'capacity ({capacity}) should be positive')
+
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypassed = 0
+        self._entries: 'OrderedDict[Hashable, object]' = OrderedDict()
+
+    def get(self, key: Hashable):
+        """returns the entry of the key, or None"""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value):
+        self._entries[key] = value
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = self.evictions = self.bypassed = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits,
+            self.misses,
+            self.evictions,
+            self.bypassed,
+            len(self._entries),
+            self.capacity,
+        )
+
+
+def _object_key(obj: GridObject) -> Tuple:
+    """exact key of an object, including the contents of boxes"""
+    if isinstance(obj, Box):
+        return (
+            obj.type_index,
+            obj.state_index,
+            obj.color,
+            _object_key(obj.content),
+        )
+
+    return (obj.type_index, obj.state_index, obj.color)
+
+
+def _grid_key(grid: Grid) -> Tuple:
+    # pylint: disable=protected-access
+    return tuple(
+        _object_key(grid._peek(y, x))
+        for y in range(grid.height)
+        for x in range(grid.width)
+    )
+
+
+def _is_stochastic(visibility_function: VisibilityFunction) -> bool:
+    while isinstance(visibility_function, partial):
+        visibility_function = visibility_function.func
+
+    return (
+        inspect.unwrap(visibility_function) in _STOCHASTIC_VISIBILITY_FUNCTIONS
+    )
+
+
+class CachedObservationFunction:
+    """:py:func:`~gym_gridverse.envs.observation_functions.from_visibility`,
+    with an LRU cache of observations
+
+    Args:
+        observation_space (ObservationSpace): observation space
+        visibility_function (VisibilityFunction): visibility function;
+            stochastic visibility functions are never cached
+        capacity (int): maximum number of cached observations
+    """
+
+    def __init__(
+        self,
+        observation_space: ObservationSpace,
+        visibility_function: VisibilityFunction,
+        *,
+        capacity: int = 1024,
+    ):
+        self.observation_space = observation_space
+        self.visibility_function = visibility_function
+        self.cacheable = not _is_stochastic(visibility_function)
+        self._cache = _LRUCache(capacity)
+
+    @classmethod
+    def from_observation_function(
+        cls, observation_function: ObservationFunction, *, capacity: int = 1024
+    ) -> 'CachedObservationFunction':
+        """wraps an observation function built from `from_visibility`
+
+        Args:
+            observation_function (ObservationFunction): partial of
+                :py:func:`~gym_gridverse.envs.observation_functions
+                .from_visibility`, e.g. as returned by
+                :py:func:`~gym_gridverse.envs.observation_functions.factory`
+            capacity (int): maximum number of cached observations
+
+        Returns:
+            CachedObservationFunction: equivalent cached observation function
+        """
+        if isinstance(observation_function, cls):
+            return cls(
+                observation_function.observation_space,
+                observation_function.visibility_function,
+                capacity=capacity,
+            )
+
+        if (
+            not isinstance(observation_function, partial)
+            or inspect.unwrap(observation_function.func) is not from_visibility
+            or observation_function.args
+        ):
+            raise ValueError(
+                'observation function should be a partial of `from_visibility`'
+            )
+
+        keywords = observation_function.keywords
+        try:
+            observation_space = keywords['observation_space']
+            visibility_function = keywords['visibility_function']
+        except KeyError as error:
+            raise ValueError(
+                f'observation function is missing argument {error}'
+            ) from error
+
+        return cls(observation_space, visibility_function, capacity=capacity)
+
+    @property
+    def capacity(self) -> int:
+        return self._cache.capacity
+
+    def __call__(
+        self, state: State, *, rng: Optional[rnd.Generator] = None
+    ) -> Observation:
+        if not self.cacheable:
+            self._cache.bypassed += 1
+            return self._observation(state, rng)
+
+        key = self.key(state)
+        observation = self._cache.get(key)
+        if observation is None:
+            observation = self._observation(state, rng)
+            self._cache.put(key, observation)
+
+        # copies protect the cached observation from changes by the caller
+        return copy.deepcopy(observation)
+
+    def key(self, state: State) -> Tuple:
+        """key of the observation of a state
+
+        The key consists of the objects in the POV window of the agent
+        (cells outside the grid are None), its orientation, and its held
+        object.
+        """
+        # pylint: disable=protected-access
+        grid = state.grid
+        area = state.agent.get_pov_area(self.observation_space.area)
+        cells = tuple(
+            _object_key(grid._peek(y, x))
+            if 0 <= y < grid.height and 0 <= x < grid.width
+            else None
+            for y in range(area.ymin, area.ymax + 1)
+            for x in range(area.xmin, area.xmax + 1)
+        )
+        return (
+            cells,
+            state.agent.orientation,
+            _object_key(state.agent.obj),
+        )
+
+    def cache_info(self) -> CacheInfo:
+        return self._cache.info()
+
+    def cache_clear(self):
+        """removes all cached observations and resets the statistics"""
+        self._cache.clear()
+
+    def _observation(
+        self, state: State, rng: Optional[rnd.Generator]
+    ) -> Observation:
+        return from_visibility(
+            state,
+            observation_space=self.observation_space,
+            visibility_function=self.visibility_function,
+            rng=rng,
+        )
+
+
+class CachedObservationRepresentation(ObservationRepresentation):
+    """Observation representation with an LRU cache of representations
+
+    Args:
+        representation (ObservationRepresentation): representation to cache
+        capacity (int): maximum number of cached representations
+    """
+
+    def __init__(
+        self, representation: ObservationRepresentation, *, capacity: int = 1024
+    ):
+        self.representation = representation
+        self._cache = _LRUCache(capacity)
+
+    @property
+    def space(self) -> Dict[str, np.ndarray]:
+        return self.representation.space
+
+    @property
+    def capacity(self) -> int:
+        return self._cache.capacity
+
+    def convert(self, o: Observation) -> Dict[str, np.ndarray]:
+        key = (
+            _grid_key(o.grid),
+            o.agent.position,
+            o.agent.orientation,
+            _object_key(o.agent.obj),
+        )
+        representation = self._cache.get(key)
+        if representation is None:
+            representation = self.representation.convert(o)
+            self._cache.put(key, representation)
+
+        # copies protect the cached arrays from changes by the caller
+        return {name: array.copy() for name, array in representation.items()}
+
+    def cache_info(self) -> CacheInfo:
+        return self._cache.info()
+
+    def cache_clear(self):
+        """removes all cached representations and resets the statistics"""
+        self._cache.clear()
@@ -0,0 +1,269 @@
+"""Opt-in timing instrumentation of environment components
+
+A :py:class:`Profiler` records call counts and timing histograms of named
+functions.  :py:meth:`GridWorld.enable_profiling
+<gym_gridverse.envs.gridworld.GridWorld.enable_profiling>` wraps each
+component of an environment (reset, transition, reward, termination and
+observation functions, and the space checks), including the sub-functions of
+chained transitions and reduced rewards and terminations::
+
+  profiler = env.enable_profiling()
+  ...  # use env as usual
+  env.disable_profiling()
+
+  profiler.as_dict()['transition/0:move_agent']['mean']
+  profiler.write_prometheus('gridverse.prom')
+
+Profiling is implemented by swapping the components for timed wrappers, so
+environments which are not being profiled run the exact same code as before.
+"""
+import functools
+import math
+import time
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from gym_gridverse.envs.transition_functions import CompiledChain
+
+__all__ = ['Histogram', 'Profiler']
+
+T = TypeVar('T', bound=Callable)
+
+NUM_BUCKETS = 32
+"""number of finite histogram buckets;  bucket i holds durations up to 2^i
+microseconds, i.e. the last finite bucket holds durations up to ~36 minutes"""
+
+
+class Histogram:
+    """Call count, total time and log2-bucketed histogram of durations"""
+
+    __slots__ = ('counts', 'count', 'total')
+
+    def __init__(self):
+        # the extra bucket holds durations which exceed all finite buckets
+        self.counts: List[int] = [0] * (NUM_BUCKETS + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        """records a duration"""
+        # durations in [2^(i-1), 2^i) microseconds go in bucket i
+        index = int(seconds * 1_000_000).bit_length()
+        self.counts[min(index, NUM_BUCKETS)] += 1
+        self.count += 1
+        self.total += seconds
+
+    @staticmethod
+    def upper_bounds() -> List[float]:
+        """upper bound of each bucket, in seconds"""
+        return [(1 << i) / 1_000_000 for i in range(NUM_BUCKETS)] + [math.inf]
+
+    def quantile(self, q: float) -> float:
+        """estimated quantile, i.e. upper bound of the bucket containing it"""
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f'quantile {q} should be in [0, 1]')
+
+        if self.count == 0:
+            return math.nan
+
+        threshold = q * self.count
+        cumulative = 0
+        for upper_bound, count in zip(self.upper_bounds(), self.counts):
+            cumulative += count
+            if cumulative >= threshold and cumulative > 0:
+                return upper_bound
+
+        return math.inf
+
+
+class Profiler:
+    """Collection of timing histograms, indexed by component name"""
+
+    def __init__(self):
+        self.histograms: Dict[str, Histogram] = {}
+
+    def histogram(self, name: str) -> Histogram:
+        """returns the histogram of the given name, creating it if necessary"""
+        try:
+            return self.histograms[name]
+        except KeyError:
+            histogram = self.histograms[name] = Histogram()
+            return histogram
+
+    def reset(self):
+        """clears all recorded data, keeping the existing wrappers valid"""
+        for histogram in self.histograms.values():
+            histogram.__init__()
+
+    def timed(self, name: str, function: T) -> T:
+        """Wraps a function to record its durations
+
+        Args:
+            name (str): histogram name
+            function (T): function to time
+
+        Returns:
+            T: wrapped function
+        """
+        observe = self.histogram(name).observe
+        perf_counter = time.perf_counter
+
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                observe(perf_counter() - start)
+
+        return timed_function  # type: ignore
+
+    def instrument(self, name: str, function: T) -> T:
+        """Wraps a function and, recursively, its sub-functions
+
+        Sub-functions are the callable keyword arguments of partial functions,
+        e.g. the `transition_functions` of :py:func:`transition_functions.chain
+        <gym_gridverse.envs.transition_functions.chain>` (or of a
+        :py:class:`~gym_gridverse.envs.transition_functions.CompiledChain`), the
+        `reward_functions` of :py:func:`reward_functions.reduce
+        <gym_gridverse.envs.reward_functions.reduce>`, or the
+        `visibility_function` of an observation function.  These are timed as
+        `<name>/<index>:<function name>` and `<name>/<keyword>` respectively.
+
+        Args:
+            name (str): histogram name of the function
+            function (T): function to time
+
+        Returns:
+            T: wrapped function
+        """
+        if isinstance(function, partial):
+            keywords = {}
+            for key, value in function.keywords.items():
+                if key.endswith('_functions') and isinstance(
+                    value, (list, tuple)
+                ):
+                    value = [
+                        self.instrument(f'{name}/{i}:{function_name(f)}', f)
+                        for i, f in enumerate(value)
+                    ]
+                elif key.endswith('_function') and callable(value):
+                    value = self.instrument(f'{name}/{key}', value)
+
+                keywords[key] = value
+
+            function = partial(  # type: ignore
+                function.func, *function.args, **keywords
+            )
+
+        elif isinstance(function, CompiledChain):
+            function = CompiledChain(  # type: ignore
+                [
+                    self.instrument(f'{name}/{i}:{function_name(f)}', f)
+                    for i, f in enumerate(function.transition_functions)
+                ]
+            )
+
+        return self.timed(name, function)
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """Returns the recorded data as plain (json-serializable) data
+
+        Returns:
+            Dict[str, Dict]: count, total and mean seconds, estimated median
+            and 99th percentile, and the non-empty buckets (upper bound in
+            seconds to count) of each histogram
+        """
+        return {
+            name: {
+                'count': histogram.count,
+                'total': histogram.total,
+                'mean': (
+                    histogram.total / histogram.count
+                    if histogram.count > 0
+                    else math.nan
+                ),
+                'p50': histogram.quantile(0.5),
+                'p99': histogram.quantile(0.99),
+                'buckets': {
+                    _format_bound(upper_bound): count
+                    for upper_bound, count in zip(
+                        Histogram.upper_bounds(), histogram.counts
+                    )
+                    if count > 0
+                },
+            }
+            for name, histogram in self.histograms.items()
+        }
+
+    def to_prometheus(self, metric: str = 'gridverse_component_seconds') -> str:
+        """Returns the recorded data in the Prometheus text format
+
+        Each histogram is exported as a Prometheus histogram with a
+        `component` label, with cumulative buckets.
+
+        Args:
+            metric (str): metric name
+
+        Returns:
+            str: Prometheus text exposition
+        """
+        lines = [
+            f'# HELP {metric} Duration of environment component calls.',
+            f'# TYPE {metric} histogram',
+        ]
+
+        for name, histogram in self.histograms.items():
+            label = f'component="{_escape_label(name)}"'
+
+            cumulative = 0
+            for upper_bound, count in zip(
+                Histogram.upper_bounds(), histogram.counts
+            ):
+                cumulative += count
+                le = _format_bound(upper_bound)
+                lines.append(
+                    f'{metric}_bucket{{{label},le="{le}"}} {cumulative}'
+                )
+
+            lines.append(f'{metric}_sum{{{label}}} {histogram.total!r}')
+            lines.append(f'{metric}_count{{{label}}} {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path: str, **kwargs):
+        """writes :py:meth:`to_prometheus` to a file, e.g. for node exporter"""
+        with open(path, 'w') as f:
+            f.write(self.to_prometheus(**kwargs))
+
+    def summary(self) -> List[Tuple[str, int, float, float]]:
+        """(name, count, total, mean) of each histogram, by decreasing total"""
+        return sorted(
+            (
+                (
+                    name,
+                    histogram.count,
+                    histogram.total,
+                    histogram.total / max(histogram.count, 1),
+                )
+                for name, histogram in self.histograms.items()
+            ),
+            key=lambda row: row[2],
+            reverse=True,
+        )
+
+
+def function_name(function: Optional[Callable]) -> str:
+    """human readable name of a (possibly partial) function"""
+    while isinstance(function, partial):
+        function = function.func
+
+    return getattr(function, '__name__', type(function).__name__)
+
+
+def _format_bound(upper_bound: float) -> str:
+    return '+Inf' if math.isinf(upper_bound) else repr(upper_bound)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
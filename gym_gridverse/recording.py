@@ -1,23 +1,55 @@
+import copy
+import itertools as itt
+import json
+import math
+import multiprocessing
 import os
+import queue
+import struct
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field
 from typing import (
+    BinaryIO,
+    Dict,
     Generic,
     Iterable,
     Iterator,
     List,
     Optional,
     Sequence,
+    Tuple,
     TypeVar,
+    Union,
 )
 
-import imageio
 import more_itertools as mitt
 import numpy as np
+import numpy.random as rnd
 from typing_extensions import TypedDict
 
 from gym_gridverse.action import Action
+from gym_gridverse.encoding import (
+    decode_observation,
+    decode_state,
+    encode_observation,
+    encode_state,
+)
+from gym_gridverse.envs import InnerEnv
+from gym_gridverse.envs.gridworld import GridWorld
+from gym_gridverse.geometry import Orientation
+from gym_gridverse.headless_rendering import (
+    HeadlessRenderer,
+    compose_frame,
+    grid_indices,
+)
 from gym_gridverse.observation import Observation
-from gym_gridverse.rendering import GridVerseViewer
+from gym_gridverse.representations.representation import (
+    ObservationRepresentation,
+    Representation,
+    StateRepresentation,
+)
 from gym_gridverse.state import State
 from gym_gridverse.utils.rl import make_return_computer
 
@@ -78,6 +110,756 @@ class DataBuilder(Generic[RecordingElement]):
         return Data(self.elements, self.actions, self.rewards, self.discount)
 
 
+def _element_kind(element: RecordingElement) -> str:
+    if isinstance(element, State):
+        return 'state'
+
+    if isinstance(element, Observation):
+        return 'observation'
+
+    if isinstance(element, np.ndarray):
+        return 'image'
+
+    raise TypeError(f'invalid recording element type {type(element)}')
+
+
+class DataWriter(Generic[RecordingElement]):
+    """Writes Data to file interactively, one chunk of elements at a time
+
+    Same interface as :py:class:`DataBuilder`, but elements are encoded (see
+    :py:mod:`gym_gridverse.encoding`) and periodically flushed to disk, rather
+    than being kept in memory until the end of the episode.  The resulting file
+    is read back lazily by :py:class:`DataReader`.
+
+    The file is a sequence of numpy arrays stored back-to-back in ``.npy``
+    format:  a header (element kind and discount) followed by chunks (encoded
+    elements, actions and rewards).
+    """
+
+    def __init__(
+        self, filename: str, discount: float, *, chunk_size: int = 256
+    ):
+        if chunk_size <= 0:
+            raise ValueError(f'chunk_size ({chunk_size}) should be positive')
+
+        self.filename = filename
+        self.discount = discount
+        self.chunk_size = chunk_size
+
+        self._kind: Optional[str] = None
+        self._file: Optional[BinaryIO] = None
+        self._num_elements = 0
+
+        self._elements: List[Tuple[np.ndarray, ...]] = []
+        self._actions: List[int] = []
+        self._rewards: List[float] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._num_elements
+
+    def append0(self, element: RecordingElement):
+        if self._num_elements != 0:
+            raise RuntimeError('cannot call DataWriter.append0 at this point')
+
+        self._kind = _element_kind(element)
+
+        try:
+            self._file = open(self.filename, 'wb')
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+            self._file = open(self.filename, 'wb')
+
+        np.save(self._file, np.array(self._kind))
+        np.save(self._file, np.array(self.discount))
+
+        self._append(element, -1, np.nan)
+
+    def append(self, element: RecordingElement, action: Action, reward: float):
+        if self._num_elements == 0:
+            raise RuntimeError('cannot call DataWriter.append at this point')
+
+        if _element_kind(element) != self._kind:
+            raise TypeError(f'expected element of kind {self._kind}')
+
+        self._append(element, action.value, reward)
+
+    def _append(self, element: RecordingElement, action: int, reward: float):
+        if self._file is None:
+            raise RuntimeError('DataWriter is closed')
+
+        encoded = (
+            (element,)
+            if isinstance(element, np.ndarray)
+            else encode_state(element)
+            if isinstance(element, State)
+            else encode_observation(element)
+        )
+
+        self._elements.append(encoded)
+        self._actions.append(action)
+        self._rewards.append(reward)
+        self._num_elements += 1
+
+        if len(self._elements) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """writes the pending elements to file"""
+        if self._file is None or len(self._elements) == 0:
+            return
+
+        for arrays in zip(*self._elements):
+            np.save(self._file, np.stack(arrays))
+        np.save(self._file, np.array(self._actions, dtype=np.int8))
+        np.save(self._file, np.array(self._rewards, dtype=float))
+        self._file.flush()
+
+        self._elements.clear()
+        self._actions.clear()
+        self._rewards.clear()
+
+    def close(self):
+        if self._file is None:
+            return
+
+        self.flush()
+        self._file.close()
+        self._file = None
+
+
+DataStep = Tuple[RecordingElement, Optional[Action], Optional[float]]
+"""An element, with the action and reward which led to it (None for the first)"""
+
+
+class DataReader(Generic[RecordingElement]):
+    """Reads Data written by :py:class:`DataWriter` lazily
+
+    Iterating over the reader decodes the elements one chunk at a time, so that
+    the whole episode never needs to be held in memory.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+        with open(filename, 'rb') as f:
+            self.kind = str(np.load(f))
+            self.discount = float(np.load(f))
+
+    def __iter__(self) -> Iterator[DataStep]:
+        num_arrays = 1 if self.kind == 'image' else 2
+        size = os.path.getsize(self.filename)
+
+        with open(self.filename, 'rb') as f:
+            # skipping header
+            np.load(f)
+            np.load(f)
+
+            while f.tell() < size:
+                arrays = [np.load(f) for _ in range(num_arrays)]
+                actions = np.load(f)
+                rewards = np.load(f)
+
+                for i, (action, reward) in enumerate(zip(actions, rewards)):
+                    yield (
+                        self._decode(*(array[i] for array in arrays)),
+                        None if action < 0 else Action(action),
+                        None if action < 0 else float(reward),
+                    )
+
+    def _decode(self, *arrays: np.ndarray) -> RecordingElement:
+        if self.kind == 'state':
+            return decode_state(*arrays)
+
+        if self.kind == 'observation':
+            return decode_observation(*arrays)
+
+        (image,) = arrays
+        return image
+
+    def elements(self) -> Iterator[RecordingElement]:
+        """iterator over the elements only"""
+        return (element for element, _, _ in self)
+
+    def read(self) -> Data[RecordingElement]:
+        """reads the whole file into a Data object"""
+        builder: DataBuilder[RecordingElement] = DataBuilder(self.discount)
+
+        for element, action, reward in self:
+            if action is None:
+                builder.append0(element)
+            else:
+                assert reward is not None
+                builder.append(element, action, reward)
+
+        return builder.build()
+
+
+def _data_steps(
+    data: Union[Data[RecordingElement], DataReader[RecordingElement]]
+) -> Iterator[DataStep]:
+    if isinstance(data, DataReader):
+        return iter(data)
+
+    return itt.chain(
+        [(data.elements[0], None, None)],
+        zip(data.elements[1:], data.actions, data.rewards),
+    )
+
+
+class TransitionDatasetWriter:
+    """Writes environment rollouts into a columnar transition dataset
+
+    The dataset is a directory containing one raw binary file per column, and
+    a ``metadata.json`` file which describes each column's dtype and shape.
+    Every representation key (e.g. ``grid`` and ``agent``) is stored as its own
+    column of fixed-shape rows, prefixed by ``state.`` or ``observation.``,
+    using the smallest integer dtype which fits its representation space.
+
+    Elements (states and/or observations) and transitions are stored
+    separately, so that the element following a transition need not be stored
+    twice:  transition ``t`` goes from element ``element_index[t]`` to element
+    ``element_index[t] + 1``.  The file ``episode_start.bin`` stores the index
+    of the first transition of each episode.
+
+    Same interface as :py:class:`DataBuilder`, i.e. each episode is started by
+    :py:meth:`append0`, and continued by :py:meth:`append`.  The metadata is
+    written by :py:meth:`close`;  see :py:class:`TransitionDataset` to load
+    the dataset back.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        state_representation: Optional[StateRepresentation] = None,
+        observation_representation: Optional[ObservationRepresentation] = None,
+    ):
+        if state_representation is None and observation_representation is None:
+            raise ValueError(
+                'at least one of state_representation or '
+                'observation_representation is required'
+            )
+
+        self.path = path
+        self.state_representation = state_representation
+        self.observation_representation = observation_representation
+
+        os.makedirs(path, exist_ok=True)
+
+        self._columns: Dict[str, Tuple[np.dtype, Tuple[int, ...]]] = {
+            'element_index': (np.dtype(np.int64), ()),
+            'action': (np.dtype(np.int8), ()),
+            'reward': (np.dtype(np.float64), ()),
+            'done': (np.dtype(np.bool_), ()),
+            'episode_start': (np.dtype(np.int64), ()),
+        }
+
+        if state_representation is not None:
+            self._add_representation_columns('state', state_representation)
+
+        if observation_representation is not None:
+            self._add_representation_columns(
+                'observation', observation_representation
+            )
+
+        self._files = {
+            name: open(os.path.join(path, f'{name}.bin'), 'wb')
+            for name in self._columns
+        }
+
+        self.num_elements = 0
+        self.num_transitions = 0
+        self.num_episodes = 0
+
+    def _add_representation_columns(
+        self, prefix: str, representation: Representation
+    ):
+        for key, space in representation.space.items():
+            dtype = np.min_scalar_type(np.max(space))
+            self._columns[f'{prefix}.{key}'] = (dtype, space.shape)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _write(self, name: str, value):
+        dtype, shape = self._columns[name]
+        array = np.asarray(value)
+
+        if array.shape != shape:
+            raise ValueError(
+                f'column {name} expects shape {shape}, got {array.shape}'
+            )
+
+        self._files[name].write(array.astype(dtype).tobytes())
+
+    def _write_elements(
+        self, state: Optional[State], observation: Optional[Observation]
+    ):
+        if self.state_representation is not None:
+            if state is None:
+                raise ValueError('state is required by state_representation')
+
+            for key, value in self.state_representation.convert(state).items():
+                self._write(f'state.{key}', value)
+
+        if self.observation_representation is not None:
+            if observation is None:
+                raise ValueError(
+                    'observation is required by observation_representation'
+                )
+
+            for key, value in self.observation_representation.convert(
+                observation
+            ).items():
+                self._write(f'observation.{key}', value)
+
+        self.num_elements += 1
+
+    def append0(
+        self,
+        *,
+        state: Optional[State] = None,
+        observation: Optional[Observation] = None,
+    ):
+        """starts a new episode from its initial state and/or observation"""
+        self._write('episode_start', self.num_transitions)
+        self._write_elements(state, observation)
+        self.num_episodes += 1
+
+    def append(
+        self,
+        action: Action,
+        reward: float,
+        done: bool,
+        *,
+        state: Optional[State] = None,
+        observation: Optional[Observation] = None,
+    ):
+        """appends a transition to the current episode"""
+        if self.num_episodes == 0:
+            raise RuntimeError(
+                'cannot call TransitionDatasetWriter.append at this point'
+            )
+
+        self._write('element_index', self.num_elements - 1)
+        self._write('action', action.value)
+        self._write('reward', reward)
+        self._write('done', done)
+        self._write_elements(state, observation)
+        self.num_transitions += 1
+
+    def append_episode(
+        self,
+        actions: Sequence[Action],
+        rewards: Sequence[float],
+        dones: Sequence[bool],
+        *,
+        states: Optional[Dict[str, np.ndarray]] = None,
+        observations: Optional[Dict[str, np.ndarray]] = None,
+    ):
+        """Appends a whole episode of already converted elements
+
+        Equivalent to :py:meth:`append0` followed by :py:meth:`append` for
+        each transition, but each column is written in a single operation,
+        e.g. for episodes converted by worker processes.
+
+        Args:
+            actions (Sequence[Action]): T actions
+            rewards (Sequence[float]): T rewards
+            dones (Sequence[bool]): T done flags
+            states (Optional[Dict[str, np.ndarray]]): state representation
+                arrays, each stacked over the T + 1 states
+            observations (Optional[Dict[str, np.ndarray]]): observation
+                representation arrays, each stacked over the T + 1
+                observations
+        """
+        num_transitions = len(actions)
+        if not len(rewards) == len(dones) == num_transitions:
+            raise ValueError('actions, rewards and dones differ in length')
+
+        elements = []
+        for prefix, representation, converted in [
+            ('state', self.state_representation, states),
+            ('observation', self.observation_representation, observations),
+        ]:
+            if representation is None:
+                continue
+
+            if converted is None:
+                raise ValueError(
+                    f'{prefix}s are required by {prefix}_representation'
+                )
+
+            for key in representation.space:
+                name = f'{prefix}.{key}'
+                dtype, shape = self._columns[name]
+                array = np.asarray(converted[key])
+                if array.shape != (num_transitions + 1, *shape):
+                    raise ValueError(
+                        f'column {name} expects shape '
+                        f'{(num_transitions + 1, *shape)}, got {array.shape}'
+                    )
+
+                elements.append((name, array.astype(dtype)))
+
+        self._write('episode_start', self.num_transitions)
+        self._files['element_index'].write(
+            np.arange(
+                self.num_elements,
+                self.num_elements + num_transitions,
+                dtype=np.int64,
+            ).tobytes()
+        )
+        for name, values in [
+            ('action', [action.value for action in actions]),
+            ('reward', rewards),
+            ('done', dones),
+        ]:
+            dtype, _ = self._columns[name]
+            self._files[name].write(np.asarray(values, dtype=dtype).tobytes())
+
+        for name, array in elements:
+            self._files[name].write(array.tobytes())
+
+        self.num_elements += num_transitions + 1
+        self.num_transitions += num_transitions
+        self.num_episodes += 1
+
+    def close(self):
+        if not self._files:
+            return
+
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+        metadata = {
+            'num_elements': self.num_elements,
+            'num_transitions': self.num_transitions,
+            'num_episodes': self.num_episodes,
+            'columns': {
+                name: {'dtype': dtype.str, 'shape': list(shape)}
+                for name, (dtype, shape) in self._columns.items()
+            },
+        }
+
+        with open(os.path.join(self.path, 'metadata.json'), 'w') as f:
+            json.dump(metadata, f, indent=2)
+
+
+TransitionIndex = Union[int, slice, Sequence[int], np.ndarray]
+"""An integer, slice, or array of integers indexing transitions"""
+
+
+class TransitionDataset:
+    """Random access to a dataset written by :py:class:`TransitionDatasetWriter`
+
+    Columns are memory-mapped, so that opening a dataset is cheap regardless of
+    its size, and only the rows which are accessed are read from disk.
+    Indexing by a single transition (or by a slice of transitions within the
+    same episode) returns views into the memory maps, without copies;  indexing
+    by an array of transitions (e.g. a random minibatch) gathers the rows.
+
+    Each indexed batch is a dictionary which contains the ``action``,
+    ``reward`` and ``done`` columns, and each element column twice, e.g.
+    ``observation.grid`` and ``next_observation.grid``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+        with open(os.path.join(path, 'metadata.json')) as f:
+            metadata = json.load(f)
+
+        self.num_elements: int = metadata['num_elements']
+        self.num_transitions: int = metadata['num_transitions']
+        self.num_episodes: int = metadata['num_episodes']
+
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, column in metadata['columns'].items():
+            num_rows = (
+                self.num_episodes
+                if name == 'episode_start'
+                else self.num_transitions
+                if name in ['element_index', 'action', 'reward', 'done']
+                else self.num_elements
+            )
+            self.columns[name] = self._memmap(
+                name, np.dtype(column['dtype']), (num_rows, *column['shape'])
+            )
+
+        self.element_columns = [
+            name
+            for name in self.columns
+            if name.startswith(('state.', 'observation.'))
+        ]
+
+    def _memmap(
+        self, name: str, dtype: np.dtype, shape: Tuple[int, ...]
+    ) -> np.ndarray:
+        # np.memmap refuses to map empty files
+        if shape[0] == 0:
+            return np.empty(shape, dtype=dtype)
+
+        filename = os.path.join(self.path, f'{name}.bin')
+        return np.memmap(filename, dtype=dtype, mode='r', shape=shape)
+
+    def __len__(self) -> int:
+        return self.num_transitions
+
+    def __getitem__(self, index: TransitionIndex) -> Dict[str, np.ndarray]:
+        element_index = self.columns['element_index'][index]
+
+        element_index_from: Union[int, slice, np.ndarray]
+        element_index_to: Union[int, slice, np.ndarray]
+        if isinstance(element_index, np.ndarray) and _is_contiguous(
+            element_index
+        ):
+            first = int(element_index[0])
+            element_index_from = slice(first, first + len(element_index))
+            element_index_to = slice(first + 1, first + 1 + len(element_index))
+        else:
+            element_index_from = element_index
+            element_index_to = element_index + 1
+
+        batch = {
+            'action': self.columns['action'][index],
+            'reward': self.columns['reward'][index],
+            'done': self.columns['done'][index],
+        }
+
+        for name in self.element_columns:
+            column = self.columns[name]
+            batch[name] = column[element_index_from]
+            batch[f'next_{name}'] = column[element_index_to]
+
+        return batch
+
+    def episode(self, i: int) -> slice:
+        """returns the slice of transitions which belong to episode i"""
+        episode_start = self.columns['episode_start']
+        start = int(episode_start[i])
+        stop = (
+            int(episode_start[i + 1])
+            if i + 1 < self.num_episodes
+            else self.num_transitions
+        )
+        return slice(start, stop)
+
+    def actions(self, index: TransitionIndex) -> List[Action]:
+        """returns the transitions' actions as Action objects"""
+        return [Action(a) for a in np.atleast_1d(self.columns['action'][index])]
+
+
+def _is_contiguous(indices: np.ndarray) -> bool:
+    """True if the indices are a non-empty increasing range with step 1"""
+    return (
+        indices.ndim == 1
+        and len(indices) > 0
+        and indices[-1] - indices[0] == len(indices) - 1
+        and bool(np.all(np.diff(indices) == 1))
+    )
+
+
+@dataclass(frozen=True)
+class TrajectoryEncoding:
+    """Compact encoding of a trajectory as configuration, seed, and actions
+
+    Environments are deterministic given their seed, so a trajectory is fully
+    determined by the environment configuration (identified by its hash, see
+    :py:func:`~gym_gridverse.envs.yaml.factory.hash_yaml`), the seed, and the
+    sequence of actions;  the states are rebuilt by
+    :py:class:`TrajectoryReplayer`.
+
+    Stochastic observation functions (e.g. ``stochastic_raytracing``) consume
+    the same rng as the transition function, so the trajectory also records
+    whether an observation was generated after every reset and step.
+    """
+
+    config_hash: str
+    seed: int
+    actions: np.ndarray
+    observe: bool = True
+
+    _HEADER = struct.Struct('<32sq?')
+
+    def __post_init__(self):
+        if len(bytes.fromhex(self.config_hash)) != 32:
+            raise ValueError('config_hash must be a sha256 hex digest')
+
+        if self.actions.dtype != np.uint8 or self.actions.ndim != 1:
+            raise ValueError('actions must be a 1D uint8 array')
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def to_bytes(self) -> bytes:
+        header = self._HEADER.pack(
+            bytes.fromhex(self.config_hash), self.seed, self.observe
+        )
+        return header + self.actions.tobytes()
+
+    @classmethod
+    def from_bytes(cls, buffer: bytes) -> 'TrajectoryEncoding':
+        digest, seed, observe = cls._HEADER.unpack_from(buffer)
+        actions = np.frombuffer(
+            buffer, dtype=np.uint8, offset=cls._HEADER.size
+        ).copy()
+        return cls(digest.hex(), seed, actions, observe)
+
+
+class TrajectoryRecorder:
+    """Steps an environment while recording a :py:class:`TrajectoryEncoding`
+
+    The recorder seeds and resets the environment itself;  the environment
+    should then only be advanced through :py:meth:`step`.
+    """
+
+    def __init__(
+        self,
+        env: InnerEnv,
+        config_hash: str,
+        seed: int,
+        *,
+        observe: bool = True,
+    ):
+        self.env = env
+        self.config_hash = config_hash
+        self.seed = seed
+        self.observe = observe
+        self.actions: List[Action] = []
+
+        env.set_seed(seed)
+        env.reset()
+        if observe:
+            env.observation  # pylint: disable=pointless-statement
+
+    def step(self, action: Action) -> Tuple[float, bool]:
+        reward, done = self.env.step(action)
+        if self.observe:
+            self.env.observation  # pylint: disable=pointless-statement
+
+        self.actions.append(action)
+        return reward, done
+
+    def encoding(self) -> TrajectoryEncoding:
+        actions = np.array([a.value for a in self.actions], dtype=np.uint8)
+        return TrajectoryEncoding(
+            self.config_hash, self.seed, actions, self.observe
+        )
+
+
+class TrajectoryReplayer:
+    """Rebuilds the states of a trajectory by re-simulation
+
+    Every ``checkpoint_interval`` steps, the replayer stores a copy of the
+    state, of the observation and of the environment rng, so that any state is
+    rebuilt in at most ``checkpoint_interval`` steps.  Checkpoints are created
+    lazily, as states are requested.
+
+    If the environment was made from a spec compiled from a yaml file, its
+    content hash must match the recorded configuration hash.
+
+    Args:
+        env (GridWorld): environment built from the same configuration as the
+            recorded one;  the replayer takes over its seed and state
+        encoding (TrajectoryEncoding): trajectory to replay
+        checkpoint_interval (int): number of steps between checkpoints
+    """
+
+    def __init__(
+        self,
+        env: GridWorld,
+        encoding: TrajectoryEncoding,
+        *,
+        checkpoint_interval: int = 100,
+    ):
+        if checkpoint_interval < 1:
+            raise ValueError('checkpoint_interval must be positive')
+
+        # the configuration hash is only known for specs compiled from files
+        content_hash = None if env.spec is None else env.spec.content_hash
+        if content_hash is not None and content_hash != encoding.config_hash:
+            raise ValueError(
+                f'env configuration ({content_hash}) differs from the '
+                f'recorded one ({encoding.config_hash})'
+            )
+
+        self.env = env
+        self.encoding = encoding
+        self.checkpoint_interval = checkpoint_interval
+
+        env.set_seed(encoding.seed)
+        env.reset()
+        self._observe()
+
+        # the rng is part of the simulation state, and must be restored
+        # together with the environment state;  the observation was drawn
+        # from the rng before the checkpoint, and must be restored rather than
+        # drawn again
+        self._checkpoints: Dict[
+            int, Tuple[State, Optional[Observation], rnd.Generator]
+        ] = {}
+        self._t = 0
+        self._checkpoint()
+
+    def __len__(self) -> int:
+        """number of states in the trajectory"""
+        return len(self.encoding) + 1
+
+    def _observe(self):
+        if self.encoding.observe:
+            self.env.observation  # pylint: disable=pointless-statement
+
+    def _checkpoint(self):
+        # pylint: disable=protected-access
+        self._checkpoints[self._t] = (
+            copy.deepcopy(self.env.state),
+            copy.deepcopy(self.env._observation),
+            copy.deepcopy(self.env._rng),
+        )
+
+    def _restore(self, t: int):
+        state, observation, rng = self._checkpoints[t]
+        # pylint: disable=protected-access
+        self.env._state = copy.deepcopy(state)
+        self.env._observation = copy.deepcopy(observation)
+        self.env._rng = copy.deepcopy(rng)
+        self._t = t
+
+    def state(self, t: int) -> State:
+        """returns the state after the first t actions"""
+        if not 0 <= t < len(self):
+            raise IndexError(f'step {t} out of range')
+
+        checkpoint = max(k for k in self._checkpoints if k <= t)
+        if not checkpoint <= self._t <= t:
+            self._restore(checkpoint)
+
+        while self._t < t:
+            action = Action(self.encoding.actions[self._t])
+            self.env.step(action)
+            self._observe()
+            self._t += 1
+            if self._t % self.checkpoint_interval == 0:
+                self._checkpoint()
+
+        return self.env.state
+
+    def states(self) -> Iterator[State]:
+        """iterates over all the states of the trajectory"""
+        return (self.state(t) for t in range(len(self)))
+
+
 class HUD_Info(TypedDict):
     action: Optional[Action]
     reward: Optional[float]
@@ -85,14 +867,46 @@ class HUD_Info(TypedDict):
     done: Optional[bool]
 
 
-def generate_images(data: Data[RecordingElement]) -> Iterator[np.ndarray]:
-    """Generate images associated with the input data"""
+def generate_images(
+    data: Union[Data[RecordingElement], DataReader[RecordingElement]],
+    *,
+    headless: bool = False,
+    tile_size: int = 32,
+) -> Iterator[np.ndarray]:
+    """Generate images associated with the input data
+
+    The input data can also be a :py:class:`DataReader`, in which case the
+    elements are decoded and rendered lazily.
 
-    if data.is_image_data:
-        yield from data.elements
+    Args:
+        data: states or observations (or images, returned as-is)
+        headless (bool): if True, render with the pure NumPy
+            :py:class:`~gym_gridverse.headless_rendering.HeadlessRenderer`,
+            which requires no display and has no HUD
+        tile_size (int): tile side in pixels (headless only)
+    """
+
+    steps = _data_steps(data)
+    element0, _, _ = next(steps)
+
+    if isinstance(element0, np.ndarray):
+        yield element0
+        yield from (element for element, _, _ in steps)
+        return
+
+    if headless:
+        renderer = HeadlessRenderer(tile_size=tile_size)
+        yield renderer.render(element0)
+        yield from (renderer.render(element) for element, _, _ in steps)
         return
 
-    shape = data.elements[0].grid.shape
+    # only import rendering if actually rendering (avoid importing when
+    # using library remotely using ssh on a display-less environment)
+    from gym_gridverse.rendering import (  # pylint: disable=import-outside-toplevel
+        GridVerseViewer,
+    )
+
+    shape = element0.grid.shape
     viewer = GridVerseViewer(shape)
 
     hud_info: HUD_Info = {
@@ -102,13 +916,11 @@ def generate_images(data: Data[RecordingElement]) -> Iterator[np.ndarray]:
         'done': None,
     }
 
-    yield viewer.render(data.elements[0], return_rgb_array=True, **hud_info)
+    yield viewer.render(element0, return_rgb_array=True, **hud_info)
 
     return_computer = make_return_computer(data.discount)
 
-    for _, is_last, (element, action, reward) in mitt.mark_ends(
-        zip(data.elements[1:], data.actions, data.rewards)
-    ):
+    for _, is_last, (element, action, reward) in mitt.mark_ends(steps):
         hud_info = {
             'action': action,
             'reward': reward,
@@ -160,6 +972,9 @@ def record_images(
 ):
     """Create image files from input images"""
 
+    # only import imageio if actually recording (not needed to render)
+    import imageio  # pylint: disable=import-outside-toplevel
+
     for filename, image in zip(filenames, images):
         print(f'creating {filename}')
         try:
@@ -180,6 +995,9 @@ def record_gif(
 ):
     """Create a gif file from input images"""
 
+    # only import imageio if actually recording (not needed to render)
+    import imageio  # pylint: disable=import-outside-toplevel
+
     kwargs = {
         'format': 'gif',
         'subrectangles': True,
@@ -208,6 +1026,9 @@ def record_mp4(
 ):
     """Create an mp4 file from input images"""
 
+    # only import imageio if actually recording (not needed to render)
+    import imageio  # pylint: disable=import-outside-toplevel
+
     kwargs = {
         'format': 'mp4',
         'fps': fps,
@@ -222,3 +1043,192 @@ def record_mp4(
     except FileNotFoundError:
         os.makedirs(os.path.dirname(filename), exist_ok=True)
         imageio.mimwrite(filename, images, **kwargs)
+
+
+@dataclass(frozen=True)
+class RecordingJob(Generic[RecordingElement]):
+    """A recording to be produced by :py:func:`record_parallel`
+
+    Args:
+        mode (str): 'images', 'gif', or 'mp4' (see :py:func:`record`)
+        data (Data[RecordingElement]): states or observations to render
+        filename (Optional[str]): output filename ('gif' and 'mp4' modes)
+        filenames (Optional[Sequence[str]]): output filenames ('images' mode)
+        kwargs (Dict): additional arguments to :py:func:`record`
+    """
+
+    mode: str
+    data: Data[RecordingElement]
+    filename: Optional[str] = None
+    filenames: Optional[Sequence[str]] = None
+    kwargs: Dict = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class RecordingStats:
+    """Throughput of :py:func:`record_parallel`"""
+
+    num_recordings: int
+    num_frames: int
+    seconds: float
+
+    @property
+    def frames_per_second(self) -> float:
+        return self.num_frames / self.seconds if self.seconds > 0 else math.inf
+
+
+# a frame to render:  grid (type, state, color) indices, agent (y, x), and
+# agent orientation value;  cheap to pickle, unlike State or Observation
+_FrameSpec = Tuple[np.ndarray, Tuple[int, int], int]
+
+
+def _frame_spec(element: Union[State, Observation]) -> _FrameSpec:
+    agent = element.agent
+    return (
+        grid_indices(element.grid).astype(np.uint8),
+        (agent.position.y, agent.position.x),
+        agent.orientation.value,
+    )
+
+
+def _render_frame_specs(
+    args: Tuple[Sequence[_FrameSpec], int]
+) -> List[np.ndarray]:
+    """renders a chunk of frames;  module-level function to be picklable"""
+    frame_specs, tile_size = args
+    return [
+        compose_frame(
+            indices.astype(np.int64),
+            position,
+            Orientation(orientation),
+            tile_size=tile_size,
+        )
+        for indices, position, orientation in frame_specs
+    ]
+
+
+def record_parallel(
+    jobs: Iterable[RecordingJob],
+    *,
+    processes: Optional[int] = None,
+    tile_size: int = 32,
+    chunk_size: int = 16,
+    queue_size: int = 4,
+    encoders: int = 1,
+) -> RecordingStats:
+    """Renders and encodes many recordings concurrently
+
+    Frames are rendered by the
+    :py:mod:`~gym_gridverse.headless_rendering` renderer (i.e., without HUD)
+    across a pool of processes, in chunks of consecutive frames.  Rendered
+    recordings are handed to a separate encoding thread through a bounded
+    queue, so that rendering proceeds while previous recordings are encoded,
+    and at most ``queue_size`` rendered recordings wait in memory.
+
+    Jobs are consumed lazily, and only a few chunks per process are rendered
+    ahead, so that memory stays bounded when ``jobs`` is a generator.
+
+    Args:
+        jobs (Iterable[RecordingJob]): recordings to produce
+        processes (Optional[int]): number of rendering processes;  0 renders
+            in the calling process, None uses all CPUs
+        tile_size (int): tile side in pixels
+        chunk_size (int): number of frames rendered per task
+        queue_size (int): maximum number of rendered recordings waiting to
+            be encoded
+        encoders (int): number of encoding threads
+
+    Returns:
+        RecordingStats: number of recordings and frames, and total time
+    """
+
+    start = time.perf_counter()
+
+    def tasks():
+        for job in jobs:
+            chunks = list(
+                mitt.chunked(map(_frame_spec, job.data.elements), chunk_size)
+            )
+            for i, chunk in enumerate(chunks):
+                yield job, i == len(chunks) - 1, (chunk, tile_size)
+
+    encoding_queue: 'queue.Queue[Optional[Tuple[RecordingJob, List[np.ndarray]]]]'
+    encoding_queue = queue.Queue(maxsize=queue_size)
+    encoding_errors: List[BaseException] = []
+
+    def encode():
+        while True:
+            item = encoding_queue.get()
+            if item is None:
+                return
+
+            job, images = item
+            try:
+                record(
+                    job.mode,
+                    images,
+                    filename=job.filename,
+                    filenames=job.filenames,
+                    **job.kwargs,
+                )
+            except BaseException as e:  # pylint: disable=broad-except
+                encoding_errors.append(e)
+
+    encoder_threads = [
+        threading.Thread(target=encode, daemon=True) for _ in range(encoders)
+    ]
+    for encoder in encoder_threads:
+        encoder.start()
+
+    pool = multiprocessing.Pool(processes) if processes != 0 else None
+    # chunks rendered ahead of the one being collected
+    max_pending = (
+        2 * (processes or os.cpu_count() or 1) if pool is not None else 0
+    )
+
+    num_recordings = 0
+    num_frames = 0
+    images: List[np.ndarray] = []
+
+    def collect(job, last, result):
+        nonlocal num_recordings, num_frames, images
+        frames = result.get() if pool is not None else result
+        images.extend(frames)
+        num_frames += len(frames)
+
+        if last:
+            # blocks while the encoder is behind
+            encoding_queue.put((job, images))
+            num_recordings += 1
+            images = []
+
+    try:
+        pending: 'deque[Tuple[RecordingJob, bool, object]]' = deque()
+        for job, last, args in tasks():
+            result = (
+                pool.apply_async(_render_frame_specs, (args,))
+                if pool is not None
+                else _render_frame_specs(args)
+            )
+            pending.append((job, last, result))
+            while len(pending) > max_pending:
+                collect(*pending.popleft())
+
+        while pending:
+            collect(*pending.popleft())
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+        for encoder in encoder_threads:
+            encoding_queue.put(None)
+        for encoder in encoder_threads:
+            encoder.join()
+
+    if encoding_errors:
+        raise encoding_errors[0]
+
+    return RecordingStats(
+        num_recordings, num_frames, time.perf_counter() - start
+    )
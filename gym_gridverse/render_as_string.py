@@ -3,7 +3,7 @@
 * Assumes grid objects can be represented with a single char string
 """
 
-from typing import List
+from typing import List, Optional, Sequence, Union
 
 from termcolor import colored
 
@@ -84,3 +84,125 @@ def str_render_obs(observation: Observation) -> str:
         + "\nAgent holding: "
         + str_render_object(observation.agent.obj)
     )
+
+
+Cells = List[List[str]]
+"""Rows of cells, each of which displays as a single character"""
+
+
+def str_render_cells(state_or_observation: Union[State, Observation]) -> Cells:
+    """Renders the grid and agent, followed by the held object, as cells"""
+    cells = str_render_grid(state_or_observation.grid)
+
+    agent = state_or_observation.agent
+    y, x = agent.position.astuple()
+    cells[y][x] = str_render_agent(agent.orientation)
+
+    holding = [*"holding: ", str_render_object(agent.obj)]
+    width = max(len(cells[0]), len(holding))
+    cells.append(holding)
+    return [row + [" "] * (width - len(row)) for row in cells]
+
+
+def _cursor_to(row: int, col: int) -> str:
+    """ANSI cursor movement to (0-based) row and column"""
+    return f"\x1b[{row + 1};{col + 1}H"
+
+
+class TerminalRenderer:
+    """Incremental ANSI renderer of states and observations
+
+    Keeps the previously rendered frame, so that each call only emits cursor
+    movements and characters for the cells which changed.  The first frame (or
+    any frame with a different layout) is drawn in full, after clearing the
+    screen.
+
+    Elements are laid out in rows of panels, e.g. ``[[state, observation]]``
+    for a side-by-side view of a single environment, or one such row per
+    environment.  The cursor is left below the frame, and everything below is
+    cleared, so that other text can be printed after each frame.
+
+    Args:
+        gap (int): number of columns between panels, and rows between rows of
+            panels
+    """
+
+    def __init__(self, *, gap: int = 2):
+        self.gap = gap
+        self._frame: Optional[Cells] = None
+
+    def reset(self):
+        """forces the next frame to be drawn in full"""
+        self._frame = None
+
+    def layout(
+        self, panels: Sequence[Sequence[Union[State, Observation]]]
+    ) -> Cells:
+        """composes rows of panels into a single frame of cells"""
+        frame: Cells = []
+        for i, row_panels in enumerate(panels):
+            if i > 0:
+                frame.extend([] for _ in range(self.gap))
+
+            blocks = [str_render_cells(panel) for panel in row_panels]
+            height = max(len(block) for block in blocks)
+            for r in range(height):
+                row: List[str] = []
+                for j, block in enumerate(blocks):
+                    if j > 0:
+                        row.extend(" " * self.gap)
+
+                    width = len(block[0])
+                    row.extend(block[r] if r < len(block) else " " * width)
+
+                frame.append(row)
+
+        # pad rows to the same width, so that shorter rows overwrite longer ones
+        width = max(len(row) for row in frame)
+        return [row + [" "] * (width - len(row)) for row in frame]
+
+    def render(
+        self, panels: Sequence[Sequence[Union[State, Observation]]]
+    ) -> str:
+        """returns the ANSI string which updates the terminal to the new frame
+
+        Args:
+            panels (Sequence[Sequence[Union[State, Observation]]]): rows of
+                states and/or observations
+
+        Returns:
+            str: string to be written to the terminal as-is
+        """
+        frame = self.layout(panels)
+        previous = self._frame
+        self._frame = frame
+
+        same_layout = (
+            previous is not None
+            and len(previous) == len(frame)
+            and len(previous[0]) == len(frame[0])
+        )
+
+        parts: List[str] = []
+        if not same_layout:
+            parts.append("\x1b[2J")
+            for r, row in enumerate(frame):
+                parts.append(_cursor_to(r, 0) + "".join(row))
+        else:
+            assert previous is not None  # forces typing
+            for r, (row, previous_row) in enumerate(zip(frame, previous)):
+                c = 0
+                while c < len(row):
+                    if row[c] == previous_row[c]:
+                        c += 1
+                        continue
+
+                    # group consecutive changed cells under a single move
+                    start = c
+                    while c < len(row) and row[c] != previous_row[c]:
+                        c += 1
+
+                    parts.append(_cursor_to(r, start) + "".join(row[start:c]))
+
+        parts.append(_cursor_to(len(frame), 0) + "\x1b[J")
+        return "".join(parts)
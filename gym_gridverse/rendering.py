@@ -2,26 +2,36 @@ from __future__ import annotations
 
 import math
 from functools import partial
-from typing import Optional, Sequence, Tuple, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pyglet
 from gym.envs.classic_control import rendering
-from pyglet.gl import glClearColor
+from pyglet.gl import (
+    GL_COMPILE,
+    glCallList,
+    glClearColor,
+    glDeleteLists,
+    glEndList,
+    glGenLists,
+    glNewList,
+)
 
 from gym_gridverse.action import Action
-from gym_gridverse.geometry import Orientation, Position, Shape
+from gym_gridverse.geometry import Position, Shape
+from gym_gridverse.grid import Grid
 from gym_gridverse.grid_object import (
     Color,
     Door,
-    Floor,
     Goal,
+    GridObject,
     Hidden,
     Key,
     MovingObstacle,
     Telepod,
     Wall,
 )
+from gym_gridverse.headless_rendering import grid_indices
 from gym_gridverse.observation import Observation
 from gym_gridverse.state import State
 
@@ -38,6 +48,58 @@ class Group(rendering.Geom):
             geom.render()
 
 
+class Placed(rendering.Geom):
+    """draws a shared geom with its own transforms
+
+    Allows geoms to be built once and drawn at multiple positions, since
+    transforms added to a geom would otherwise affect all its uses.
+    """
+
+    def __init__(
+        self, geom: rendering.Geom, transforms: Sequence[rendering.Transform]
+    ):
+        super().__init__()
+        self.geom = geom
+        for transform in transforms:
+            self.add_attr(transform)
+
+    def render1(self):
+        self.geom.render()
+
+
+class DisplayList(rendering.Geom):
+    """geoms compiled into an OpenGL display list (retained mode)
+
+    The list is compiled the first time it is rendered (i.e., when the window's
+    GL context is current), and then redrawn by a single call until the geoms
+    are replaced by :py:meth:`set_geoms`.
+    """
+
+    def __init__(self, geoms: Sequence[rendering.Geom] = ()):
+        super().__init__()
+        self._geoms = list(geoms)
+        self._list_id: Optional[int] = None
+
+    def set_geoms(self, geoms: Sequence[rendering.Geom]):
+        self._geoms = list(geoms)
+        self.invalidate()
+
+    def invalidate(self):
+        if self._list_id is not None:
+            glDeleteLists(self._list_id, 1)
+            self._list_id = None
+
+    def render1(self):
+        if self._list_id is None:
+            self._list_id = glGenLists(1)
+            glNewList(self._list_id, GL_COMPILE)
+            for geom in self._geoms:
+                geom.render()
+            glEndList()
+
+        glCallList(self._list_id)
+
+
 def make_grid(  # pylint: disable=too-many-locals
     start: Tuple[float, float],
     end: Tuple[float, float],
@@ -396,6 +458,41 @@ def make_telepod(telepod: Telepod) -> rendering.Geom:
     return Group([geom_circle, geom_boundary, geom_spiral])
 
 
+def make_object(obj: GridObject) -> Optional[rendering.Geom]:
+    """returns the geom of a grid object, or None if it is not drawn"""
+
+    if isinstance(obj, Hidden):
+        return make_hidden(obj)
+
+    if isinstance(obj, Wall):
+        return make_wall(obj)
+
+    if isinstance(obj, Key):
+        return make_key(obj)
+
+    if isinstance(obj, Door):
+        return make_door(obj)
+
+    if isinstance(obj, Goal):
+        return make_goal(obj)
+
+    if isinstance(obj, MovingObstacle):
+        return make_moving_obstacle(obj)
+
+    if isinstance(obj, Telepod):
+        return make_telepod(obj)
+
+    return None
+
+
+# identifies the appearance of an object:  type, state, and color
+ObjectKey = Tuple[int, int, Color]
+
+
+def object_key(obj: GridObject) -> ObjectKey:
+    return obj.type_index, obj.state_index, obj.color
+
+
 def convert_pos(
     position: Position,
     *,
@@ -478,11 +575,29 @@ class GridVerseViewer:
         background = make_grid_background()
         self._viewer.add_geom(background)
 
-        self._grid = make_grid(
-            (0.0, 0.0),
-            (1.0, 1.0),
-            shape.height,
-            shape.width,
+        # retained-mode scene:  geoms are built once per object key and
+        # placed once per cell;  each row is compiled into its own layer, which
+        # is recompiled only when one of its cells changes
+        self._object_geoms: Dict[ObjectKey, Optional[rendering.Geom]] = {}
+        self._placed_geoms: Dict[Tuple[Position, ObjectKey], Placed] = {}
+        self._indices: Optional[np.ndarray] = None
+        self._cell_geoms: List[List[Optional[Placed]]] = [
+            [None] * shape.width for _ in range(shape.height)
+        ]
+        self._row_layers = [DisplayList() for _ in range(shape.height)]
+        self._grid_layer = DisplayList(
+            [make_grid((0.0, 0.0), (1.0, 1.0), shape.height, shape.width)]
+        )
+
+        self._agent_rotation = rendering.Transform()
+        self._agent_translation = rendering.Transform()
+        self._agent = Placed(
+            make_agent(),
+            [
+                self._agent_rotation,
+                self._agent_translation,
+                *self._viewer_transforms,
+            ],
         )
 
         self._draw_hud = True
@@ -553,63 +668,69 @@ class GridVerseViewer:
         return_rgb_array: bool = False,
     ):
         self._update_hud(action=action, reward=reward, ret=ret, done=done)
+        self._update_layers(state_or_observation.grid)
 
-        for position in state_or_observation.grid.positions():
-            obj = state_or_observation.grid[position]
-            if isinstance(obj, Floor):
-                pass
-
-            if isinstance(obj, Hidden):
-                geom = make_hidden(obj)
-                self._draw_geom_onetime(geom, position)
-
-            if isinstance(obj, Wall):
-                geom = make_wall(obj)
-                self._draw_geom_onetime(geom, position)
-
-            if isinstance(obj, Key):
-                geom = make_key(obj)
-                self._draw_geom_onetime(geom, position)
-
-            if isinstance(obj, Door):
-                geom = make_door(obj)
-                self._draw_geom_onetime(geom, position)
-
-            if isinstance(obj, Goal):
-                geom = make_goal(obj)
-                self._draw_geom_onetime(geom, position)
-
-            if isinstance(obj, MovingObstacle):
-                geom = make_moving_obstacle(obj)
-                self._draw_geom_onetime(geom, position)
-
-            if isinstance(obj, Telepod):
-                geom = make_telepod(obj)
-                self._draw_geom_onetime(geom, position)
-
-        geom = make_agent()
-        self._draw_geom_onetime(
-            geom,
-            state_or_observation.agent.position,
-            state_or_observation.agent.orientation,
+        agent = state_or_observation.agent
+        self._agent_rotation.set_rotation(agent.orientation.as_radians())
+        self._agent_translation.set_translation(
+            *self._pos_converter(agent.position)
         )
 
-        self._viewer.add_onetime(self._grid)
+        for layer in self._row_layers:
+            self._viewer.add_onetime(layer)
+        self._viewer.add_onetime(self._agent)
+        self._viewer.add_onetime(self._grid_layer)
         other_drawables = [self._hud_layout] if self._draw_hud else []
         return self._viewer.render(
             return_rgb_array=return_rgb_array, other_drawables=other_drawables
         )
 
-    def _draw_geom_onetime(
-        self,
-        geom: rendering.Geom,
-        position: Position,
-        orientation: Orientation = Orientation.N,
-    ):
-        geom.add_attr(rendering.Transform(rotation=orientation.as_radians()))
-        geom.add_attr(
-            rendering.Transform(translation=self._pos_converter(position))
+    def _update_layers(self, grid: Grid):
+        """updates the geoms of the cells which changed since the last frame,
+        and recompiles the layers of their rows"""
+        indices = grid_indices(grid)
+        changed = (
+            np.ones(indices.shape[:2], dtype=bool)
+            if self._indices is None
+            else (indices != self._indices).any(axis=-1)
+        )
+        self._indices = indices
+
+        rows = set()
+        for y, x in zip(*changed.nonzero()):
+            position = Position(int(y), int(x))
+            self._cell_geoms[y][x] = self._placed_geom(position, grid[position])
+            rows.add(y)
+
+        for y in rows:
+            self._row_layers[y].set_geoms(
+                [geom for geom in self._cell_geoms[y] if geom is not None]
+            )
+
+    def _placed_geom(
+        self, position: Position, obj: GridObject
+    ) -> Optional[Placed]:
+        """returns the cached geom of the object, placed at the position"""
+        key = object_key(obj)
+
+        try:
+            return self._placed_geoms[position, key]
+        except KeyError:
+            pass
+
+        try:
+            geom = self._object_geoms[key]
+        except KeyError:
+            geom = self._object_geoms[key] = make_object(obj)
+
+        if geom is None:
+            return None
+
+        transforms = [
+            rendering.Transform(translation=self._pos_converter(position)),
+            *self._viewer_transforms,
+        ]
+        placed_geom = self._placed_geoms[position, key] = Placed(
+            geom, transforms
         )
-        for transform in self._viewer_transforms:
-            geom.add_attr(transform)
-        self._viewer.add_onetime(geom)
+        return placed_geom
@@ -1,7 +1,16 @@
-from typing import Dict
+import functools
+from typing import Dict, Sequence
 
 import numpy as np
 
+from gym_gridverse.geometry import Orientation
+from gym_gridverse.grid_object import GridObject
+from gym_gridverse.headless_rendering import (
+    BLUE,
+    agent_masks,
+    grid_indices,
+    tile_atlas,
+)
 from gym_gridverse.observation import Observation
 from gym_gridverse.representations.representation import (
     ObservationRepresentation,
@@ -110,6 +119,155 @@ class CompactObservationRepresentation(ObservationRepresentation):
     """
 
 
+@functools.lru_cache(maxsize=None)
+def _pixel_atlas(
+    tile_size: int, grayscale: bool, downsample: int, num_object_types: int
+) -> np.ndarray:
+    """tile atlas with an additional leading axis for the agent's presence
+
+    Indexed by [agent, type index, state index, color value, row, column,
+    channel];  the tiles are post-processed (grayscale and downsampling) once,
+    rather than each frame.
+    """
+    atlas = tile_atlas(tile_size)
+    assert atlas.shape[0] == num_object_types
+
+    # blend the north-facing agent into every tile, as in `compose_frame`
+    alpha = agent_masks(tile_size)[Orientation.N.value, ..., np.newaxis]
+    agent_atlas = np.round(
+        (1 - alpha) * atlas + alpha * np.array(BLUE) * 255
+    ).astype(np.uint8)
+
+    pixel_atlas = np.stack([atlas, agent_atlas]).astype(float)
+
+    if grayscale:
+        pixel_atlas = pixel_atlas @ np.array([[0.299], [0.587], [0.114]])
+
+    if downsample > 1:
+        *batch_shape, _, _, num_channels = pixel_atlas.shape
+        size = tile_size // downsample
+        pixel_atlas = pixel_atlas.reshape(
+            *batch_shape, size, downsample, size, downsample, num_channels
+        ).mean(axis=(-4, -2))
+
+    pixel_atlas = np.round(pixel_atlas).astype(np.uint8)
+    pixel_atlas.flags.writeable = False
+    return pixel_atlas
+
+
+class PixelObservationRepresentation(ObservationRepresentation):
+    """Renders the observation as an image, e.g. for convolutional agents
+
+    Frames are composed from a tile atlas which is rasterized and
+    post-processed once per configuration (see
+    :py:mod:`gym_gridverse.headless_rendering`), so that each conversion is a
+    single fancy-indexing operation.  The object held by the agent is not
+    visible in the image, and is returned as indices like in
+    :py:class:`DefaultObservationRepresentation`.
+
+    Args:
+        observation_space (ObservationSpace): observation space
+        tile_size (int): tile side in pixels, before downsampling
+        grayscale (bool): if True, the image has a single channel
+        downsample (int): factor by which the tiles are downsampled;  must
+            divide tile_size
+    """
+
+    def __init__(
+        self,
+        observation_space: ObservationSpace,
+        *,
+        tile_size: int = 8,
+        grayscale: bool = False,
+        downsample: int = 1,
+    ):
+        if tile_size % downsample != 0:
+            raise ValueError(
+                f'downsample ({downsample}) must divide tile_size ({tile_size})'
+            )
+
+        self.observation_space = observation_space
+        self.tile_size = tile_size
+        self.grayscale = grayscale
+        self.downsample = downsample
+
+    @property
+    def _atlas(self) -> np.ndarray:
+        return _pixel_atlas(
+            self.tile_size,
+            self.grayscale,
+            self.downsample,
+            len(GridObject.object_types),
+        )
+
+    @property
+    def space(self) -> Dict[str, np.ndarray]:
+        size = self.tile_size // self.downsample
+        num_channels = 1 if self.grayscale else 3
+        grid_shape = self.observation_space.grid_shape
+
+        return {
+            'grid': np.full(
+                (
+                    grid_shape.height * size,
+                    grid_shape.width * size,
+                    num_channels,
+                ),
+                255,
+            ),
+            'agent': np.array(
+                [
+                    self.observation_space.max_grid_object_type,
+                    self.observation_space.max_grid_object_status,
+                    self.observation_space.max_object_color,
+                ]
+            ),
+        }
+
+    def convert(self, o: Observation) -> Dict[str, np.ndarray]:
+        conversion = self.convert_batch([o])
+        return {k: v[0] for k, v in conversion.items()}
+
+    def convert_batch(
+        self, observations: Sequence[Observation]
+    ) -> Dict[str, np.ndarray]:
+        """converts a batch of observations, e.g. from vectorized envs
+
+        Returns:
+            Dict[str, np.ndarray]: same as :py:meth:`convert`, with an
+                additional leading batch axis
+        """
+        for o in observations:
+            if not self.observation_space.contains(o):
+                raise ValueError('Input observation not contained in space')
+
+        indices = np.stack([grid_indices(o.grid) for o in observations])
+        agent = np.zeros(indices.shape[:-1], dtype=np.int64)
+        for b, o in enumerate(observations):
+            agent[(b, *o.agent.position.astuple())] = 1
+
+        tiles = self._atlas[
+            agent, indices[..., 0], indices[..., 1], indices[..., 2]
+        ]
+        batch_size, height, width, size, _, num_channels = tiles.shape
+        grid = tiles.transpose(0, 1, 3, 2, 4, 5).reshape(
+            batch_size, height * size, width * size, num_channels
+        )
+
+        agent_obj = np.array(
+            [
+                [
+                    o.agent.obj.type_index,
+                    o.agent.obj.state_index,
+                    o.agent.obj.color.value,
+                ]
+                for o in observations
+            ]
+        ).reshape(len(observations), 3)
+
+        return {'grid': grid, 'agent': agent_obj}
+
+
 def create_observation_representation(
     name: str, observation_space: ObservationSpace
 ) -> ObservationRepresentation:
@@ -128,4 +286,7 @@ def create_observation_representation(
     if name == 'compact':
         raise NotImplementedError
 
+    if name == 'pixels':
+        return PixelObservationRepresentation(observation_space)
+
     raise ValueError(f'invalid name {name}')
@@ -0,0 +1,332 @@
+"""Batched random rollouts from a state, e.g. for Monte-Carlo tree search
+
+:py:func:`rollouts` estimates the return of a state by many rollouts of a
+random policy::
+
+  result = rollouts(env, state, n=256, horizon=50, discount=0.99)
+  result.returns.mean()
+
+Environments whose transitions only move and rotate the agent (i.e. their
+transition function is :py:func:`~gym_gridverse.envs.transition_functions
+.update_agent`, possibly chained) never change the grid, so that their states
+are fully described by the position and orientation of the agent.  The
+rollouts of such environments are stepped in lockstep, as arrays of
+(position, orientation) indices, through tables of next indices, rewards and
+terminal flags.  Each table entry is computed once, on demand, by the
+environment's own :py:meth:`~gym_gridverse.envs.gridworld.GridWorld
+.functional_step`, and kept by a :py:class:`RolloutEngine` for later calls on
+the same level;  rollouts are thus exactly consistent with the environment,
+as long as its reward and terminating functions are deterministic.
+
+Other environments (e.g. with keys, doors, or moving obstacles), and
+state-dependent policies, fall back to stepping each rollout with
+:py:meth:`~gym_gridverse.envs.gridworld.GridWorld.functional_step`.
+"""
+import hashlib
+import inspect
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, List, Optional, Sequence, Union
+
+import numpy as np
+import numpy.random as rnd
+
+from gym_gridverse.action import Action
+from gym_gridverse.agent import Agent
+from gym_gridverse.encoding import encode_grid, encode_object
+from gym_gridverse.envs import transition_functions as transition_fs
+from gym_gridverse.envs.gridworld import GridWorld
+from gym_gridverse.geometry import Orientation, Position
+from gym_gridverse.rng import get_gv_rng_if_none
+from gym_gridverse.state import State
+
+__all__ = ['RolloutEngine', 'RolloutPolicy', 'RolloutResult', 'rollouts']
+
+RolloutPolicy = Callable[[State, rnd.Generator], Action]
+"""Signature of state-dependent rollout policies"""
+
+_ORIENTATIONS = list(Orientation)
+
+
+@dataclass(frozen=True)
+class RolloutResult:
+    """Outcome of a batch of rollouts
+
+    Args:
+        returns (np.ndarray): (n,) discounted returns
+        lengths (np.ndarray): (n,) number of steps of each rollout
+        terminated (np.ndarray): (n,) True for rollouts which reached a
+            terminal state within the horizon
+        vectorized (bool): True if the rollouts were stepped in lockstep
+    """
+
+    returns: np.ndarray
+    lengths: np.ndarray
+    terminated: np.ndarray
+    vectorized: bool
+
+    @property
+    def mean_return(self) -> float:
+        return float(self.returns.mean())
+
+    @property
+    def termination_rate(self) -> float:
+        return float(self.terminated.mean())
+
+
+class _StaticTables:
+    """Lazily filled transitions of a level, over (position, orientation)"""
+
+    def __init__(self, state: State, num_actions: int):
+        self.grid = state.grid
+        self.obj = state.agent.obj
+
+        num_states = state.grid.height * state.grid.width * len(_ORIENTATIONS)
+        self.next_index = np.full((num_states, num_actions), -1, dtype=np.int64)
+        self.reward = np.zeros((num_states, num_actions))
+        self.done = np.zeros((num_states, num_actions), dtype=bool)
+
+    def index(self, agent: Agent) -> int:
+        position = agent.position
+        cell = position.y * self.grid.width + position.x
+        return cell * len(_ORIENTATIONS) + agent.orientation.value
+
+    def state(self, index: int) -> State:
+        cell, orientation = divmod(index, len(_ORIENTATIONS))
+        y, x = divmod(cell, self.grid.width)
+        agent = Agent(Position(y, x), _ORIENTATIONS[orientation], self.obj)
+        return State(self.grid, agent)
+
+    def fill(
+        self,
+        env: GridWorld,
+        actions: Sequence[Action],
+        indices: np.ndarray,
+        action_indices: np.ndarray,
+    ):
+        """computes the missing entries among the given pairs"""
+        missing = self.next_index[indices, action_indices] < 0
+        if not missing.any():
+            return
+
+        pairs = np.unique(
+            np.stack([indices[missing], action_indices[missing]], axis=1),
+            axis=0,
+        )
+        for index, action_index in pairs.tolist():
+            next_state, reward, done = env.functional_step(
+                self.state(index), actions[action_index]
+            )
+            self.next_index[index, action_index] = self.index(next_state.agent)
+            self.reward[index, action_index] = reward
+            self.done[index, action_index] = done
+
+
+class RolloutEngine:
+    """Rollouts of an environment, with tables kept across calls per level
+
+    Args:
+        env (GridWorld): environment providing the dynamics
+        max_levels (int): maximum number of levels whose tables are kept
+            (least recently used levels are evicted first)
+    """
+
+    def __init__(self, env: GridWorld, *, max_levels: int = 16):
+        self.env = env
+        self.max_levels = max_levels
+        self.actions: List[Action] = list(env.action_space.actions)
+        self.static = _is_static_transition(env._components()[2])
+
+        self._tables: 'OrderedDict[bytes, _StaticTables]' = OrderedDict()
+
+    def rollouts(
+        self,
+        state: State,
+        policy: Optional[Union[Sequence[float], RolloutPolicy]] = None,
+        n: int = 100,
+        horizon: int = 100,
+        *,
+        discount: float = 1.0,
+        rng: Optional[rnd.Generator] = None,
+    ) -> RolloutResult:
+        """Runs rollouts from a state
+
+        Args:
+            state (State): initial state
+            policy (Optional[Union[Sequence[float], RolloutPolicy]]):
+                probabilities of each action (in the order of the action
+                space), uniform by default, or a state-dependent policy
+                (never vectorized)
+            n (int): number of rollouts
+            horizon (int): maximum number of steps of each rollout
+            discount (float): discount factor, as in
+                :py:func:`~gym_gridverse.utils.rl.make_return_computer`
+            rng (Optional[rnd.Generator]): rng of the policy
+
+        Returns:
+            RolloutResult: returns, lengths and terminal flags
+        """
+        rng = get_gv_rng_if_none(rng)
+
+        if callable(policy):
+            return self._python_rollouts(
+                state, policy, n, horizon, discount, rng
+            )
+
+        probabilities = (
+            np.full(len(self.actions), 1 / len(self.actions))
+            if policy is None
+            else np.asarray(policy, dtype=np.float64)
+        )
+        if probabilities.shape != (len(self.actions),):
+            raise ValueError(
+                f'policy should have {len(self.actions)} probabilities'
+            )
+
+        if self.static:
+            return self._vectorized_rollouts(
+                state, probabilities, n, horizon, discount, rng
+            )
+
+        actions = self.actions
+
+        def sampled_policy(_: State, rng: rnd.Generator) -> Action:
+            return actions[rng.choice(len(actions), p=probabilities)]
+
+        return self._python_rollouts(
+            state, sampled_policy, n, horizon, discount, rng
+        )
+
+    def _level_tables(self, state: State) -> _StaticTables:
+        key = hashlib.blake2b(
+            encode_grid(state.grid).tobytes()
+            + bytes(encode_object(state.agent.obj))
+        ).digest()
+
+        try:
+            tables = self._tables[key]
+        except KeyError:
+            tables = self._tables[key] = _StaticTables(state, len(self.actions))
+            if len(self._tables) > self.max_levels:
+                self._tables.popitem(last=False)
+        else:
+            self._tables.move_to_end(key)
+
+        return tables
+
+    def _vectorized_rollouts(  # pylint: disable=too-many-arguments
+        self,
+        state: State,
+        probabilities: np.ndarray,
+        n: int,
+        horizon: int,
+        discount: float,
+        rng: rnd.Generator,
+    ) -> RolloutResult:
+        tables = self._level_tables(state)
+
+        indices = np.full(n, tables.index(state.agent), dtype=np.int64)
+        returns = np.zeros(n)
+        lengths = np.zeros(n, dtype=np.int64)
+        terminated = np.zeros(n, dtype=bool)
+        # indices of the rollouts which are still running
+        active = np.arange(n)
+
+        cumdiscount = 1.0
+        for _ in range(horizon):
+            if len(active) == 0:
+                break
+
+            action_indices = rng.choice(
+                len(self.actions), size=len(active), p=probabilities
+            )
+            current = indices[active]
+            tables.fill(self.env, self.actions, current, action_indices)
+
+            returns[active] += (
+                cumdiscount * tables.reward[current, action_indices]
+            )
+            indices[active] = tables.next_index[current, action_indices]
+            lengths[active] += 1
+            cumdiscount *= discount
+
+            done = tables.done[current, action_indices]
+            terminated[active[done]] = True
+            active = active[~done]
+
+        return RolloutResult(returns, lengths, terminated, vectorized=True)
+
+    def _python_rollouts(  # pylint: disable=too-many-arguments
+        self,
+        state: State,
+        policy: RolloutPolicy,
+        n: int,
+        horizon: int,
+        discount: float,
+        rng: rnd.Generator,
+    ) -> RolloutResult:
+        returns = np.zeros(n)
+        lengths = np.zeros(n, dtype=np.int64)
+        terminated = np.zeros(n, dtype=bool)
+
+        for i in range(n):
+            rollout_state = state
+            cumdiscount = 1.0
+            for _ in range(horizon):
+                action = policy(rollout_state, rng)
+                rollout_state, reward, done = self.env.functional_step(
+                    rollout_state, action
+                )
+                returns[i] += cumdiscount * reward
+                lengths[i] += 1
+                cumdiscount *= discount
+
+                if done:
+                    terminated[i] = True
+                    break
+
+        return RolloutResult(returns, lengths, terminated, vectorized=False)
+
+
+def rollouts(
+    env: GridWorld,
+    state: State,
+    policy: Optional[Union[Sequence[float], RolloutPolicy]] = None,
+    n: int = 100,
+    horizon: int = 100,
+    *,
+    discount: float = 1.0,
+    rng: Optional[rnd.Generator] = None,
+) -> RolloutResult:
+    """Runs rollouts from a state;  see :py:meth:`RolloutEngine.rollouts`
+
+    Repeated calls should share a :py:class:`RolloutEngine` instead, to
+    reuse its tables.
+    """
+    return RolloutEngine(env).rollouts(
+        state, policy, n, horizon, discount=discount, rng=rng
+    )
+
+
+def _is_static_transition(
+    transition_function: transition_fs.TransitionFunction,
+) -> bool:
+    """True if the transition function only moves and rotates the agent"""
+    if isinstance(transition_function, transition_fs.CompiledChain):
+        return all(
+            map(_is_static_transition, transition_function.transition_functions)
+        )
+
+    if isinstance(transition_function, partial):
+        if inspect.unwrap(transition_function.func) is transition_fs.chain:
+            return all(
+                map(
+                    _is_static_transition,
+                    transition_function.keywords['transition_functions'],
+                )
+            )
+
+        return _is_static_transition(transition_function.func)
+
+    return inspect.unwrap(transition_function) is transition_fs.update_agent
@@ -0,0 +1,175 @@
+"""Deep memory footprint of states, observations, recordings and representations
+
+:py:func:`sys.getsizeof` only accounts for the outermost object, e.g. a
+:py:class:`~gym_gridverse.state.State` is reported as a few dozen bytes
+regardless of its grid.  The functions in this module follow references
+instead, counting each object once::
+
+  deep_sizeof(state)  # total bytes
+  memory_breakdown(state, depth=2)  # {'State': ..., 'State.grid._grid': ...}
+
+Objects which are shared by design rather than owned (classes, functions,
+modules, small integers, and enum members such as colors and orientations) are
+not counted, and neither are the (typically interned) string keys of
+dictionaries and instance attributes.
+"""
+import enum
+import sys
+import types
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, Optional, Set, Tuple
+
+import numpy as np
+
+__all__ = ['deep_sizeof', 'memory_breakdown']
+
+_SHARED_TYPES = (
+    type,
+    types.ModuleType,
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    enum.Enum,
+)
+
+
+def deep_sizeof(obj: Any, *, seen: Optional[Set[int]] = None) -> int:
+    """Returns the number of bytes of an object and everything it references
+
+    Args:
+        obj (Any): object to measure
+        seen (Optional[Set[int]]): ids of objects which were already counted,
+            e.g. to measure the marginal footprint of an object;  updated
+            in place
+
+    Returns:
+        int: total bytes
+    """
+    if seen is None:
+        seen = set()
+
+    total = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if _is_shared(obj) or id(obj) in seen:
+            continue
+
+        seen.add(id(obj))
+        total += _own_sizeof(obj, seen)
+        stack.extend(child for _, child in _children(obj))
+
+    return total
+
+
+def memory_breakdown(obj: Any, *, depth: int = 1) -> Dict[str, int]:
+    """Returns the deep size of an object, broken down by component
+
+    Components are named by their path from the object, e.g.
+    `State.grid._grid` for the grid array of a state, `Data.elements[*]` for
+    all elements of a recording, and `[grid]` for a representation entry.  The
+    path of the object itself holds its own overhead, so that the values add
+    up to :py:func:`deep_sizeof`;  objects referenced from multiple components
+    are attributed to the first one.
+
+    Args:
+        obj (Any): object to measure
+        depth (int): depth of the breakdown
+
+    Returns:
+        Dict[str, int]: bytes per component
+    """
+    root = '' if isinstance(obj, (dict, list, tuple)) else type(obj).__name__
+    breakdown: Dict[str, int] = {}
+    seen: Set[int] = set()
+
+    queue: Deque[Tuple[str, Any, int]] = deque([(root, obj, depth)])
+    while queue:
+        path, obj, depth = queue.popleft()
+        if _is_shared(obj) or id(obj) in seen:
+            continue
+
+        if depth == 0:
+            size = deep_sizeof(obj, seen=seen)
+        else:
+            seen.add(id(obj))
+            size = _own_sizeof(obj, seen)
+            queue.extend(
+                (f'{path}{name}', child, depth - 1)
+                for name, child in _children(obj)
+            )
+
+        breakdown[path] = breakdown.get(path, 0) + size
+
+    return breakdown
+
+
+def _is_shared(obj: Any) -> bool:
+    # small integers (and booleans) are cached by the interpreter
+    return (
+        obj is None
+        or isinstance(obj, _SHARED_TYPES)
+        or (isinstance(obj, int) and -5 <= obj <= 256)
+    )
+
+
+def _own_sizeof(obj: Any, seen: Set[int]) -> int:
+    """size of the object itself, including its attribute dictionary"""
+    size = sys.getsizeof(obj)
+
+    # the attribute dictionary is considered part of the object
+    try:
+        attributes = vars(obj)
+    except TypeError:
+        pass
+    else:
+        if isinstance(attributes, dict) and id(attributes) not in seen:
+            seen.add(id(attributes))
+            size += sys.getsizeof(attributes)
+
+    return size
+
+
+def _children(obj: Any) -> Iterator[Tuple[str, Any]]:
+    """named references of an object"""
+    if isinstance(obj, np.ndarray):
+        # views only report their header, the data is owned by the base
+        if obj.base is not None:
+            yield '.base', obj.base
+
+        if obj.dtype == object:
+            yield from (('[*]', item) for item in obj.flat)
+
+        return
+
+    if isinstance(obj, (str, bytes, bytearray, int, float, complex, bool)):
+        return
+
+    if isinstance(obj, dict):
+        yield from ((f'[{key}]', value) for key, value in obj.items())
+        yield from (
+            ('[*].key', key) for key in obj.keys() if not isinstance(key, str)
+        )
+        return
+
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        yield from (('[*]', item) for item in obj)
+        return
+
+    try:
+        attributes = vars(obj)
+    except TypeError:
+        pass
+    else:
+        yield from ((f'.{name}', value) for name, value in attributes.items())
+
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        for name in [slots] if isinstance(slots, str) else slots:
+            if name in ('__dict__', '__weakref__'):
+                continue
+
+            try:
+                yield f'.{name}', getattr(obj, name)
+            except AttributeError:
+                pass
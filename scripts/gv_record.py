@@ -3,30 +3,45 @@ from __future__ import annotations
 
 import argparse
 import itertools as itt
+import os
+import string
 import sys
-from typing import Tuple
+from typing import Dict, Iterator, Optional, Set, Tuple
 
-import imageio
 import numpy.random as rnd
 
 from gym_gridverse.envs.inner_env import InnerEnv
 from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
 from gym_gridverse.observation import Observation
-from gym_gridverse.recording import Data, DataBuilder, generate_images, record
+from gym_gridverse.recording import (
+    Data,
+    DataBuilder,
+    RecordingJob,
+    generate_images,
+    record,
+    record_parallel,
+)
 from gym_gridverse.state import State
 
+ALL_CPUS = object()  # --processes given without a number
+
 
 def main():
     args = get_args()
 
-    env = factory_env_from_yaml(args.yaml)
-    env.set_seed(args.seed)
     rnd.seed(args.seed)
 
+    if args.processes is not None:
+        record_batch(args)
+        return
+
+    env = factory_env_from_yaml(args.yaml[0])
+    env.set_seed(args.seed)
+
     state_data, observation_data = make_data(env, args.discount)
 
     if args.state:
-        images = list(generate_images(state_data))
+        images = list(generate_images(state_data, headless=args.headless))
         filename = args.state
         filenames = map(args.state.format, itt.count())
 
@@ -41,7 +56,7 @@ def main():
         )
 
     if args.observation:
-        images = list(generate_images(observation_data))
+        images = list(generate_images(observation_data, headless=args.headless))
         filename = args.observation
         filenames = map(args.observation.format, itt.count())
 
@@ -56,6 +71,119 @@ def main():
         )
 
 
+def record_batch(args):
+    """records every episode of every yaml file through record_parallel"""
+
+    check_templates(args)
+
+    stats = record_parallel(
+        make_jobs(args),
+        processes=None if args.processes is ALL_CPUS else args.processes,
+        tile_size=args.tile_size,
+        encoders=args.encoders,
+    )
+    print(
+        f'recorded {stats.num_recordings} recordings'
+        f' ({stats.num_frames} frames) in {stats.seconds:.2f}s'
+        f' ({stats.frames_per_second:.1f} frames/sec)'
+    )
+
+
+def make_jobs(args) -> Iterator[RecordingJob]:
+    """generates the episodes, and their recording jobs, one at a time"""
+
+    kwargs = {
+        'loop': args.gif_loop,
+        'duration': args.gif_duration,
+        'fps': args.gif_fps,
+    }
+
+    for path, episode in itt.product(args.yaml, range(args.episodes)):
+        seed = None if args.seed is None else args.seed + episode
+        env = factory_env_from_yaml(path)
+        env.set_seed(seed)
+
+        state_data, observation_data = make_data(env, args.discount)
+
+        keys = template_keys(path, episode, seed)
+        for template, data in [
+            (args.state, state_data),
+            (args.observation, observation_data),
+        ]:
+            if template is None:
+                continue
+
+            if args.mode == 'images':
+                filenames = [
+                    template.format(i, **keys)
+                    for i in range(len(data.elements))
+                ]
+                if len(set(filenames)) != len(filenames):
+                    raise ValueError(
+                        f'frame filenames are not distinct: {template}'
+                    )
+
+                yield RecordingJob(
+                    args.mode, data, filenames=filenames, kwargs=kwargs
+                )
+
+            else:
+                yield RecordingJob(
+                    args.mode,
+                    data,
+                    filename=template.format(**keys),
+                    kwargs=kwargs,
+                )
+
+
+def template_keys(path: str, episode: int, seed: Optional[int]) -> Dict:
+    name = os.path.splitext(os.path.basename(path))[0]
+    return {'name': name, 'episode': episode, 'seed': seed}
+
+
+def check_templates(args):
+    """checks that filename templates give distinct filenames before any
+    episode is generated or recorded"""
+
+    filenames: Set[str] = set()
+    for template in [args.state, args.observation]:
+        if template is None:
+            continue
+
+        fields = {
+            field_name.split('.')[0].split('[')[0]
+            for _, field_name, _, _ in string.Formatter().parse(template)
+            if field_name is not None
+        }
+        positional = fields & {'', '0'}
+        unknown = fields - positional - {'name', 'episode', 'seed'}
+        if unknown:
+            raise ValueError(f'unknown template fields {unknown}: {template}')
+        if args.mode == 'images' and not positional:
+            raise ValueError(
+                f'images mode requires a {{}} frame index: {template}'
+            )
+        if args.mode != 'images' and positional:
+            raise ValueError(
+                f'{args.mode} mode does not take a {{}} frame index: {template}'
+            )
+
+        for path, episode in itt.product(args.yaml, range(args.episodes)):
+            seed = None if args.seed is None else args.seed + episode
+            keys = template_keys(path, episode, seed)
+            filename = (
+                template.format(0, **keys)
+                if args.mode == 'images'
+                else template.format(**keys)
+            )
+            if filename in filenames:
+                raise ValueError(
+                    'filenames must be distinct;'
+                    '  use {name}, {episode} and/or {seed}'
+                )
+            filenames.add(filename)
+
+
 def make_data(
     env: InnerEnv, discount: float
 ) -> Tuple[Data[State], Data[Observation]]:
@@ -82,9 +210,20 @@ def make_data(
 def get_args():
     parser = argparse.ArgumentParser()
     parser.add_argument('mode', choices=['images', 'gif', 'mp4'])
-    parser.add_argument('yaml', help='env YAML file')
+    parser.add_argument('yaml', nargs='+', help='env YAML file(s)')
 
-    parser.add_argument('--seed', type=int, default=None, help='env seed')
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='env seed (incremented for each episode)',
+    )
+    parser.add_argument(
+        '--episodes',
+        type=int,
+        default=1,
+        help='number of episodes per YAML file',
+    )
 
     parser.add_argument(
         '--gif-loop', type=int, default=0, help='gif loop count'
@@ -101,9 +240,45 @@ def get_args():
         '--max-steps', type=int, default=100, help='maximum number of steps'
     )
 
-    parser.add_argument('--state', default=None, help='state filename')
     parser.add_argument(
-        '--observation', default=None, help='observation filename'
+        '--headless',
+        action='store_true',
+        help='render without a display (no HUD)',
+    )
+    parser.add_argument(
+        '--processes',
+        type=int,
+        nargs='?',
+        const=ALL_CPUS,
+        default=None,
+        help='render across this many processes (all CPUs if no number is'
+        ' given, 0 renders in this process);  requires --headless, and is'
+        ' required for multiple YAML files or episodes',
+    )
+    parser.add_argument(
+        '--encoders',
+        type=int,
+        default=1,
+        help='number of encoding threads (with --processes)',
+    )
+    parser.add_argument(
+        '--tile-size',
+        type=int,
+        default=32,
+        help='tile size in pixels (with --processes)',
+    )
+
+    parser.add_argument(
+        '--state',
+        default=None,
+        help='state filename;  may contain {name}, {episode} and {seed}, and'
+        ' must contain {} (frame index) in images mode',
+    )
+    parser.add_argument(
+        '--observation',
+        default=None,
+        help='observation filename;  may contain {name}, {episode} and {seed},'
+        ' and must contain {} (frame index) in images mode',
     )
 
     imageio_help_sentinel = object()  # used to detect no argument given
@@ -117,6 +292,8 @@ def get_args():
     args = parser.parse_args()
 
     if args.imageio_help is not None:
+        import imageio  # pylint: disable=import-outside-toplevel
+
         name = (
             args.imageio_help
             if args.imageio_help is not imageio_help_sentinel
@@ -130,6 +307,20 @@ def get_args():
             'you must give at least --state or --observation (or both)'
         )
 
+    if args.processes is None and (len(args.yaml) > 1 or args.episodes > 1):
+        raise ValueError('multiple YAML files or episodes require --processes')
+
+    if args.processes is not None and not args.headless:
+        raise ValueError(
+            '--processes only renders headless (no HUD);  give --headless'
+        )
+
+    if args.processes is not None and args.processes is not ALL_CPUS:
+        if args.processes < 0:
+            raise ValueError(
+                f'--processes ({args.processes}) should be non-negative'
+            )
+
     return args
 
 
@@ -171,8 +171,9 @@ def main(
     def update(
         viz_state: VizState, observation_space: ObservationSpace
     ):  # pylint: disable=too-many-arguments
-        screen.clear()
-        main_window.clear()
+        # erase (rather than clear) lets curses only redraw changed cells
+        screen.erase()
+        main_window.erase()
 
         # draw panel
         panel_window_outer.border()
@@ -224,10 +225,11 @@ def main(
         legend_window_inner.addstr(14, 0, fstr('r', Controls.RESET))
         legend_window_inner.addstr(15, 0, fstr('h', Controls.HIDE_STATE))
 
-        # refresh all windows
-        screen.refresh()
-        main_window.refresh()
-        legend_window_outer.refresh()
+        # refresh all windows in a single terminal update
+        screen.noutrefresh()
+        main_window.noutrefresh()
+        legend_window_outer.noutrefresh()
+        curses.doupdate()
 
     @dataclass
     class VizState:
@@ -2,6 +2,7 @@
 
 import argparse
 import random
+import sys
 from typing import Dict
 
 import numpy as np
@@ -9,7 +10,7 @@ import numpy as np
 from gym_gridverse.action import Action
 from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
 from gym_gridverse.outer_env import OuterEnv
-from gym_gridverse.render_as_string import str_render_obs, str_render_state
+from gym_gridverse.render_as_string import TerminalRenderer
 from gym_gridverse.representations.observation_representations import (
     DefaultObservationRepresentation,
 )
@@ -26,28 +27,28 @@ def random_action_selection(
 def visualize_random_bot(domain: OuterEnv):
     domain.reset()
 
+    # only redraws the cells which change between steps
+    renderer = TerminalRenderer()
+    r, t = None, False
+
     while True:
 
+        # typically not used outside of library, inner representation used to
+        # visualize below
+        internal_state = domain.inner_env.state
+        internal_obs = domain.inner_env.observation
+
+        sys.stdout.write(renderer.render([[internal_state, internal_obs]]))
+        print(f"Reward {r}" + (" (environment was reset)" if t else ""))
+
         a = random_action_selection(domain.observation, domain.action_space)
         input(f"Agent will take action {a.name}, press a key to continue")
 
         r, t = domain.step(a)
 
         if t:
-            print("Resetting environment")
             domain.reset()
 
-        # typically not used outside of library, inner representation used to
-        # visualize below
-        internal_state = domain.inner_env.state
-        internal_obs = domain.inner_env.observation
-
-        print(
-            f"Reward {r}, "
-            f"next state:\n{str_render_state(internal_state)}\n"
-            f"observation:\n{str_render_obs(internal_obs)}"
-        )
-
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
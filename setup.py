@@ -11,7 +11,7 @@ with open('HISTORY.rst') as history_file:
     history = history_file.read()
 
 requirements = [
-    'cached_property',
+    'cached_property; python_version < "3.8"',  # python3.7 compatibility
     'gym',
     'imageio',
     'imageio-ffmpeg',
@@ -40,6 +40,10 @@ setup(
         'Topic :: Scientific/Engineering :: Artificial Intelligence',
         'Topic :: Software Development :: Libraries :: Python Modules',
     ],
+    entry_points={
+        # lets gym register the environments without importing gym_gridverse
+        'gym.envs': ['__root__ = gym_gridverse.gym_registration:register_envs'],
+    },
     description="Gridworld domains for fully and partially observable reinforcement learning",
     install_requires=requirements,
     license="MIT license",
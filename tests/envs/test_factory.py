@@ -1,8 +1,25 @@
+import pickle
+
 import pytest
 
-from gym_gridverse.envs.factory import env_from_descr
+from gym_gridverse.envs.factory import STRING_TO_GYM_CONSTRUCTOR, env_from_descr
 
 
 def test_that_it_errors_for_coverage():
     with pytest.raises(ValueError):
         env_from_descr("blah!")
+
+
+@pytest.mark.parametrize('descr', STRING_TO_GYM_CONSTRUCTOR.keys())
+def test_env_from_descr_pickle(descr: str):
+    env = env_from_descr(descr)
+    env.set_seed(0)
+    env.reset()
+
+    env_unpickled = pickle.loads(pickle.dumps(env))
+    assert env_unpickled.state == env.state
+
+    for action in env.action_space.actions:
+        env.step(action)
+        env_unpickled.step(action)
+        assert env_unpickled.state == env.state
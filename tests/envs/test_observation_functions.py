@@ -117,6 +117,7 @@ def test_minigrid_observation_partially_observable(
         ('minigrid_observation', {}),
         ('raytracing_observation', {}),
         ('stochastic_raytracing_observation', {}),
+        ('shadowcasting_observation', {}),
     ],
 )
 def test_factory_valid(name: str, kwargs):
@@ -134,6 +135,7 @@ def test_factory_valid(name: str, kwargs):
         ('minigrid_observation', {}, ValueError),
         ('raytracing_observation', {}, ValueError),
         ('stochastic_raytracing_observation', {}, ValueError),
+        ('shadowcasting_observation', {}, ValueError),
     ],
 )
 def test_factory_invalid(name: str, kwargs, exception: Exception):
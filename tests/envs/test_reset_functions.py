@@ -8,6 +8,7 @@ from gym_gridverse.envs.reset_functions import (
     reset_teleport,
 )
 from gym_gridverse.geometry import Shape
+from gym_gridverse.grid import ChunkedGrid
 from gym_gridverse.grid_object import (
     Door,
     Goal,
@@ -16,6 +17,7 @@ from gym_gridverse.grid_object import (
     Telepod,
     Wall,
 )
+from gym_gridverse.rng import make_rng
 from gym_gridverse.state import State
 
 
@@ -191,3 +193,34 @@ def test_factory_valid(name: str, kwargs):
 def test_factory_invalid(name: str, kwargs, exception: Exception):
     with pytest.raises(exception):  # type: ignore
         factory(name, **kwargs)
+
+
+@pytest.mark.parametrize(
+    'name,kwargs',
+    [
+        ('empty', {'height': 10, 'width': 10, 'random_agent_pos': True}),
+        ('rooms', {'height': 10, 'width': 10, 'layout': (2, 2)}),
+        (
+            'dynamic_obstacles',
+            {
+                'height': 10,
+                'width': 10,
+                'num_obstacles': 10,
+                'random_agent_pos': True,
+            },
+        ),
+        ('keydoor', {'height': 10, 'width': 10}),
+        (
+            'crossing',
+            {'height': 9, 'width': 9, 'num_rivers': 3, 'object_type': Wall},
+        ),
+        ('teleport', {'height': 10, 'width': 10}),
+    ],
+)
+def test_factory_tile_size(name: str, kwargs):
+    state = factory(name, **kwargs)(rng=make_rng(0))
+    chunked_state = factory(name, tile_size=4, **kwargs)(rng=make_rng(0))
+
+    assert isinstance(chunked_state.grid, ChunkedGrid)
+    assert chunked_state.grid.to_objects() == state.grid.to_objects()
+    assert chunked_state.agent == state.agent
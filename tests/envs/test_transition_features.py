@@ -0,0 +1,85 @@
+import copy
+
+import pytest
+
+from gym_gridverse.action import Action
+from gym_gridverse.envs import reward_functions, terminating_functions
+from gym_gridverse.envs.reset_functions import reset_keydoor
+from gym_gridverse.envs.transition_features import (
+    TransitionFeatures,
+    activate_transition_features,
+    get_transition_features,
+)
+from gym_gridverse.envs.transition_functions import update_agent
+from gym_gridverse.grid_object import Door, Goal, GridObject, Wall
+
+
+def make_transition(action: Action):
+    state = reset_keydoor(5, 5)
+    next_state = copy.deepcopy(state)
+    update_agent(next_state, action)
+    return state, action, next_state
+
+
+def test_get_transition_features_inactive():
+    state, action, next_state = make_transition(Action.MOVE_FORWARD)
+
+    features = get_transition_features(state, action, next_state)
+    assert isinstance(features, TransitionFeatures)
+    assert get_transition_features(state, action, next_state) is not features
+
+
+def test_get_transition_features_active():
+    state, action, next_state = make_transition(Action.MOVE_FORWARD)
+
+    with activate_transition_features(state, action, next_state) as features:
+        assert get_transition_features(state, action, next_state) is features
+
+        # other transitions get their own features
+        other_state = copy.deepcopy(state)
+        assert (
+            get_transition_features(other_state, action, next_state)
+            is not features
+        )
+        assert (
+            get_transition_features(state, Action.TURN_LEFT, next_state)
+            is not features
+        )
+
+    assert get_transition_features(state, action, next_state) is not features
+
+
+@pytest.mark.parametrize('object_type', [Goal, Wall, Door, GridObject])
+def test_state_features_positions(object_type):
+    state, action, next_state = make_transition(Action.MOVE_FORWARD)
+    features = TransitionFeatures(state, action, next_state)
+
+    expected = [
+        position
+        for position in state.grid.positions()
+        if isinstance(state.grid[position], object_type)
+    ]
+    assert features.state.positions(object_type) == expected
+    assert features.state.positions(object_type) is (
+        features.state.positions(object_type)
+    )
+
+
+@pytest.mark.parametrize('action', list(Action))
+def test_features_do_not_change_results(action: Action):
+    state, action, next_state = make_transition(action)
+
+    functions = [
+        reward_functions.reach_goal,
+        reward_functions.bump_into_wall,
+        lambda *args: reward_functions.getting_closer(*args, object_type=Goal),
+        lambda *args: reward_functions.proportional_to_distance(
+            *args, object_type=Goal
+        ),
+        terminating_functions.reach_goal,
+        terminating_functions.bump_into_wall,
+    ]
+
+    expected = [f(state, action, next_state) for f in functions]
+    with activate_transition_features(state, action, next_state):
+        assert [f(state, action, next_state) for f in functions] == expected
@@ -1,10 +1,13 @@
 """ Tests state dynamics """
 
 import copy
+import pickle
 import random
-from typing import Optional, Sequence
-from unittest.mock import MagicMock, patch
+from functools import partial
+from typing import Sequence
+from unittest.mock import MagicMock
 
+import numpy as np
 import numpy.random as rnd
 import pytest
 
@@ -12,18 +15,23 @@ from gym_gridverse.action import Action
 from gym_gridverse.agent import Agent
 from gym_gridverse.envs.reset_functions import reset_dynamic_obstacles
 from gym_gridverse.envs.transition_functions import (
-    _step_moving_obstacle,
+    CompiledChain,
     actuate_box,
     actuate_door,
+    chain,
     factory,
+    get_relevant_actions,
     move_agent,
+    moving_obstacle_moves,
     pickup_mechanics,
+    relevant_actions,
     rotate_agent,
     step_moving_obstacles,
     step_telepod,
+    update_agent,
 )
 from gym_gridverse.geometry import Orientation, Position, PositionOrTuple
-from gym_gridverse.grid import Grid
+from gym_gridverse.grid import ChunkedGrid, Grid
 from gym_gridverse.grid_object import (
     Box,
     Color,
@@ -36,6 +44,7 @@ from gym_gridverse.grid_object import (
     Telepod,
     Wall,
 )
+from gym_gridverse.rng import make_rng
 from gym_gridverse.state import State
 
 
@@ -163,7 +172,7 @@ def test_move_action(
 
 # TODO integrate with previous test
 def test_move_action_blocked_by_grid_object():
-    """ Puts an object on (2,0) and try to move there"""
+    """Puts an object on (2,0) and try to move there"""
     grid = Grid(height=3, width=2)
     agent = Agent(position=(2, 1), orientation=Orientation.N)
 
@@ -267,7 +276,7 @@ def test_pickup_mechanics_swap():
 
 
 def test_step_moving_obstacles_once_per_obstacle():
-    """Tests step is called exactly once on all moving obstacles
+    """Tests step moves all moving obstacles at most once
 
     There was this naive implementation that looped over all positions, and
     called `.step()` on it. Unfortunately, when `step` caused the object to
@@ -277,27 +286,125 @@ def test_step_moving_obstacles_once_per_obstacle():
     """
     state = reset_dynamic_obstacles(height=6, width=6, num_obstacles=4)
 
-    counts = {}
+    def obstacle_positions():
+        return {
+            id(state.grid[position]): position
+            for position in state.grid.positions(MovingObstacle)
+        }
 
-    def patched_step_moving_obstacle(
-        grid: Grid, position: Position, *, rng: Optional[rnd.Generator] = None
-    ):
-        key = id(grid[position])
-        try:
-            counts[key] += 1
-        except KeyError:
-            counts[key] = 1
+    for seed in range(20):
+        positions = obstacle_positions()
+        step_moving_obstacles(state, Action.PICK_N_DROP, rng=make_rng(seed))
+        next_positions = obstacle_positions()
 
-        _step_moving_obstacle(grid, position, rng=rng)
+        assert next_positions.keys() == positions.keys()
+        assert all(
+            Position.manhattan_distance(positions[key], next_positions[key])
+            <= 1
+            for key in positions
+        )
 
-    with patch(
-        'gym_gridverse.envs.transition_functions._step_moving_obstacle',
-        new=patched_step_moving_obstacle,
-    ):
-        step_moving_obstacles(state, Action.PICK_N_DROP)
 
-    assert len(counts) == 4
-    assert all(count == 1 for count in counts.values())
+@pytest.mark.parametrize('tile_size', [2, 4])
+def test_step_moving_obstacles_chunked_grid(tile_size: int):
+    state = reset_dynamic_obstacles(height=6, width=6, num_obstacles=4)
+    chunked_state = State(
+        ChunkedGrid.from_grid(copy.deepcopy(state.grid), tile_size=tile_size),
+        state.agent,
+    )
+
+    rng, chunked_rng = make_rng(0), make_rng(0)
+    for _ in range(10):
+        step_moving_obstacles(state, Action.PICK_N_DROP, rng=rng)
+        step_moving_obstacles(
+            chunked_state, Action.PICK_N_DROP, rng=chunked_rng
+        )
+        assert chunked_state.grid.to_objects() == state.grid.to_objects()
+
+
+def test_step_moving_obstacles_without_obstacles():
+    state = reset_dynamic_obstacles(height=6, width=6, num_obstacles=0)
+    grid = copy.deepcopy(state.grid)
+
+    rng = make_rng(0)
+    step_moving_obstacles(state, Action.PICK_N_DROP, rng=rng)
+    assert state.grid == grid
+    # the rng is not used
+    assert rng.integers(1000) == make_rng(0).integers(1000)
+
+
+def _sequential_moving_obstacle_moves(
+    floor: np.ndarray, obstacles: np.ndarray, rng: rnd.Generator
+):
+    """reference implementation, moving one obstacle at a time"""
+    floor = floor.copy()
+    sources, targets = [], []
+    for y, x in zip(*np.nonzero(obstacles)):
+        next_positions = [
+            (next_y, next_x)
+            for next_y, next_x in [
+                (y - 1, x),
+                (y, x + 1),
+                (y + 1, x),
+                (y, x - 1),
+            ]
+            if 0 <= next_y < floor.shape[0]
+            and 0 <= next_x < floor.shape[1]
+            and floor[next_y, next_x]
+        ]
+        if next_positions:
+            next_position = next_positions[rng.integers(len(next_positions))]
+            floor[y, x] = True
+            floor[next_position] = False
+            sources.append((y, x))
+            targets.append(next_position)
+
+    return sources, targets
+
+
+@pytest.mark.parametrize('density', [0.05, 0.3, 0.6])
+def test_moving_obstacle_moves(density: float):
+    """moves are the same as those of moving one obstacle at a time"""
+    rng = make_rng(0)
+    for _ in range(20):
+        cells = rng.random((9, 12))
+        obstacles = cells < density
+        floor = cells > density + 0.15
+
+        seed = int(rng.integers(1000))
+        sources, targets = moving_obstacle_moves(
+            floor, obstacles, rng=make_rng(seed)
+        )
+        expected_sources, expected_targets = _sequential_moving_obstacle_moves(
+            floor, obstacles, make_rng(seed)
+        )
+
+        assert sources.tolist() == [list(s) for s in expected_sources]
+        assert targets.tolist() == [list(t) for t in expected_targets]
+
+
+def test_moving_obstacle_moves_batched():
+    rng = make_rng(0)
+    cells = rng.random((3, 5, 6))
+    obstacles = cells < 0.3
+    floor = cells > 0.4
+
+    sources, targets = moving_obstacle_moves(floor, obstacles, rng=make_rng(0))
+    assert sources.shape == targets.shape
+    assert sources.shape[1] == 3
+
+    # grids are processed one after the other
+    reference_rng = make_rng(0)
+    expected_sources, expected_targets = [], []
+    for b in range(3):
+        grid_sources, grid_targets = _sequential_moving_obstacle_moves(
+            floor[b], obstacles[b], reference_rng
+        )
+        expected_sources.extend([b, *source] for source in grid_sources)
+        expected_targets.extend([b, *target] for target in grid_targets)
+
+    assert sources.tolist() == expected_sources
+    assert targets.tolist() == expected_targets
 
 
 @pytest.mark.parametrize(
@@ -507,3 +614,79 @@ def test_factory_valid(name: str, kwargs):
 def test_factory_invalid(name: str, kwargs):
     with pytest.raises(ValueError):
         factory(name, **kwargs)
+
+
+@pytest.mark.parametrize(
+    'transition_function,expected',
+    [
+        (update_agent, set(Action) - {Action.ACTUATE, Action.PICK_N_DROP}),
+        (pickup_mechanics, {Action.PICK_N_DROP}),
+        (actuate_door, {Action.ACTUATE}),
+        (actuate_box, {Action.ACTUATE}),
+        (partial(actuate_box), {Action.ACTUATE}),
+        (step_moving_obstacles, None),
+        (step_telepod, None),
+    ],
+)
+def test_get_relevant_actions(transition_function, expected):
+    assert get_relevant_actions(transition_function) == expected
+
+
+def test_compiled_chain_dispatch():
+    calls = []
+
+    @relevant_actions(Action.ACTUATE)
+    def actuate_function(state, action, *, rng=None):
+        calls.append(('actuate', action))
+
+    def any_function(state, action, *, rng=None):
+        calls.append(('any', action))
+
+    compiled_chain = CompiledChain([actuate_function, any_function])
+    assert compiled_chain.relevant_actions is None
+    assert compiled_chain.dispatch[Action.TURN_LEFT] == (any_function,)
+
+    compiled_chain(MagicMock(), Action.TURN_LEFT)
+    compiled_chain(MagicMock(), Action.ACTUATE)
+    assert calls == [
+        ('any', Action.TURN_LEFT),
+        ('actuate', Action.ACTUATE),
+        ('any', Action.ACTUATE),
+    ]
+
+    compiled_chain = CompiledChain([actuate_function, pickup_mechanics])
+    assert compiled_chain.relevant_actions == {
+        Action.ACTUATE,
+        Action.PICK_N_DROP,
+    }
+
+
+def test_compiled_chain_equivalent():
+    transition_functions = [
+        update_agent,
+        pickup_mechanics,
+        step_moving_obstacles,
+        actuate_door,
+        actuate_box,
+    ]
+    compiled_chain = factory('chain', transition_functions)
+    assert isinstance(compiled_chain, CompiledChain)
+
+    # survives pickling, e.g. in compiled environment specs
+    compiled_chain = pickle.loads(pickle.dumps(compiled_chain))
+
+    rng = rnd.default_rng(0)
+    state = reset_dynamic_obstacles(7, 7, 4, random_agent_pos=True, rng=rng)
+    expected_state = copy.deepcopy(state)
+    rng_compiled, rng_expected = rnd.default_rng(1), rnd.default_rng(1)
+
+    for _ in range(50):
+        action = list(Action)[rng.integers(len(Action))]
+        compiled_chain(state, action, rng=rng_compiled)
+        chain(
+            expected_state,
+            action,
+            transition_functions=transition_functions,
+            rng=rng_expected,
+        )
+        assert state == expected_state
@@ -1,17 +1,22 @@
-from typing import Sequence
+from typing import Sequence, Tuple
 
 import pytest
 
 from gym_gridverse.envs.visibility_functions import (
+    IncrementalVisibility,
+    VisibilityFunction,
     factory,
     full_visibility,
     minigrid_visibility,
     partial_visibility,
     raytracing_visibility,
+    shadowcasting_visibility,
+    stochastic_raytracing_visibility,
 )
 from gym_gridverse.geometry import Position
 from gym_gridverse.grid import Grid
 from gym_gridverse.grid_object import Floor, GridObject, Wall
+from gym_gridverse.rng import make_rng
 
 
 @pytest.mark.parametrize(
@@ -242,6 +247,183 @@ def test_raytracing_visibility(
     assert (visibility == expected_int).all()
 
 
+@pytest.mark.parametrize(
+    'objects,position,expected_int',
+    [
+        (
+            [
+                [Floor(), Floor(), Floor(), Floor(), Floor()],
+                [Floor(), Floor(), Floor(), Floor(), Floor()],
+                [Floor(), Floor(), Floor(), Floor(), Floor()],
+            ],
+            Position(2, 2),
+            [
+                [1, 1, 1, 1, 1],
+                [1, 1, 1, 1, 1],
+                [1, 1, 1, 1, 1],
+            ],
+        ),
+        (
+            [
+                [Floor(), Floor(), Floor(), Floor(), Floor()],
+                [Floor(), Wall(), Wall(), Wall(), Floor()],
+                [Floor(), Floor(), Floor(), Floor(), Floor()],
+            ],
+            Position(2, 2),
+            [
+                [0, 0, 0, 0, 0],
+                [1, 1, 1, 1, 1],
+                [1, 1, 1, 1, 1],
+            ],
+        ),
+        (
+            [
+                [Floor(), Floor(), Floor(), Floor(), Floor(), Floor(), Floor()],
+                [Floor(), Wall(), Floor(), Floor(), Floor(), Floor(), Floor()],
+                [Floor(), Floor(), Floor(), Floor(), Floor(), Floor(), Floor()],
+                [Floor(), Floor(), Floor(), Floor(), Wall(), Floor(), Floor()],
+                [Floor(), Floor(), Floor(), Floor(), Floor(), Floor(), Floor()],
+                [Floor(), Floor(), Floor(), Floor(), Floor(), Floor(), Floor()],
+                [Floor(), Floor(), Floor(), Floor(), Floor(), Floor(), Floor()],
+            ],
+            Position(6, 3),
+            [
+                [1, 0, 1, 1, 1, 0, 1],
+                [1, 1, 1, 1, 0, 0, 1],
+                [1, 1, 1, 1, 0, 1, 1],
+                [1, 1, 1, 1, 1, 1, 1],
+                [1, 1, 1, 1, 1, 1, 1],
+                [1, 1, 1, 1, 1, 1, 1],
+                [1, 1, 1, 1, 1, 1, 1],
+            ],
+        ),
+        (
+            [
+                [Floor(), Floor(), Floor()],
+                [Wall(), Wall(), Wall()],
+                [Floor(), Floor(), Floor()],
+                [Wall(), Wall(), Wall()],
+                [Floor(), Floor(), Floor()],
+            ],
+            Position(2, 1),
+            [
+                [0, 0, 0],
+                [1, 1, 1],
+                [1, 1, 1],
+                [1, 1, 1],
+                [0, 0, 0],
+            ],
+        ),
+    ],
+)
+def test_shadowcasting_visibility(
+    objects: Sequence[Sequence[GridObject]],
+    position: Position,
+    expected_int: Sequence[Sequence[int]],
+):
+    grid = Grid.from_objects(objects)
+    visibility = shadowcasting_visibility(grid, position)
+    assert visibility.dtype == bool
+    assert (visibility == expected_int).all()
+
+
+def test_shadowcasting_visibility_symmetric():
+    """transparent tiles see each other symmetrically"""
+    rng = make_rng(0)
+    transparent = rng.random((6, 7)) < 0.7
+    grid = Grid.from_objects(
+        [[Floor() if t else Wall() for t in row] for row in transparent]
+    )
+
+    positions = [
+        position for position in grid.positions() if grid[position].transparent
+    ]
+    visibilities = {
+        position: shadowcasting_visibility(grid, position)
+        for position in positions
+    }
+    for p in positions:
+        for q in positions:
+            assert visibilities[p][q.y, q.x] == visibilities[q][p.y, p.x]
+
+
+@pytest.mark.parametrize(
+    'visibility_function',
+    [partial_visibility, minigrid_visibility, raytracing_visibility],
+)
+@pytest.mark.parametrize('shape', [(2, 3), (7, 7), (5, 9), (11, 11)])
+def test_incremental_visibility(
+    visibility_function: VisibilityFunction, shape: Tuple[int, int]
+):
+    """incremental updates are equal to full recomputations"""
+    rng = make_rng(0)
+    height, width = shape
+    position = Position(height - 1, width // 2)
+    transparent = rng.random(shape) < 0.7
+
+    incremental = IncrementalVisibility(visibility_function)
+    for _ in range(50):
+        for _ in range(rng.integers(4)):
+            transparent[rng.integers(height), rng.integers(width)] ^= True
+
+        grid = Grid.from_objects(
+            [[Floor() if t else Wall() for t in row] for row in transparent]
+        )
+        visibility = incremental(grid, position)
+        assert visibility.dtype == bool
+        assert (visibility == visibility_function(grid, position)).all()
+
+    assert incremental.num_full_updates == 1
+    assert incremental.num_incremental_updates > 0
+
+
+def test_incremental_visibility_full_updates():
+    grid = Grid.from_objects(
+        [
+            [Floor(), Wall(), Floor()],
+            [Floor(), Floor(), Floor()],
+            [Floor(), Floor(), Floor()],
+        ]
+    )
+    incremental = IncrementalVisibility(raytracing_visibility)
+
+    incremental(grid, Position(2, 1))
+    incremental(grid, Position(2, 1))
+    assert incremental.num_full_updates == 1
+
+    # new position
+    visibility = incremental(grid, Position(1, 1))
+    assert incremental.num_full_updates == 2
+    assert (visibility == raytracing_visibility(grid, Position(1, 1))).all()
+
+    # most of the grid changed
+    grid = Grid.from_objects(
+        [
+            [Wall(), Floor(), Wall()],
+            [Wall(), Floor(), Wall()],
+            [Wall(), Wall(), Floor()],
+        ]
+    )
+    visibility = incremental(grid, Position(1, 1))
+    assert incremental.num_full_updates == 3
+    assert (visibility == raytracing_visibility(grid, Position(1, 1))).all()
+
+    incremental.reset()
+    incremental(grid, Position(1, 1))
+    assert incremental.num_full_updates == 4
+    assert incremental.num_incremental_updates == 0
+
+
+@pytest.mark.parametrize(
+    'visibility_function', [full_visibility, stochastic_raytracing_visibility]
+)
+def test_incremental_visibility_invalid(
+    visibility_function: VisibilityFunction,
+):
+    with pytest.raises(ValueError):
+        IncrementalVisibility(visibility_function)
+
+
 @pytest.mark.parametrize(
     'name',
     [
@@ -250,6 +432,7 @@ def test_raytracing_visibility(
         'minigrid_visibility',
         'raytracing_visibility',
         'stochastic_raytracing_visibility',
+        'shadowcasting_visibility',
     ],
 )
 def test_factory_valid(name: str):
@@ -1,4 +1,5 @@
 import glob
+import pickle
 
 import pytest
 from schema import SchemaError
@@ -6,7 +7,9 @@ from schema import SchemaError
 import gym_gridverse.envs.yaml.factory as yaml_factory
 from gym_gridverse.action import Action
 from gym_gridverse.envs import InnerEnv
+from gym_gridverse.envs.gridworld import GridWorld
 from gym_gridverse.geometry import Shape
+from gym_gridverse.grid import ChunkedGrid
 from gym_gridverse.grid_object import Color, GridObject
 from gym_gridverse.spaces import ActionSpace, ObservationSpace, StateSpace
 
@@ -173,3 +176,167 @@ def test_factory_observation_space_fail(data):
 def test_factory_rnv_from_yaml(path: str):
     env = yaml_factory.factory_env_from_yaml(path)
     assert isinstance(env, InnerEnv)
+
+
+@pytest.mark.parametrize('path', glob.glob('yaml/*.yaml'))
+def test_factory_env_spec_from_yaml(path: str):
+    spec = yaml_factory.factory_env_spec_from_yaml(path)
+    assert spec.content_hash == yaml_factory.hash_yaml(path)
+
+    # cached in-process
+    assert yaml_factory.factory_env_spec_from_yaml(path) is spec
+
+    env = spec.make()
+    assert isinstance(env, GridWorld)
+    assert env.spec is spec
+
+    # specs can be pickled, e.g. to be sent to worker processes
+    spec_unpickled = pickle.loads(pickle.dumps(spec))
+    assert spec_unpickled.content_hash == spec.content_hash
+    assert spec_unpickled.data == spec.data
+
+
+def test_factory_env_spec_from_yaml_cache_dir(tmp_path, monkeypatch):
+    path = 'yaml/gv_keydoor.5x5.yaml'
+    content_hash = yaml_factory.hash_yaml(path)
+    cache_dir = str(tmp_path / 'cache')
+
+    monkeypatch.setattr(yaml_factory, '_env_spec_cache', {})
+    spec = yaml_factory.factory_env_spec_from_yaml(path, cache_dir=cache_dir)
+    assert (tmp_path / 'cache' / f'{content_hash}.pickle').exists()
+
+    # a new process would load the spec from disk, without validation
+    def fail(*args, **kwargs):
+        raise AssertionError('spec should not be recompiled')
+
+    monkeypatch.setattr(yaml_factory, '_env_spec_cache', {})
+    monkeypatch.setattr(yaml_factory, 'factory_env_spec_from_data', fail)
+    spec_loaded = yaml_factory.factory_env_spec_from_yaml(
+        path, cache_dir=cache_dir
+    )
+    assert spec_loaded is not spec
+    assert spec_loaded.data == spec.data
+
+
+@pytest.mark.parametrize('from_spec', [True, False])
+def test_gridworld_clone(from_spec: bool):
+    env = yaml_factory.factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    if not from_spec:
+        env.spec = None
+
+    clone = env.clone()
+    assert clone is not env
+    assert clone.spec is env.spec
+
+    env.set_seed(0)
+    env.reset()
+    clone.set_seed(0)
+    clone.reset()
+    assert clone.state == env.state
+
+    for action in env.action_space.actions:
+        env.step(action)
+        clone.step(action)
+        assert clone.state == env.state
+
+
+@pytest.mark.parametrize('from_spec', [True, False])
+def test_gridworld_pickle(from_spec: bool):
+    env = yaml_factory.factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    if not from_spec:
+        env.spec = None
+
+    env.set_seed(0)
+    env.reset()
+    env.step(Action.TURN_LEFT)
+
+    env_unpickled = pickle.loads(pickle.dumps(env))
+    assert env_unpickled.spec is env.spec
+    assert env_unpickled.state == env.state
+    assert env_unpickled.observation == env.observation
+
+    # the rng state is preserved, so the environments evolve identically
+    for action in env.action_space.actions:
+        env.step(action)
+        env_unpickled.step(action)
+        assert env_unpickled.state == env.state
+
+
+def test_gridworld_pickle_descriptor(monkeypatch):
+    env = yaml_factory.factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    assert env.spec is not None
+
+    # the components are not pickled, only the configuration data
+    data = pickle.dumps(env)
+    assert len(data) < len(pickle.dumps(env.spec))
+
+    # a new process recompiles the spec once, from the descriptor data
+    monkeypatch.setattr(yaml_factory, '_env_spec_cache', {})
+    env_unpickled = pickle.loads(data)
+    assert env_unpickled.spec is not env.spec
+    assert env_unpickled.spec.content_hash == env.spec.content_hash
+    assert pickle.loads(data).spec is env_unpickled.spec
+
+
+def test_gridworld_pickle_descriptor_from_data(monkeypatch):
+    env = yaml_factory.factory_env_from_data(
+        yaml_factory.factory_env_spec_from_yaml('yaml/gv_keydoor.5x5.yaml').data
+    )
+    assert env.spec is not None and env.spec.content_hash is None
+
+    data = pickle.dumps(env)
+    monkeypatch.setattr(yaml_factory, '_env_spec_cache', {})
+    env_unpickled = pickle.loads(data)
+    assert env_unpickled.spec.content_hash is None
+    assert pickle.loads(data).spec is env_unpickled.spec
+
+
+def test_gridworld_large_chunked_grid():
+    size = 1024
+    objects = ['Floor', 'Wall', 'Goal']
+    env = yaml_factory.factory_env_from_data(
+        {
+            'state_space': {
+                'shape': [size, size],
+                'objects': objects,
+                'colors': ['NONE'],
+            },
+            'action_space': ['MOVE_FORWARD', 'TURN_LEFT', 'TURN_RIGHT'],
+            'observation_space': {
+                'shape': [7, 7],
+                'objects': objects,
+                'colors': ['NONE'],
+            },
+            'reset_function': {
+                'name': 'empty',
+                'random_agent': False,
+                'tile_size': 32,
+            },
+            'transition_functions': [{'name': 'update_agent'}],
+            'reward_functions': [
+                {'name': 'reach_goal', 'reward_on': 1.0, 'reward_off': 0.0}
+            ],
+            'observation_function': {'name': 'partial_observation'},
+            'terminating_function': {'name': 'reach_goal'},
+        }
+    )
+
+    env.reset()
+    grid = env.state.grid
+    assert isinstance(grid, ChunkedGrid)
+    assert grid.shape == Shape(size, size)
+    assert env.observation.grid.shape == Shape(7, 7)
+
+    # the agent starts in the top-left corner, facing east
+    for _ in range(10):
+        env.step(Action.MOVE_FORWARD)
+    assert env.state.agent.position == (1, 11)
+    env.step(Action.TURN_RIGHT)
+    for _ in range(10):
+        env.step(Action.MOVE_FORWARD)
+    assert env.state.agent.position == (11, 11)
+
+    # only the tiles along the border and near the agent were ever created
+    # pylint: disable=protected-access
+    num_tiles = (size // 32) ** 2
+    assert len(env.state.grid._tiles) < num_tiles // 4
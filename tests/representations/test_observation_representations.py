@@ -0,0 +1,92 @@
+import numpy as np
+import numpy.random as rnd
+import pytest
+
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.headless_rendering import HeadlessRenderer
+from gym_gridverse.representations.observation_representations import (
+    PixelObservationRepresentation,
+    create_observation_representation,
+)
+
+
+def make_observations(path: str, n: int):
+    env = factory_env_from_yaml(path)
+    env.set_seed(0)
+    env.reset()
+    rng = rnd.default_rng(0)
+
+    observations = [env.observation]
+    for _ in range(n - 1):
+        env.step(rng.choice(env.action_space.actions))
+        observations.append(env.observation)
+
+    return env.observation_space, observations
+
+
+def test_pixel_representation_factory():
+    observation_space, _ = make_observations('yaml/gv_keydoor.5x5.yaml', 1)
+    representation = create_observation_representation(
+        'pixels', observation_space
+    )
+    assert isinstance(representation, PixelObservationRepresentation)
+
+
+@pytest.mark.parametrize(
+    'path', ['yaml/gv_keydoor.5x5.yaml', 'yaml/gv_teleport.7x7.yaml']
+)
+def test_pixel_representation_matches_headless_renderer(path: str):
+    observation_space, observations = make_observations(path, 10)
+    representation = PixelObservationRepresentation(
+        observation_space, tile_size=8
+    )
+    renderer = HeadlessRenderer(tile_size=8)
+
+    for observation in observations:
+        conversion = representation.convert(observation)
+        np.testing.assert_array_equal(
+            conversion['grid'], renderer.render(observation)
+        )
+        np.testing.assert_array_equal(
+            conversion['agent'],
+            [
+                observation.agent.obj.type_index,
+                observation.agent.obj.state_index,
+                observation.agent.obj.color.value,
+            ],
+        )
+
+
+@pytest.mark.parametrize(
+    'grayscale,downsample', [(False, 1), (True, 1), (False, 4), (True, 2)]
+)
+def test_pixel_representation_space(grayscale: bool, downsample: int):
+    observation_space, observations = make_observations(
+        'yaml/gv_keydoor.5x5.yaml', 5
+    )
+    representation = PixelObservationRepresentation(
+        observation_space,
+        tile_size=8,
+        grayscale=grayscale,
+        downsample=downsample,
+    )
+    space = representation.space
+
+    batch = representation.convert_batch(observations)
+    assert batch['grid'].shape == (5, *space['grid'].shape)
+    assert batch['grid'].dtype == np.uint8
+    assert batch['agent'].shape == (5, *space['agent'].shape)
+    assert (batch['agent'] <= space['agent']).all()
+
+    for observation, grid in zip(observations, batch['grid']):
+        np.testing.assert_array_equal(
+            representation.convert(observation)['grid'], grid
+        )
+
+
+def test_pixel_representation_invalid_downsample():
+    observation_space, _ = make_observations('yaml/gv_keydoor.5x5.yaml', 1)
+    with pytest.raises(ValueError):
+        PixelObservationRepresentation(
+            observation_space, tile_size=8, downsample=3
+        )
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+
+from gym_gridverse.demonstrations import (
+    ShortestPathPlanner,
+    generate_demonstrations,
+    goal_distance,
+    shortest_path,
+)
+from gym_gridverse.envs.terminating_functions import reach_goal
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.recording import TransitionDataset
+
+
+@pytest.mark.parametrize(
+    'path', ['yaml/gv_keydoor.5x5.yaml', 'yaml/gv_crossing.5x5.yaml']
+)
+def test_shortest_path(path: str):
+    env = factory_env_from_yaml(path)
+    env.set_seed(0)
+    env.reset()
+    state = env.state
+
+    plan = shortest_path(env, state)
+    assert plan is not None
+    # A* with an admissible heuristic finds plans of the same length
+    assert len(shortest_path(env, state, heuristic=goal_distance)) == len(plan)
+
+    for action in plan[:-1]:
+        state, _, done = env.functional_step(state, action)
+        assert not done
+
+    next_state, _, done = env.functional_step(state, plan[-1])
+    assert done
+    assert reach_goal(state, plan[-1], next_state)
+
+
+def test_shortest_path_max_states():
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    env.set_seed(0)
+    env.reset()
+
+    assert shortest_path(env, env.state, max_states=2) is None
+
+
+def test_shortest_path_planner_cache():
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    env.set_seed(0)
+    env.reset()
+
+    planner = ShortestPathPlanner(env, cache_size=1)
+    plan = planner.plan(env.state)
+    assert planner.plan(env.state) == plan
+    assert (planner.hits, planner.misses) == (1, 1)
+
+    env.set_seed(1)
+    env.reset()
+    planner.plan(env.state)
+    env.set_seed(0)
+    env.reset()
+    planner.plan(env.state)
+    assert (planner.hits, planner.misses) == (1, 3)
+
+
+def test_shortest_path_planner_rng():
+    """planning does not consume the rng of the environment"""
+    env = factory_env_from_yaml('yaml/gv_dynamic_obstacles.5x5.yaml')
+    env.set_seed(0)
+    env.reset()
+
+    rng_state = env._rng.bit_generator.state  # pylint: disable=protected-access
+    ShortestPathPlanner(env, max_states=100).plan(env.state)
+    assert env._rng.bit_generator.state == rng_state
+
+
+def test_generate_demonstrations(tmp_path):
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    path = str(tmp_path / 'demos')
+
+    stats = generate_demonstrations(
+        env,
+        path,
+        4,
+        seed=10,
+        state_representation='default',
+        processes=0,
+        chunk_size=3,
+    )
+    assert stats.num_episodes == 4
+    assert stats.num_failures == 0
+    assert stats.cache_hits + stats.cache_misses == 4
+
+    dataset = TransitionDataset(path)
+    assert dataset.num_episodes == 4
+    assert len(dataset) == stats.num_transitions
+
+    # episodes are consistent with the dynamics of the environment
+    for i in range(4):
+        env.set_seed(10 + i)
+        env.reset()
+
+        episode = dataset.episode(i)
+        rewards = []
+        dones = []
+        for action in dataset.actions(episode):
+            reward, done = env.step(action)
+            rewards.append(reward)
+            dones.append(done)
+
+        np.testing.assert_array_equal(dataset[episode]['reward'], rewards)
+        np.testing.assert_array_equal(dataset[episode]['done'], dones)
+        assert dones[-1]
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from gym_gridverse.agent import Agent
+from gym_gridverse.encoding import (
+    decode_agent,
+    decode_grid,
+    decode_object,
+    decode_observation,
+    decode_state,
+    encode_agent,
+    encode_grid,
+    encode_object,
+    encode_observation,
+    encode_state,
+)
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.geometry import Orientation
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import (
+    Box,
+    Color,
+    Door,
+    Floor,
+    Goal,
+    GridObject,
+    Hidden,
+    Key,
+    MovingObstacle,
+    NoneGridObject,
+    Telepod,
+    Wall,
+)
+
+
+@pytest.mark.parametrize(
+    'obj',
+    [
+        NoneGridObject(),
+        Hidden(),
+        Floor(),
+        Wall(),
+        Goal(),
+        Door(Door.Status.OPEN, Color.RED),
+        Door(Door.Status.CLOSED, Color.GREEN),
+        Door(Door.Status.LOCKED, Color.BLUE),
+        Key(Color.YELLOW),
+        MovingObstacle(),
+        Telepod(Color.RED),
+    ],
+)
+def test_encode_decode_object(obj: GridObject):
+    assert decode_object(*encode_object(obj)) == obj
+
+
+def test_encode_object_box():
+    with pytest.raises(ValueError):
+        encode_object(Box(Floor()))
+
+
+def test_encode_decode_grid():
+    grid = Grid.from_objects(
+        [
+            [Wall(), Floor(), Goal()],
+            [Door(Door.Status.LOCKED, Color.BLUE), Key(Color.BLUE), Hidden()],
+        ]
+    )
+
+    array = encode_grid(grid)
+    assert array.shape == (2, 3, 3)
+    assert decode_grid(array) == grid
+
+
+@pytest.mark.parametrize(
+    'agent',
+    [
+        Agent((0, 0), Orientation.N),
+        Agent((300, 1000), Orientation.W, Key(Color.RED)),
+    ],
+)
+def test_encode_decode_agent(agent: Agent):
+    assert decode_agent(encode_agent(agent)) == agent
+
+
+@pytest.mark.parametrize('path', ['yaml/gv_keydoor.5x5.yaml'])
+def test_encode_decode_state_observation(path: str):
+    env = factory_env_from_yaml(path)
+    env.reset()
+
+    state = decode_state(*encode_state(env.state))
+    assert state.grid == env.state.grid
+    assert state.agent == env.state.agent
+
+    observation = decode_observation(*encode_observation(env.observation))
+    assert observation.grid == env.observation.grid
+    assert observation.agent == env.observation.agent
+
+    np.testing.assert_equal(encode_state(state), encode_state(env.state))
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from gym_gridverse.agent import Agent
+from gym_gridverse.encoding import encode_state
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.geometry import Orientation
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import (
+    Color,
+    Door,
+    Floor,
+    Goal,
+    GridObject,
+    Key,
+    Wall,
+)
+from gym_gridverse.headless_rendering import (
+    HeadlessRenderer,
+    agent_masks,
+    tile_atlas,
+)
+from gym_gridverse.recording import DataBuilder, generate_images
+from gym_gridverse.state import State
+
+
+@pytest.mark.parametrize('tile_size', [8, 32])
+def test_tile_atlas(tile_size: int):
+    atlas = tile_atlas(tile_size)
+    assert atlas.shape[0] == len(GridObject.object_types)
+    assert atlas.shape[-3:] == (tile_size, tile_size, 3)
+    assert atlas.dtype == np.uint8
+    assert not atlas.flags.writeable
+
+    # cached
+    assert tile_atlas(tile_size) is atlas
+
+    # door states and key colors are distinguishable
+    door_tiles = atlas[Door.type_index, :, Color.RED.value]
+    assert len({tile.tobytes() for tile in door_tiles}) == len(Door.Status)
+    key_tiles = atlas[Key.type_index, 0]
+    assert len({tile.tobytes() for tile in key_tiles}) == len(Color)
+
+
+def test_agent_masks():
+    masks = agent_masks(16)
+    assert masks.shape == (len(Orientation), 16, 16)
+
+    north = masks[Orientation.N.value]
+    np.testing.assert_allclose(masks[Orientation.S.value], north[::-1])
+    np.testing.assert_allclose(masks[Orientation.E.value], np.rot90(north, -1))
+    np.testing.assert_allclose(masks[Orientation.W.value], np.rot90(north))
+
+
+def test_headless_renderer():
+    grid = Grid.from_objects(
+        [
+            [Wall(), Goal(), Door(Door.Status.LOCKED, Color.BLUE)],
+            [Floor(), Floor(), Key(Color.YELLOW)],
+        ]
+    )
+    state = State(grid, Agent((1, 0), Orientation.E))
+
+    renderer = HeadlessRenderer(tile_size=10)
+    image = renderer.render(state)
+    assert image.shape == (20, 30, 3)
+    assert image.dtype == np.uint8
+
+    atlas = tile_atlas(10)
+    np.testing.assert_array_equal(
+        image[:10, 10:20], atlas[Goal.type_index, 0, Color.NONE.value]
+    )
+    # the agent is drawn over its tile
+    assert not np.array_equal(
+        image[10:, :10], atlas[Floor.type_index, 0, Color.NONE.value]
+    )
+
+    np.testing.assert_array_equal(
+        renderer.render_encoded(*encode_state(state)), image
+    )
+
+
+def test_generate_images_headless():
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    env.set_seed(0)
+    env.reset()
+
+    builder: DataBuilder = DataBuilder(1.0)
+    builder.append0(env.state)
+    for action in env.action_space.actions[:3]:
+        reward, _ = env.step(action)
+        builder.append(env.state, action, reward)
+
+    images = list(generate_images(builder.build(), headless=True, tile_size=8))
+    assert len(images) == 4
+    assert all(image.shape == (40, 40, 3) for image in images)
@@ -0,0 +1,61 @@
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """imports module in a fresh interpreter, and returns the cumulative
+    import time (in microseconds) of every module imported as a result"""
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+@pytest.mark.parametrize(
+    'module',
+    [
+        'gym_gridverse',
+        'gym_gridverse.envs.yaml.factory',
+        'gym_gridverse.recording',
+        'gym_gridverse.representations.observation_representations',
+    ],
+)
+def test_import_is_lightweight(module: str):
+    times = import_times(module)
+    assert module in times
+
+    # gym is only needed for gym environments, pyglet for the GUI, and imageio
+    # for writing files
+    for heavy_module in ['gym', 'pyglet', 'imageio']:
+        assert heavy_module not in times
+
+
+def test_gym_registration_if_gym_imported_first():
+    code = (
+        'import gym, gym_gridverse;'
+        'assert "GridVerse-FourRooms-v0" in gym.envs.registry'
+    )
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_gym_gridverse_gym_imported_before_gym():
+    code = (
+        'import gym_gridverse.gym, gym;'
+        'assert "GridVerse-FourRooms-v0" in gym.envs.registry'
+    )
+    subprocess.run([sys.executable, '-c', code], check=True)
@@ -1,3 +1,4 @@
+from copy import deepcopy
 from typing import Sequence
 
 import pytest
@@ -10,7 +11,7 @@ from gym_gridverse.geometry import (
     PositionOrTuple,
     Shape,
 )
-from gym_gridverse.grid import Grid
+from gym_gridverse.grid import ChunkedGrid, Grid
 from gym_gridverse.grid_object import (
     Box,
     Color,
@@ -297,6 +298,121 @@ def test_grid_change_orientation(
     assert grid.change_orientation(orientation) == expected
 
 
+def test_grid_positions_object_type():
+    grid = Grid(3, 4)
+    grid[2, 1] = Wall()
+    grid[0, 3] = Wall()
+    grid[1, 1] = Goal()
+
+    assert list(grid.positions(Wall)) == [Position(0, 3), Position(2, 1)]
+    assert list(grid.positions(Goal)) == [Position(1, 1)]
+    assert list(grid.positions(Key)) == []
+    assert len(list(grid.positions(Floor))) == 9
+    assert len(list(grid.positions(GridObject))) == 12
+
+
+def _checkerboard_objects(height: int, width: int):
+    return [
+        [
+            Wall() if (y + x) % 3 == 0 else Goal() if y == x == 5 else Floor()
+            for x in range(width)
+        ]
+        for y in range(height)
+    ]
+
+
+@pytest.mark.parametrize('tile_size', [1, 3, 4, 16])
+def test_chunked_grid_matches_grid(tile_size: int):
+    grid = Grid.from_objects(_checkerboard_objects(7, 10))
+    chunked = ChunkedGrid.from_grid(grid, tile_size=tile_size)
+
+    assert chunked.shape == grid.shape
+    assert chunked == grid
+    assert grid == chunked
+    assert chunked.object_types() == grid.object_types()
+
+    for object_type in [Wall, Goal, Floor, Key, GridObject]:
+        assert list(chunked.positions(object_type)) == list(
+            grid.positions(object_type)
+        )
+
+    for area in [
+        Area((-1, 3), (-1, 4)),
+        Area((2, 5), (3, 9)),
+        Area((4, 9), (7, 12)),
+    ]:
+        assert chunked.subgrid(area) == grid.subgrid(area)
+
+    for orientation in Orientation:
+        assert chunked.change_orientation(
+            orientation
+        ) == grid.change_orientation(orientation)
+
+
+def test_chunked_grid_implicit_tiles():
+    grid = ChunkedGrid(1024, 1024, tile_size=16)
+
+    assert grid.object_types() == {Floor}
+    assert isinstance(grid[500, 500], Floor)
+    assert list(grid.positions(Goal)) == []
+    # reading implicit tiles does not create them
+    assert len(grid._tiles) == 0  # pylint: disable=protected-access
+
+    grid[500, 500] = Goal()
+    assert grid.object_types() == {Floor, Goal}
+    assert list(grid.positions(Goal)) == [Position(500, 500)]
+    assert len(grid._tiles) == 1  # pylint: disable=protected-access
+
+
+def test_chunked_grid_copy_on_write():
+    grid = ChunkedGrid(8, 8, tile_size=4)
+    grid[1, 1] = Box(Key(Color.RED))
+    grid[6, 6] = Wall()
+
+    grid_copy = deepcopy(grid)
+    assert grid_copy == grid
+
+    # objects are modified in place through reads, as by transitions
+    grid_copy[1, 1].content = Floor()
+    grid_copy[6, 6] = Goal()
+    grid_copy[2, 5] = Wall()
+
+    assert isinstance(grid[1, 1].content, Key)
+    assert isinstance(grid[6, 6], Wall)
+    assert isinstance(grid[2, 5], Floor)
+    assert grid.object_types() == {Floor, Box, Wall}
+    assert grid_copy.object_types() == {Floor, Box, Goal, Wall}
+
+    # and the other way around
+    grid[1, 1].content = Key(Color.BLUE)
+    assert isinstance(grid_copy[1, 1].content, Floor)
+
+
+def test_chunked_grid_object_types_on_write():
+    grid = ChunkedGrid(4, 4, tile_size=2)
+    grid[0, 0] = Wall()
+    grid[0, 1] = Wall()
+    assert grid.object_types() == {Floor, Wall}
+
+    # the type stays while another object of the type is in the tile
+    grid[0, 0] = Goal()
+    assert grid.object_types() == {Floor, Goal, Wall}
+
+    grid[0, 1] = Goal()
+    assert grid.object_types() == {Floor, Goal}
+
+    # replacing an object by one of the same type changes nothing
+    grid_copy = deepcopy(grid)
+    grid_copy[0, 1] = Goal()
+    assert grid_copy.object_types() == {Floor, Goal}
+
+    for position in [(0, 0), (0, 1), (1, 0), (1, 1)]:
+        grid[position] = Wall()
+    assert grid.object_types() == {Floor, Wall}
+    assert grid_copy.object_types() == {Floor, Goal}
+    assert list(grid.positions(Goal)) == []
+
+
 @pytest.mark.parametrize(
     'position,orientation,expected',
     [
@@ -0,0 +1,187 @@
+import numpy as np
+import pytest
+
+import gym_gridverse.mdp as mdp_module
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.mdp import TabularMDP, export_mdp
+
+
+def row_sums(mdp: TabularMDP) -> np.ndarray:
+    """total probability of each non-empty row"""
+    lengths = np.diff(mdp.indptr)
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    return np.bincount(rows, weights=mdp.probabilities, minlength=len(lengths))[
+        lengths > 0
+    ]
+
+
+@pytest.fixture
+def keydoor_mdp() -> TabularMDP:
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    env.set_seed(0)
+    return export_mdp(env, num_reset_samples=1)
+
+
+def test_export_mdp_empty():
+    env = factory_env_from_yaml('yaml/gv_empty.4x4.yaml')
+    env.set_seed(0)
+    mdp = export_mdp(env, num_reset_samples=100)
+
+    # 4 free cells times 4 orientations
+    assert mdp.num_states == 16
+    assert mdp.num_actions == len(env.action_space.actions)
+    # states in the goal are only reached through terminal transitions
+    assert mdp.expanded.sum() == 12
+    np.testing.assert_allclose(mdp.initial_distribution.sum(), 1.0)
+
+
+def test_export_mdp_csr(keydoor_mdp: TabularMDP):
+    mdp = keydoor_mdp
+
+    assert mdp.indptr.shape == (mdp.num_states * mdp.num_actions + 1,)
+    assert mdp.indptr[-1] == len(mdp.next_states) == len(mdp.probabilities)
+    assert mdp.grids.shape[0] == mdp.agents.shape[0] == mdp.num_states
+
+    np.testing.assert_allclose(row_sums(mdp), 1.0)
+
+    row_lengths = np.diff(mdp.indptr).reshape(mdp.num_states, mdp.num_actions)
+    np.testing.assert_array_equal((row_lengths > 0).all(axis=1), mdp.expanded)
+
+
+def test_export_mdp_transitions(keydoor_mdp: TabularMDP):
+    mdp = keydoor_mdp
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+
+    rng = np.random.default_rng(0)
+    for s in rng.choice(np.flatnonzero(mdp.expanded), size=20):
+        state = mdp.state(s)
+        assert mdp.state_index(state) == s
+
+        for a, action in enumerate(mdp.actions):
+            next_state, reward, done = env.functional_step(state, action)
+            entries = mdp.transitions(s, a)
+
+            assert mdp.next_states[entries].tolist() == [
+                mdp.state_index(next_state)
+            ]
+            assert mdp.terminal[entries].tolist() == [done]
+            assert mdp.rewards[s, a] == reward
+
+
+def test_export_mdp_max_states():
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    env.set_seed(0)
+
+    with pytest.raises(RuntimeError):
+        export_mdp(env, num_reset_samples=1, max_states=10)
+
+
+def test_export_mdp_no_initial_states():
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+
+    with pytest.raises(ValueError):
+        export_mdp(env, initial_states=[])
+
+    with pytest.raises(ValueError):
+        export_mdp(env, num_reset_samples=0)
+
+
+def test_export_mdp_key_collisions(keydoor_mdp: TabularMDP, monkeypatch):
+    """states with colliding digests are kept distinct"""
+    monkeypatch.setattr(mdp_module, 'state_key', lambda grid, agent: 0)
+
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    env.set_seed(0)
+    mdp = export_mdp(env, num_reset_samples=1)
+
+    assert mdp.num_states == keydoor_mdp.num_states
+    np.testing.assert_array_equal(mdp.indptr, keydoor_mdp.indptr)
+    np.testing.assert_array_equal(mdp.next_states, keydoor_mdp.next_states)
+    np.testing.assert_array_equal(mdp.grids, keydoor_mdp.grids)
+    for s in range(0, mdp.num_states, 7):
+        assert mdp.state_index(mdp.state(s)) == s
+
+
+def test_export_mdp_stochastic():
+    env = factory_env_from_yaml('yaml/gv_dynamic_obstacles.5x5.yaml')
+    env.set_seed(0)
+    mdp = export_mdp(
+        env, num_reset_samples=1, num_transition_samples=4, max_states=10_000
+    )
+
+    assert (np.diff(mdp.indptr) > 1).any()
+    np.testing.assert_allclose(row_sums(mdp), 1.0)
+
+
+@pytest.mark.parametrize(
+    'path', ['yaml/gv_empty.8x8.yaml', 'yaml/gv_four_rooms.7x7.yaml']
+)
+def test_export_mdp_static(path: str, monkeypatch):
+    """environments which only move the agent are exported without
+    functional_step, with the same result"""
+    env = factory_env_from_yaml(path)
+    env.set_seed(0)
+    initial_states = [env.functional_reset() for _ in range(10)]
+
+    def functional_step(state, action):
+        raise AssertionError('functional_step should not be called')
+
+    monkeypatch.setattr(env, 'functional_step', functional_step)
+    mdp = export_mdp(env, initial_states=initial_states)
+    monkeypatch.undo()
+
+    monkeypatch.setattr(
+        mdp_module, '_is_static_transition', lambda transition_function: False
+    )
+    expected = export_mdp(env, initial_states=initial_states)
+
+    assert mdp.actions == expected.actions
+    for name in [
+        'indptr',
+        'next_states',
+        'probabilities',
+        'terminal',
+        'rewards',
+        'initial_distribution',
+        'expanded',
+        'agents',
+    ]:
+        np.testing.assert_array_equal(
+            getattr(mdp, name), getattr(expected, name), err_msg=name
+        )
+
+    # states share the grids of their levels
+    assert expected.levels is None
+    assert mdp.levels is not None
+    assert len(mdp.grids) < mdp.num_states
+    np.testing.assert_array_equal(mdp.grids[mdp.levels], expected.grids)
+    for s in range(0, mdp.num_states, 5):
+        assert mdp.state(s) == expected.state(s)
+        assert mdp.state_index(mdp.state(s)) == s
+
+
+def test_tabular_mdp_save_load(keydoor_mdp: TabularMDP, tmp_path):
+    path = tmp_path / 'mdp.npz'
+    keydoor_mdp.save(str(path))
+    mdp = TabularMDP.load(str(path))
+
+    assert mdp.actions == keydoor_mdp.actions
+    np.testing.assert_array_equal(mdp.indptr, keydoor_mdp.indptr)
+    np.testing.assert_array_equal(mdp.next_states, keydoor_mdp.next_states)
+    np.testing.assert_array_equal(mdp.rewards, keydoor_mdp.rewards)
+    np.testing.assert_array_equal(mdp.grids, keydoor_mdp.grids)
+    assert mdp.state(0) == keydoor_mdp.state(0)
+
+
+def test_tabular_mdp_save_load_levels(tmp_path):
+    env = factory_env_from_yaml('yaml/gv_four_rooms.7x7.yaml')
+    env.set_seed(0)
+    mdp = export_mdp(env, num_reset_samples=3)
+
+    path = tmp_path / 'mdp.npz'
+    mdp.save(str(path))
+    loaded = TabularMDP.load(str(path))
+
+    np.testing.assert_array_equal(loaded.levels, mdp.levels)
+    np.testing.assert_array_equal(loaded.grids, mdp.grids)
+    assert loaded.state(mdp.num_states - 1) == mdp.state(mdp.num_states - 1)
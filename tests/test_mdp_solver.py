@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.mdp import export_mdp
+from gym_gridverse.mdp_solver import (
+    policy_evaluation,
+    q_values,
+    value_iteration,
+)
+from gym_gridverse.utils.rl import make_return_computer
+
+
+@pytest.mark.parametrize(
+    'path', ['yaml/gv_empty.4x4.yaml', 'yaml/gv_keydoor.5x5.yaml']
+)
+@pytest.mark.parametrize('discount', [0.9, 0.99])
+def test_value_iteration_rollout(path: str, discount: float):
+    """optimal values match the discounted return of the greedy policy"""
+    env = factory_env_from_yaml(path)
+    env.set_seed(0)
+    mdp = export_mdp(env, num_reset_samples=1)
+    solution = value_iteration(mdp, discount)
+
+    assert solution.converged
+
+    state = mdp.state(0)
+    value = solution.value(state)
+
+    return_computer = make_return_computer(discount)
+    ret = 0.0
+    for _ in range(100):
+        state, reward, done = env.functional_step(state, solution.action(state))
+        ret = return_computer(reward)
+        if done:
+            break
+
+    assert done
+    assert ret == pytest.approx(value)
+
+
+def test_value_iteration_bellman():
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    env.set_seed(0)
+    mdp = export_mdp(env, num_reset_samples=1)
+    solution = value_iteration(mdp, 0.9, tolerance=1e-12)
+
+    qs = q_values(mdp, solution.values, 0.9)
+    np.testing.assert_allclose(qs, solution.q_values)
+    np.testing.assert_allclose(qs.max(axis=1), solution.values, atol=1e-10)
+    # unexpanded states are only reached by terminal transitions
+    np.testing.assert_array_equal(solution.values[~mdp.expanded], 0.0)
+
+
+def test_value_iteration_max_iterations():
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    env.set_seed(0)
+    mdp = export_mdp(env, num_reset_samples=1)
+    solution = value_iteration(mdp, 0.99, max_iterations=2)
+
+    assert solution.num_iterations == 2
+    assert not solution.converged
+
+
+def test_policy_evaluation():
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    env.set_seed(0)
+    mdp = export_mdp(env, num_reset_samples=1)
+    solution = value_iteration(mdp, 0.9, tolerance=1e-12)
+
+    # the optimal policy evaluates to the optimal values
+    values = policy_evaluation(mdp, solution.policy, 0.9, tolerance=1e-12)
+    np.testing.assert_allclose(values, solution.values, atol=1e-8)
+
+    # a uniform policy is no better than the optimal one
+    uniform = np.full(mdp.rewards.shape, 1 / mdp.num_actions)
+    values = policy_evaluation(mdp, uniform, 0.9)
+    assert (values <= solution.values + 1e-8).all()
+
+
+@pytest.mark.parametrize('discount', [0.0, -0.5, 1.5])
+def test_value_iteration_invalid_discount(discount: float):
+    env = factory_env_from_yaml('yaml/gv_empty.4x4.yaml')
+    mdp = export_mdp(env, num_reset_samples=1)
+
+    with pytest.raises(ValueError):
+        value_iteration(mdp, discount)
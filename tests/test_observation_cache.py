@@ -0,0 +1,163 @@
+import numpy as np
+import pytest
+
+from gym_gridverse.action import Action
+from gym_gridverse.agent import Agent
+from gym_gridverse.envs.observation_functions import (
+    factory,
+    full_observation,
+    stochastic_raytracing_observation,
+)
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.geometry import Orientation, Shape
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import Box, Color, Floor, Key, Wall
+from gym_gridverse.observation_cache import (
+    CachedObservationFunction,
+    CachedObservationRepresentation,
+)
+from gym_gridverse.representations.observation_representations import (
+    create_observation_representation,
+)
+from gym_gridverse.rng import make_rng
+from gym_gridverse.spaces import ObservationSpace
+from gym_gridverse.state import State
+
+
+@pytest.mark.parametrize(
+    'path', ['yaml/gv_keydoor.5x5.yaml', 'yaml/gv_nine_rooms.13x13.yaml']
+)
+def test_cached_observation_function(path: str):
+    env = factory_env_from_yaml(path)
+    env.set_seed(0)
+    env.reset()
+
+    # pylint: disable=protected-access
+    observation_function = env._components()[3]
+    cached = CachedObservationFunction.from_observation_function(
+        observation_function, capacity=8
+    )
+
+    rng = make_rng(0)
+    actions = list(env.action_space.actions)
+    for _ in range(50):
+        assert cached(env.state) == observation_function(env.state)
+        env.step(actions[rng.integers(len(actions))])
+
+    # turning in place a full circle revisits the same observations
+    for _ in range(4):
+        env.step(Action.TURN_LEFT)
+        assert cached(env.state) == observation_function(env.state)
+
+    info = cached.cache_info()
+    assert info.hits + info.misses == 54
+    assert info.hits >= 1
+    assert info.size <= 8
+    assert info.evictions == info.misses - info.size
+    assert info.bypassed == 0
+    assert 0.0 < info.hit_rate < 1.0
+
+
+def test_cached_observation_function_copies():
+    grid = Grid(3, 3)
+    state = State(grid, Agent((1, 1), Orientation.N))
+    observation_space = ObservationSpace(Shape(3, 3), [], [])
+    cached = CachedObservationFunction(
+        observation_space, full_observation.keywords['visibility_function']
+    )
+
+    observation = cached(state)
+    observation.grid[1, 1] = Wall()
+    assert cached(state).grid[1, 1] == Floor()
+    assert cached.cache_info().hits == 1
+
+
+def test_cached_observation_function_key():
+    """boxes are distinguished by their content, cells outside the grid from
+    cells inside"""
+    observation_space = ObservationSpace(Shape(3, 3), [], [])
+    cached = CachedObservationFunction.from_observation_function(
+        factory('full_observation', observation_space=observation_space)
+    )
+
+    grid = Grid(3, 3)
+    grid[0, 1] = Box(Key(Color.RED))
+    state = State(grid, Agent((1, 1), Orientation.N))
+    red_observation = cached(state)
+
+    grid[0, 1] = Box(Key(Color.BLUE))
+    blue_observation = cached(state)
+    assert blue_observation.grid[1, 1].content == Key(Color.BLUE)
+    assert red_observation.grid[1, 1].content == Key(Color.RED)
+
+    moved_state = State(grid, Agent((2, 1), Orientation.N))
+    assert cached.key(moved_state) != cached.key(state)
+    assert cached.cache_info().misses == 2
+
+
+def test_cached_observation_function_stochastic():
+    observation_space = ObservationSpace(Shape(3, 3), [], [])
+    cached = CachedObservationFunction.from_observation_function(
+        factory(
+            'stochastic_raytracing_observation',
+            observation_space=observation_space,
+        )
+    )
+    assert not cached.cacheable
+
+    state = State(Grid(5, 5), Agent((2, 2), Orientation.N))
+    observation = cached(state, rng=make_rng(0))
+    assert observation == stochastic_raytracing_observation(
+        state, observation_space=observation_space, rng=make_rng(0)
+    )
+
+    info = cached.cache_info()
+    assert (info.hits, info.misses, info.bypassed, info.size) == (0, 0, 1, 0)
+
+
+def test_cached_observation_function_invalid():
+    with pytest.raises(ValueError):
+        CachedObservationFunction.from_observation_function(full_observation)
+
+    with pytest.raises(ValueError):
+        CachedObservationFunction.from_observation_function(
+            lambda state, *, rng=None: None
+        )
+
+    with pytest.raises(ValueError):
+        CachedObservationFunction(
+            ObservationSpace(Shape(3, 3), [], []),
+            full_observation.keywords['visibility_function'],
+            capacity=0,
+        )
+
+
+def test_cached_observation_representation():
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    env.set_seed(0)
+    env.reset()
+
+    representation = create_observation_representation(
+        'default', env.observation_space
+    )
+    cached = CachedObservationRepresentation(representation, capacity=2)
+    assert cached.space.keys() == representation.space.keys()
+
+    for action in [Action.TURN_LEFT] * 4 + [Action.TURN_RIGHT] * 4:
+        expected = representation.convert(env.observation)
+        converted = cached.convert(env.observation)
+        assert converted.keys() == expected.keys()
+        for name, array in converted.items():
+            np.testing.assert_array_equal(array, expected[name])
+            array.fill(-1)
+
+        env.step(action)
+
+    info = cached.cache_info()
+    assert info.hits + info.misses == 8
+    assert info.hits > 0
+    assert info.size == 2
+
+    cached.cache_clear()
+    assert cached.cache_info().hits == 0
+    assert cached.cache_info().size == 0
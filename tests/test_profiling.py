@@ -0,0 +1,127 @@
+import json
+import math
+import pickle
+from functools import partial
+
+import pytest
+
+from gym_gridverse.action import Action
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.profiling import Histogram, Profiler
+
+
+@pytest.mark.parametrize(
+    'seconds,index',
+    [
+        (0.0, 0),
+        (0.5e-6, 0),
+        (1e-6, 1),
+        (3e-6, 2),
+        (1.0, 20),
+        (1e6, 32),
+    ],
+)
+def test_histogram_observe(seconds: float, index: int):
+    histogram = Histogram()
+    histogram.observe(seconds)
+
+    assert histogram.count == 1
+    assert histogram.total == seconds
+    assert histogram.counts[index] == 1
+    assert seconds <= Histogram.upper_bounds()[index]
+
+
+def test_histogram_quantile():
+    histogram = Histogram()
+    assert math.isnan(histogram.quantile(0.5))
+
+    for _ in range(99):
+        histogram.observe(1e-6)
+    histogram.observe(1.0)
+
+    assert histogram.quantile(0.5) == 2e-6
+    assert histogram.quantile(1.0) == Histogram.upper_bounds()[20]
+
+
+def test_profiler_instrument_partial():
+    def add(x, *, value):
+        return x + value
+
+    def apply(x, *, add_functions):
+        for f in add_functions:
+            x = f(x)
+        return x
+
+    profiler = Profiler()
+    function = partial(
+        apply, add_functions=[partial(add, value=1), partial(add, value=2)]
+    )
+    function = profiler.instrument('apply', function)
+
+    assert function(0) == 3
+    assert function(0) == 3
+
+    data = profiler.as_dict()
+    assert data.keys() == {'apply', 'apply/0:add', 'apply/1:add'}
+    assert all(value['count'] == 2 for value in data.values())
+
+
+def test_gridworld_profiling():
+    env = factory_env_from_yaml('yaml/gv_dynamic_obstacles.7x7.yaml')
+    functional_step = env._functional_step
+    state_space = env.state_space
+
+    profiler = env.enable_profiling()
+    with pytest.raises(ValueError):
+        env.enable_profiling()
+
+    env.set_seed(0)
+    env.reset()
+    for _ in range(10):
+        env.step(Action.TURN_LEFT)
+        env.observation  # pylint: disable=pointless-statement
+
+    data = profiler.as_dict()
+    assert data['reset']['count'] == 1
+    assert data['functional_step']['count'] == 10
+    assert data['transition']['count'] == 10
+    assert data['transition/1:step_moving_obstacles']['count'] == 10
+    assert data['reward/0:reach_goal']['count'] == 10
+    assert data['termination']['count'] == 10
+    assert data['observation/visibility_function']['count'] == 10
+    assert data['state_space.contains']['count'] == 21
+    json.dumps(data)
+
+    # the shared spaces are not instrumented
+    assert 'contains' not in vars(state_space)
+
+    # profiled environments can still be pickled
+    env.spec = None
+    pickle.loads(pickle.dumps(env))
+
+    assert env.disable_profiling() is profiler
+    assert env.disable_profiling() is None
+    assert env._functional_step is functional_step
+    assert env.state_space is state_space
+    assert 'functional_step' not in vars(env)
+
+    env.step(Action.TURN_LEFT)
+    assert profiler.as_dict()['functional_step']['count'] == 10
+
+
+def test_profiler_to_prometheus():
+    profiler = Profiler()
+    profiler.histogram('reset').observe(3e-6)
+    profiler.histogram('reset').observe(1.0)
+
+    lines = profiler.to_prometheus().splitlines()
+    assert '# TYPE gridverse_component_seconds histogram' in lines
+    assert (
+        'gridverse_component_seconds_bucket{component="reset",le="4e-06"} 1'
+        in lines
+    )
+    assert (
+        'gridverse_component_seconds_bucket{component="reset",le="+Inf"} 2'
+        in lines
+    )
+    assert 'gridverse_component_seconds_count{component="reset"} 2' in lines
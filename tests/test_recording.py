@@ -0,0 +1,427 @@
+from functools import partial
+
+import imageio
+import numpy as np
+import numpy.random as rnd
+import pytest
+
+from gym_gridverse.action import Action
+from gym_gridverse.envs.gridworld import GridWorld
+from gym_gridverse.envs.observation_functions import (
+    stochastic_raytracing_observation,
+)
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml, hash_yaml
+from gym_gridverse.headless_rendering import HeadlessRenderer
+from gym_gridverse.recording import (
+    Data,
+    DataBuilder,
+    DataReader,
+    DataWriter,
+    RecordingJob,
+    TrajectoryEncoding,
+    TrajectoryRecorder,
+    TrajectoryReplayer,
+    TransitionDataset,
+    TransitionDatasetWriter,
+    generate_images,
+    record_parallel,
+)
+from gym_gridverse.representations.observation_representations import (
+    create_observation_representation,
+)
+from gym_gridverse.representations.state_representations import (
+    create_state_representation,
+)
+
+
+def make_data_and_file(path: str, filename: str, *, chunk_size: int):
+    env = factory_env_from_yaml(path)
+    env.set_seed(0)
+    rng = rnd.default_rng(0)
+
+    builder: DataBuilder = DataBuilder(0.9)
+    with DataWriter(filename, 0.9, chunk_size=chunk_size) as writer:
+        env.reset()
+        builder.append0(env.state)
+        writer.append0(env.state)
+
+        for _ in range(10):
+            action = rng.choice(env.action_space.actions)
+            reward, _ = env.step(action)
+            builder.append(env.state, action, reward)
+            writer.append(env.state, action, reward)
+
+    return builder.build()
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 100])
+def test_data_writer_reader(tmp_path, chunk_size: int):
+    filename = str(tmp_path / 'data.npy')
+    data = make_data_and_file(
+        'yaml/gv_keydoor.5x5.yaml', filename, chunk_size=chunk_size
+    )
+
+    reader = DataReader(filename)
+    assert reader.kind == 'state'
+    assert reader.discount == data.discount
+
+    read_data = reader.read()
+    assert read_data.actions == data.actions
+    assert read_data.rewards == data.rewards
+    for element, read_element in zip(data.elements, read_data.elements):
+        assert element.grid == read_element.grid
+        assert element.agent == read_element.agent
+
+    # iterating twice gives the same results
+    assert len(list(reader)) == len(list(reader)) == len(data.elements)
+
+
+def test_data_writer_images(tmp_path):
+    filename = str(tmp_path / 'subdir' / 'images.npy')
+    images = [np.full((4, 4, 3), i, dtype=np.uint8) for i in range(5)]
+
+    with DataWriter(filename, 1.0, chunk_size=2) as writer:
+        writer.append0(images[0])
+        for image in images[1:]:
+            writer.append(image, Action.MOVE_FORWARD, 0.0)
+
+    reader = DataReader(filename)
+    assert reader.kind == 'image'
+    np.testing.assert_equal(list(generate_images(reader)), images)
+
+
+def test_data_writer_append_order(tmp_path):
+    writer = DataWriter(str(tmp_path / 'data.npy'), 1.0)
+
+    with pytest.raises(RuntimeError):
+        writer.append(np.zeros((1, 1, 3)), Action.MOVE_FORWARD, 0.0)
+
+    writer.append0(np.zeros((1, 1, 3)))
+
+    with pytest.raises(RuntimeError):
+        writer.append0(np.zeros((1, 1, 3)))
+
+    writer.close()
+
+
+def test_generate_images_image_data():
+    images = [np.full((4, 4, 3), i, dtype=np.uint8) for i in range(3)]
+    data = Data(images, [Action.MOVE_FORWARD] * 2, [0.0] * 2, 1.0)
+    np.testing.assert_equal(list(generate_images(data)), images)
+
+
+def test_transition_dataset(tmp_path):
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    env.set_seed(0)
+    rng = rnd.default_rng(0)
+
+    state_representation = create_state_representation(
+        'default', env.state_space
+    )
+    observation_representation = create_observation_representation(
+        'default', env.observation_space
+    )
+
+    path = str(tmp_path / 'dataset')
+    transitions = []
+    with TransitionDatasetWriter(
+        path,
+        state_representation=state_representation,
+        observation_representation=observation_representation,
+    ) as writer:
+        for _ in range(3):
+            env.reset()
+            writer.append0(state=env.state, observation=env.observation)
+            observation = observation_representation.convert(env.observation)
+
+            for _ in range(5):
+                action = rng.choice(env.action_space.actions)
+                reward, done = env.step(action)
+                writer.append(
+                    action,
+                    reward,
+                    done,
+                    state=env.state,
+                    observation=env.observation,
+                )
+                next_observation = observation_representation.convert(
+                    env.observation
+                )
+                transitions.append(
+                    (action, reward, done, observation, next_observation)
+                )
+                observation = next_observation
+
+    dataset = TransitionDataset(path)
+    assert len(dataset) == 15
+    assert dataset.num_episodes == 3
+    assert dataset.num_elements == 18
+    assert dataset.episode(1) == slice(5, 10)
+    assert dataset.episode(2) == slice(10, 15)
+
+    for t, (action, reward, done, observation, next_observation) in enumerate(
+        transitions
+    ):
+        batch = dataset[t]
+        assert batch['action'] == action.value
+        assert batch['reward'] == reward
+        assert batch['done'] == done
+        for key in observation:
+            np.testing.assert_array_equal(
+                batch[f'observation.{key}'], observation[key]
+            )
+            np.testing.assert_array_equal(
+                batch[f'next_observation.{key}'], next_observation[key]
+            )
+
+    # contiguous slices and random batches agree with single transitions
+    indices = np.array([14, 3, 7, 7])
+    for index in [dataset.episode(1), indices]:
+        batch = dataset[index]
+        for i, t in enumerate(np.arange(15)[index]):
+            single = dataset[t]
+            for name, value in batch.items():
+                np.testing.assert_array_equal(value[i], single[name])
+
+    assert dataset.actions(indices) == [transitions[t][0] for t in indices]
+
+
+def test_transition_dataset_empty(tmp_path):
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    observation_representation = create_observation_representation(
+        'default', env.observation_space
+    )
+
+    path = str(tmp_path / 'dataset')
+    with TransitionDatasetWriter(
+        path, observation_representation=observation_representation
+    ):
+        pass
+
+    dataset = TransitionDataset(path)
+    assert len(dataset) == 0
+    assert dataset[0:0]['observation.grid'].shape[0] == 0
+
+
+def test_transition_dataset_append_episode(tmp_path):
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    observation_representation = create_observation_representation(
+        'default', env.observation_space
+    )
+    rng = rnd.default_rng(0)
+
+    episodes = []
+    for seed in range(3):
+        env.set_seed(seed)
+        env.reset()
+        observations = [env.observation]
+        actions, rewards, dones = [], [], []
+        for _ in range(4):
+            action = rng.choice(env.action_space.actions)
+            reward, done = env.step(action)
+            actions.append(action)
+            rewards.append(reward)
+            dones.append(done)
+            observations.append(env.observation)
+
+        episodes.append((observations, actions, rewards, dones))
+
+    path_steps = str(tmp_path / 'steps')
+    path_episodes = str(tmp_path / 'episodes')
+    with TransitionDatasetWriter(
+        path_steps, observation_representation=observation_representation
+    ) as writer_steps, TransitionDatasetWriter(
+        path_episodes, observation_representation=observation_representation
+    ) as writer_episodes:
+        for observations, actions, rewards, dones in episodes:
+            writer_steps.append0(observation=observations[0])
+            for action, reward, done, observation in zip(
+                actions, rewards, dones, observations[1:]
+            ):
+                writer_steps.append(
+                    action, reward, done, observation=observation
+                )
+
+            converted = [
+                observation_representation.convert(observation)
+                for observation in observations
+            ]
+            writer_episodes.append_episode(
+                actions,
+                rewards,
+                dones,
+                observations={
+                    key: np.stack([c[key] for c in converted])
+                    for key in converted[0]
+                },
+            )
+
+    dataset_steps = TransitionDataset(path_steps)
+    dataset_episodes = TransitionDataset(path_episodes)
+    assert len(dataset_episodes) == len(dataset_steps) == 12
+    assert dataset_episodes.num_episodes == 3
+    assert dataset_episodes.episode(2) == dataset_steps.episode(2)
+
+    batch_steps = dataset_steps[np.arange(12)]
+    batch_episodes = dataset_episodes[np.arange(12)]
+    assert batch_steps.keys() == batch_episodes.keys()
+    for name, value in batch_steps.items():
+        np.testing.assert_array_equal(batch_episodes[name], value)
+
+
+@pytest.mark.parametrize(
+    'path',
+    ['yaml/gv_keydoor.5x5.yaml', 'yaml/gv_dynamic_obstacles.7x7.yaml'],
+)
+@pytest.mark.parametrize('checkpoint_interval', [1, 4, 100])
+def test_trajectory_replayer(path: str, checkpoint_interval: int):
+    env = factory_env_from_yaml(path)
+    recorder = TrajectoryRecorder(env, hash_yaml(path), 1337)
+    rng = rnd.default_rng(0)
+
+    states = [env.state]
+    for _ in range(20):
+        recorder.step(rng.choice(env.action_space.actions))
+        states.append(env.state)
+
+    encoding = TrajectoryEncoding.from_bytes(recorder.encoding().to_bytes())
+    assert encoding.config_hash == hash_yaml(path)
+    assert encoding.seed == 1337
+    assert encoding.observe
+    assert encoding.actions.tolist() == recorder.encoding().actions.tolist()
+
+    replayer = TrajectoryReplayer(
+        factory_env_from_yaml(path),
+        encoding,
+        checkpoint_interval=checkpoint_interval,
+    )
+    assert len(replayer) == len(states)
+    assert list(replayer.states()) == states
+
+    # random access, including backwards
+    for t in [20, 3, 17, 0, 9, 9]:
+        assert replayer.state(t) == states[t]
+
+    with pytest.raises(IndexError):
+        replayer.state(21)
+
+
+def test_trajectory_replayer_config_mismatch():
+    path = 'yaml/gv_keydoor.5x5.yaml'
+    env = factory_env_from_yaml(path)
+    recorder = TrajectoryRecorder(env, hash_yaml(path), 1337)
+    recorder.step(Action.MOVE_FORWARD)
+
+    other_path = 'yaml/gv_dynamic_obstacles.7x7.yaml'
+    with pytest.raises(ValueError):
+        TrajectoryReplayer(
+            factory_env_from_yaml(other_path), recorder.encoding()
+        )
+
+
+def _stochastic_observation_env(path: str) -> GridWorld:
+    env = factory_env_from_yaml(path)
+    # pylint: disable=protected-access
+    components = list(env._components())
+    components[3] = partial(
+        stochastic_raytracing_observation,
+        observation_space=env.observation_space,
+    )
+    return GridWorld(*components)
+
+
+@pytest.mark.parametrize('checkpoint_interval', [1, 4])
+def test_trajectory_replayer_stochastic_observation(checkpoint_interval: int):
+    """seeking restores the observations drawn from the rng, rather than
+    drawing them again"""
+    path = 'yaml/gv_dynamic_obstacles.7x7.yaml'
+    env = _stochastic_observation_env(path)
+    recorder = TrajectoryRecorder(env, hash_yaml(path), 1337)
+    rng = rnd.default_rng(0)
+
+    states = [env.state]
+    observations = [env.observation]
+    for _ in range(20):
+        recorder.step(rng.choice(env.action_space.actions))
+        states.append(env.state)
+        observations.append(env.observation)
+
+    replayer = TrajectoryReplayer(
+        _stochastic_observation_env(path),
+        recorder.encoding(),
+        checkpoint_interval=checkpoint_interval,
+    )
+
+    # forwards, then backwards and to checkpoints
+    for t in [*range(21), 20, 3, 17, 0, 9, 8, 12, 4, 4, 19, 1]:
+        assert replayer.state(t) == states[t]
+        assert replayer.env.observation == observations[t]
+
+
+@pytest.mark.parametrize('processes', [0, 2])
+def test_record_parallel(tmp_path, processes: int):
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    env.set_seed(0)
+    rng = rnd.default_rng(0)
+
+    jobs = []
+    for episode in range(3):
+        env.reset()
+        builder: DataBuilder = DataBuilder(1.0)
+        builder.append0(env.state)
+        for _ in range(episode + 3):
+            action = rng.choice(env.action_space.actions)
+            reward, _ = env.step(action)
+            builder.append(env.state, action, reward)
+
+        data = builder.build()
+        filenames = [
+            str(tmp_path / f'{episode}-{i}.png')
+            for i in range(len(data.elements))
+        ]
+        jobs.append(RecordingJob('images', data, filenames=filenames))
+
+    stats = record_parallel(
+        jobs, processes=processes, tile_size=8, chunk_size=2, queue_size=1
+    )
+    assert stats.num_recordings == 3
+    assert stats.num_frames == 3 + 4 + 5 + 3
+
+    renderer = HeadlessRenderer(tile_size=8)
+    for job in jobs:
+        for element, filename in zip(job.data.elements, job.filenames):
+            np.testing.assert_array_equal(
+                imageio.imread(filename), renderer.render(element)
+            )
+
+
+@pytest.mark.parametrize('processes', [0, 2])
+def test_record_parallel_lazy(tmp_path, processes: int):
+    """jobs are consumed while previous jobs are rendered and encoded"""
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    env.set_seed(0)
+    env.reset()
+
+    builder: DataBuilder = DataBuilder(1.0)
+    builder.append0(env.state)
+    data = builder.build()
+
+    num_jobs = 20
+    max_ahead = 0
+
+    def jobs():
+        nonlocal max_ahead
+        for i in range(num_jobs):
+            num_recorded = len(list(tmp_path.iterdir()))
+            max_ahead = max(max_ahead, i - num_recorded)
+            yield RecordingJob(
+                'images', data, filenames=[str(tmp_path / f'{i}.png')]
+            )
+
+    stats = record_parallel(
+        jobs(), processes=processes, tile_size=8, chunk_size=1, queue_size=1
+    )
+    assert stats.num_recordings == num_jobs
+    assert len(list(tmp_path.iterdir())) == num_jobs
+    # rendered ahead, waiting in the queue, and being encoded
+    assert max_ahead <= 2 * processes + 3
@@ -0,0 +1,63 @@
+import re
+
+from gym_gridverse.agent import Agent
+from gym_gridverse.geometry import Orientation
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import Floor, Goal, Wall
+from gym_gridverse.render_as_string import TerminalRenderer
+from gym_gridverse.state import State
+
+CURSOR_MOVE = re.compile(r'\x1b\[(\d+);(\d+)H')
+
+
+def make_state(position, orientation=Orientation.N) -> State:
+    grid = Grid.from_objects(
+        [
+            [Wall(), Wall(), Wall()],
+            [Wall(), Floor(), Goal()],
+            [Wall(), Floor(), Floor()],
+        ]
+    )
+    return State(grid, Agent(position, orientation))
+
+
+def test_terminal_renderer_first_frame_is_full():
+    renderer = TerminalRenderer()
+    output = renderer.render([[make_state((1, 1))]])
+
+    assert output.startswith('\x1b[2J')
+    # one move per frame row, plus one below the frame
+    assert len(CURSOR_MOVE.findall(output)) == 3 + 1 + 1
+
+
+def test_terminal_renderer_only_redraws_changes():
+    renderer = TerminalRenderer()
+    renderer.render([[make_state((1, 1))]])
+
+    # no change
+    output = renderer.render([[make_state((1, 1))]])
+    assert CURSOR_MOVE.findall(output) == [('5', '1')]
+
+    # agent turns:  a single cell changes
+    output = renderer.render([[make_state((1, 1), Orientation.E)]])
+    assert CURSOR_MOVE.findall(output) == [('2', '2'), ('5', '1')]
+
+    # agent moves down:  two cells change
+    output = renderer.render([[make_state((2, 1), Orientation.E)]])
+    assert CURSOR_MOVE.findall(output) == [('2', '2'), ('3', '2'), ('5', '1')]
+
+
+def test_terminal_renderer_side_by_side():
+    renderer = TerminalRenderer(gap=2)
+    state = make_state((1, 1))
+    frame = renderer.layout([[state, state], [state]])
+
+    # 'holding: .' is wider than the grid
+    panel_width = len('holding: ') + 1
+    assert len(frame) == 4 + 2 + 4
+    assert all(len(row) == 2 * panel_width + 2 for row in frame)
+    assert frame[0][:3] == frame[0][panel_width + 2 : panel_width + 5]
+
+    # a change of layout redraws in full
+    renderer.render([[state]])
+    assert renderer.render([[state, state]]).startswith('\x1b[2J')
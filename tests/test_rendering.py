@@ -0,0 +1,186 @@
+"""tests of the retained-mode scene of GridVerseViewer, with mocked pyglet"""
+import importlib
+import sys
+import types
+from unittest.mock import MagicMock
+
+import pytest
+
+from gym_gridverse.agent import Agent
+from gym_gridverse.geometry import Orientation
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import Color, Door, Floor, Key, Wall
+from gym_gridverse.state import State
+
+
+class _Geom:
+    def __init__(self):
+        self.attrs = []
+
+    def add_attr(self, attr):
+        self.attrs.append(attr)
+
+    def render(self):
+        for attr in reversed(self.attrs):
+            attr.enable()
+        self.render1()
+        for attr in self.attrs:
+            attr.disable()
+
+    def render1(self):
+        pass
+
+
+class _Transform:
+    def __init__(self, translation=(0.0, 0.0), rotation=0.0, scale=(1, 1)):
+        self.translation = translation
+        self.rotation = rotation
+        self.scale = scale
+
+    def enable(self):
+        pass
+
+    def disable(self):
+        pass
+
+    def set_translation(self, x, y):
+        self.translation = (x, y)
+
+    def set_rotation(self, rotation):
+        self.rotation = rotation
+
+
+class _Viewer:
+    def set_bounds(self, left, right, bottom, top):
+        pass
+
+    def add_geom(self, geom):
+        self.geoms.append(geom)
+
+    def add_onetime(self, geom):
+        self.onetime_geoms.append(geom)
+
+    def window_closed_by_user(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _fake_rendering_module() -> types.ModuleType:
+    module = types.ModuleType('gym.envs.classic_control.rendering')
+    module.Geom = _Geom
+    module.Transform = _Transform
+    module.Viewer = _Viewer
+    # remaining primitives (make_polygon, Line, ...) are mocks
+    module.__getattr__ = lambda name: MagicMock(name=name)
+    return module
+
+
+@pytest.fixture
+def rendering(monkeypatch):
+    """gym_gridverse.rendering imported with mocked pyglet and gym rendering"""
+    pyglet = MagicMock(name='pyglet')
+    monkeypatch.setitem(sys.modules, 'pyglet', pyglet)
+    monkeypatch.setitem(sys.modules, 'pyglet.gl', pyglet.gl)
+    monkeypatch.setitem(
+        sys.modules,
+        'gym.envs.classic_control.rendering',
+        _fake_rendering_module(),
+    )
+    monkeypatch.delitem(sys.modules, 'gym_gridverse.rendering', raising=False)
+    return importlib.import_module('gym_gridverse.rendering')
+
+
+def _make_state() -> State:
+    grid = Grid.from_objects(
+        [
+            [Wall(), Wall(), Wall(), Wall(), Wall()],
+            [Wall(), Floor(), Floor(), Floor(), Wall()],
+            [Wall(), Floor(), Key(Color.RED), Floor(), Wall()],
+            [
+                Wall(),
+                Wall(),
+                Door(Door.Status.LOCKED, Color.RED),
+                Wall(),
+                Wall(),
+            ],
+        ]
+    )
+    return State(grid, Agent((1, 1), Orientation.N))
+
+
+def _layer_contents(viewer):
+    """cell geoms of each row layer, as (x, geom) pairs"""
+    # pylint: disable=protected-access
+    return [
+        [
+            (placed.attrs[0].translation[0] // 2, placed.geom)
+            for placed in layer._geoms
+        ]
+        for layer in viewer._row_layers
+    ]
+
+
+def test_viewer_renders_rows(rendering):
+    state = _make_state()
+    viewer = rendering.GridVerseViewer(state.grid.shape)
+    viewer.render(state)
+
+    contents = _layer_contents(viewer)
+    assert [[x for x, _ in row] for row in contents] == [
+        [0, 1, 2, 3, 4],
+        [0, 4],
+        [0, 2, 4],
+        [0, 1, 2, 3, 4],
+    ]
+    # pylint: disable=protected-access
+    geoms = viewer._object_geoms
+    assert contents[2][1][1] is geoms[rendering.object_key(Key(Color.RED))]
+    assert (
+        contents[3][2][1]
+        is geoms[rendering.object_key(Door(Door.Status.LOCKED, Color.RED))]
+    )
+    # all walls share one geom
+    assert len({id(geom) for _, geom in contents[0]}) == 1
+
+
+def test_viewer_updates_changed_cells(rendering, monkeypatch):
+    make_object = MagicMock(wraps=rendering.make_object)
+    monkeypatch.setattr(rendering, 'make_object', make_object)
+    glNewList = rendering.glNewList
+
+    state = _make_state()
+    viewer = rendering.GridVerseViewer(state.grid.shape)
+    viewer.render(state)
+    # one layer per row, and the grid lines
+    assert glNewList.call_count == 5
+    num_objects = make_object.call_count
+
+    # moving the agent changes no cell
+    state.agent.position = (2, 3)
+    viewer.render(state)
+    assert glNewList.call_count == 5
+    assert make_object.call_count == num_objects
+
+    # only the row of the door is recompiled
+    before = _layer_contents(viewer)
+    state.grid[3, 2] = Door(Door.Status.OPEN, Color.RED)
+    viewer.render(state)
+    after = _layer_contents(viewer)
+    assert glNewList.call_count == 6
+    assert make_object.call_count == num_objects + 1
+    assert after[:3] == before[:3]
+    assert after[3][2][1] is not before[3][2][1]
+
+    # picking up the key removes its geom;  putting it back reuses it
+    state.grid[2, 2] = Floor()
+    viewer.render(state)
+    assert glNewList.call_count == 7
+    assert [x for x, _ in _layer_contents(viewer)[2]] == [0, 4]
+
+    state.grid[2, 2] = Key(Color.RED)
+    viewer.render(state)
+    assert glNewList.call_count == 8
+    assert _layer_contents(viewer)[2] == before[2]
+    assert make_object.call_count == num_objects + 1
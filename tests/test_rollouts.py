@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from gym_gridverse.action import Action
+from gym_gridverse.envs.yaml.factory import factory_env_from_yaml
+from gym_gridverse.rng import make_rng
+from gym_gridverse.rollouts import RolloutEngine, rollouts
+
+
+@pytest.mark.parametrize(
+    'path,static',
+    [
+        ('yaml/gv_empty.4x4.yaml', True),
+        ('yaml/gv_nine_rooms.10x10.yaml', True),
+        ('yaml/gv_keydoor.5x5.yaml', False),
+        ('yaml/gv_dynamic_obstacles.5x5.yaml', False),
+    ],
+)
+def test_rollout_engine_static(path: str, static: bool):
+    env = factory_env_from_yaml(path)
+    assert RolloutEngine(env).static == static
+
+    env.enable_profiling()
+    assert RolloutEngine(env).static == static
+
+
+@pytest.mark.parametrize(
+    'action', [Action.MOVE_FORWARD, Action.TURN_LEFT, Action.MOVE_RIGHT]
+)
+def test_rollouts_vectorized_matches_python(action: Action):
+    env = factory_env_from_yaml('yaml/gv_empty.4x4.yaml')
+    env.set_seed(0)
+    env.reset()
+
+    engine = RolloutEngine(env)
+    policy = np.array([a is action for a in engine.actions], dtype=float)
+
+    vectorized = engine.rollouts(env.state, policy, 4, 10, discount=0.9)
+    engine.static = False
+    python = engine.rollouts(env.state, policy, 4, 10, discount=0.9)
+
+    assert vectorized.vectorized
+    assert not python.vectorized
+    np.testing.assert_allclose(vectorized.returns, python.returns)
+    np.testing.assert_array_equal(vectorized.lengths, python.lengths)
+    np.testing.assert_array_equal(vectorized.terminated, python.terminated)
+
+
+def test_rollouts_tables():
+    """table entries agree with functional_step"""
+    env = factory_env_from_yaml('yaml/gv_four_rooms.7x7.yaml')
+    env.set_seed(0)
+    env.reset()
+
+    engine = RolloutEngine(env)
+    result = engine.rollouts(env.state, n=32, horizon=20, rng=make_rng(0))
+    assert result.vectorized
+    assert result.lengths.max() <= 20
+    assert (result.terminated | (result.lengths == 20)).all()
+
+    (tables,) = engine._tables.values()  # pylint: disable=protected-access
+    for index, action_index in zip(*np.nonzero(tables.next_index >= 0)):
+        next_state, reward, done = env.functional_step(
+            tables.state(index), engine.actions[action_index]
+        )
+        assert (
+            tables.index(next_state.agent)
+            == tables.next_index[index, action_index]
+        )
+        assert tables.reward[index, action_index] == reward
+        assert tables.done[index, action_index] == done
+
+
+def test_rollouts_python_fallback():
+    env = factory_env_from_yaml('yaml/gv_keydoor.5x5.yaml')
+    env.set_seed(0)
+    env.reset()
+
+    result = rollouts(env, env.state, n=3, horizon=5, rng=make_rng(0))
+    assert not result.vectorized
+    assert result.returns.shape == (3,)
+    assert (result.lengths <= 5).all()
+
+    # state-dependent policies are never vectorized
+    env = factory_env_from_yaml('yaml/gv_empty.4x4.yaml')
+    env.set_seed(0)
+    env.reset()
+
+    result = rollouts(
+        env, env.state, lambda state, rng: Action.MOVE_FORWARD, n=2, horizon=3
+    )
+    assert not result.vectorized
+
+
+def test_rollouts_invalid_policy():
+    env = factory_env_from_yaml('yaml/gv_empty.4x4.yaml')
+    env.set_seed(0)
+    env.reset()
+
+    with pytest.raises(ValueError):
+        rollouts(env, env.state, [1.0], n=2, horizon=3)
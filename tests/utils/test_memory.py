@@ -0,0 +1,75 @@
+import sys
+
+import numpy as np
+import pytest
+
+from gym_gridverse.agent import Agent
+from gym_gridverse.geometry import Orientation
+from gym_gridverse.grid import Grid
+from gym_gridverse.grid_object import Color, Key
+from gym_gridverse.recording import Data
+from gym_gridverse.state import State
+from gym_gridverse.utils.memory import deep_sizeof, memory_breakdown
+
+
+def make_state(size: int) -> State:
+    return State(Grid(size, size), Agent((0, 0), Orientation.N, Key(Color.RED)))
+
+
+def test_deep_sizeof_array():
+    array = np.zeros(1000, dtype=np.int64)
+    assert deep_sizeof(array) == sys.getsizeof(array)
+    assert deep_sizeof(array) > array.nbytes
+
+    # views count the data they refer to
+    assert deep_sizeof(array[:10]) > array.nbytes
+
+
+def test_deep_sizeof_shared():
+    objects = [Key(Color.RED)] * 10
+    assert deep_sizeof(objects) == sys.getsizeof(objects) + deep_sizeof(
+        objects[0]
+    )
+
+
+@pytest.mark.parametrize('size', [3, 5, 11])
+def test_deep_sizeof_state(size: int):
+    state = make_state(size)
+    assert deep_sizeof(state) > deep_sizeof(state.grid) > size * size
+
+
+def test_deep_sizeof_seen():
+    state = make_state(5)
+    seen = set()
+    assert deep_sizeof(state, seen=seen) > 0
+    assert deep_sizeof(state, seen=seen) == 0
+
+
+@pytest.mark.parametrize('depth', [0, 1, 2, 3])
+def test_memory_breakdown_state(depth: int):
+    state = make_state(5)
+    breakdown = memory_breakdown(state, depth=depth)
+    assert sum(breakdown.values()) == deep_sizeof(state)
+
+    if depth == 1:
+        assert breakdown.keys() == {'State', 'State.grid', 'State.agent'}
+
+
+def test_memory_breakdown_data():
+    states = [make_state(5) for _ in range(3)]
+    data = Data(states, [None, None], [0.0, 0.0], 1.0)  # type: ignore
+
+    breakdown = memory_breakdown(data, depth=2)
+    assert sum(breakdown.values()) == deep_sizeof(data)
+    assert breakdown['Data.elements[*]'] == sum(map(deep_sizeof, states))
+
+
+def test_memory_breakdown_representation():
+    representation = {
+        'grid': np.zeros((5, 5, 3), dtype=np.int64),
+        'agent': np.zeros(6, dtype=np.int64),
+    }
+    breakdown = memory_breakdown(representation)
+    assert breakdown['[grid]'] > 5 * 5 * 3 * 8
+    assert breakdown['[agent]'] > 6 * 8
+    assert sum(breakdown.values()) == deep_sizeof(representation)